@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Adaptive version: runs either the dense grid (game_of_life) or the sparse set
+(short_fns) and moves the live cells over to the other one when it gets cheaper.
+The dense engine only looks at its frontier, the cells around last generation's
+changes, so it costs about one unit per change (activity). The sparse one counts
+the neighbors of every live cell, one unit per live cell (density). What matters
+is their ratio, the churn (births and deaths per live cell): a fresh soup churns
+at around one and runs faster sparse, ash is mostly still lifes and runs
+faster dense.
+
+Once churn has been over sparse_above for patience generations in a row the board
+goes sparse, once it has been under dense_below as long it goes dense. The gap
+between the two thresholds is the hysteresis, it keeps a board that sits near
+one of them from converting back and forth.
+
+Conversions happen in _convert, so an instrumented board reports their cost.
+"""
+
+import random
+
+import deltas
+import game_of_life
+import render
+import rules
+import seeding
+import short_fns
+from topology import make_topology
+
+DENSE = "dense"
+SPARSE = "sparse"
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+    ALLOW_B0 = False
+
+    def __init__(self, rows=4, cols=4, rule=None, topology=None, dense_below=0.5, sparse_above=0.8, patience=4,
+                 representation=DENSE):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        if not 0 <= dense_below < sparse_above:
+            raise AssertionError("Need 0 <= dense_below < sparse_above")
+        if representation not in (DENSE, SPARSE):
+            raise AssertionError("Unknown representation {!r}".format(representation))
+        self.dimensions = (rows, cols)
+        # both engines only look next to live cells, so no B0
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
+        self.topology = make_topology(topology, rows, cols)
+        self.dense_below = dense_below
+        self.sparse_above = sparse_above
+        self.patience = patience
+        self.generation = 0
+        self.conversions = 0
+        # generations in a row that churn has called for the other representation
+        self.pressure = 0
+        self.representation = representation
+        self.engine = self._make_engine(representation)
+
+    def _make_engine(self, representation):
+        rows, cols = self.dimensions
+        engine_cls = game_of_life.GameOfLife if representation == DENSE else short_fns.GameOfLife
+        engine = engine_cls(rows=rows, cols=cols, rule=self.rule, topology=self.topology)
+        engine.generation = self.generation
+        return engine
+
+    def _convert(self, representation):
+        """Move the live cells over to a fresh engine of the other representation."""
+        live_cells = list(render.live_cells_of(self.engine))
+        self.engine = self._make_engine(representation)
+        self.engine.add_cells(live_cells)
+        self.representation = representation
+        self.conversions += 1
+
+    @property
+    def live_cells(self):
+        return set(render.live_cells_of(self.engine))
+
+    def zero_out(self):
+        self.engine.zero_out()
+        self.pressure = 0
+
+    def dump(self):
+        self.engine.dump()
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells):
+        self.engine.add_cells(cells)
+
+    def live_cell_count(self):
+        return self.engine.live_cell_count()
+
+    def advance(self):
+        to_birth, to_die = self.step()
+        # return the boolean of were any changes made
+        return bool(to_die) or bool(to_birth)
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        to_birth, to_die = self.engine.step()
+        self.generation += 1
+        self.adapt(len(to_birth) + len(to_die))
+        return to_birth, to_die
+
+    def adapt(self, changes):
+        """Switch representation if the churn of the last patience generations calls for it."""
+        population = self.live_cell_count()
+        if not population:
+            self.pressure = 0
+            return
+        churn = changes / population
+        if self.representation == DENSE:
+            wanted = SPARSE if churn > self.sparse_above else None
+        else:
+            wanted = DENSE if churn < self.dense_below else None
+        if wanted is None:
+            self.pressure = 0
+            return
+        self.pressure += 1
+        if self.pressure >= self.patience:
+            self.pressure = 0
+            self._convert(wanted)
+
+
+def main():
+    mygame = GameOfLife(rows=100, cols=100)  # setup the board
+    random.seed(0)
+    mygame.seed(density=0.3)
+    representation = mygame.representation
+    for record in mygame.generations(limit=1000):
+        if mygame.representation != representation:
+            representation = mygame.representation
+            print("Generation {}: {} live cells, switched to {}".format(record.generation, record.population, representation))
+        if 0 == record.population:
+            print("All cells are dead, game over.")
+            break
+        if record.changed is False:
+            print("Reached a steady state, game over.")
+            break
+    print("Finished {} after {} conversions".format(mygame.representation, mygame.conversions))
+
+
+if "__main__" == __name__:
+    main()
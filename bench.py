@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+Benchmark the engines across board size, initial density and generation count.
+
+    ./bench.py --output bench.json
+    ./bench.py --engines numpy_dense,bitpacked --sizes 512,2048 --output new.json --compare bench.json
+
+Every run is seeded from --seed so all engines start from the same board. Results
+are written as JSON, and with --compare each run is checked against the matching
+run of a stored baseline: any engine whose generations/sec dropped by more than
+--threshold (a fraction) is reported and the exit status is 1.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import engines
+
+
+DEFAULT_ENGINES = ["game_of_life", "short_fns", "no_conditionals", "numpy_dense", "bitpacked", "blocktable"]
+
+
+def comma_list(convert):
+    def parse(value):
+        return [convert(item) for item in value.split(",") if item]
+    return parse
+
+
+def make_board(engine_cls, size, density, seed):
+    random.seed(seed)
+    board = engine_cls(rows=size, cols=size)
+    board.seed(int(density * size * size))
+    return board
+
+
+def close_board(board):
+    close = getattr(board, "close", None)
+    if close is not None:
+        close()
+
+
+def time_run(engine_cls, size, density, generations, seed):
+    board = make_board(engine_cls, size, density, seed)
+    try:
+        start = time.perf_counter()
+        for iturn in range(generations):
+            board.advance()
+        return time.perf_counter() - start
+    finally:
+        close_board(board)
+
+
+def peak_memory(engine_cls, size, density, generations, seed):
+    """Peak traced allocation while building the board and running it."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        board = make_board(engine_cls, size, density, seed)
+        for iturn in range(generations):
+            board.advance()
+        close_board(board)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_one(name, size, density, generations, seed, repeat):
+    engine_cls = engines.load_engine(name)
+    seconds = min(
+        time_run(engine_cls, size, density, generations, seed)
+        for irepeat in range(repeat)
+    )
+    seconds = max(seconds, 1e-9)
+    return {
+        "engine": name,
+        "size": size,
+        "density": density,
+        "generations": generations,
+        "seconds": seconds,
+        "generations_per_sec": generations / seconds,
+        "cells_per_sec": generations * size * size / seconds,
+        "peak_bytes": peak_memory(engine_cls, size, density, generations, seed),
+    }
+
+
+def run_key(result):
+    return (result["engine"], result["size"], result["density"], result["generations"])
+
+
+def compare(results, baseline, threshold):
+    """Runs that got more than threshold slower than the matching baseline run."""
+    baseline_by_key = {run_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = baseline_by_key.get(run_key(result))
+        if before is None:
+            continue
+        ratio = result["generations_per_sec"] / before["generations_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append((result, before, ratio))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", type=comma_list(str), default=DEFAULT_ENGINES)
+    parser.add_argument("--sizes", type=comma_list(int), default=[16, 64, 128])
+    parser.add_argument("--densities", type=comma_list(float), default=[0.1, 0.35])
+    parser.add_argument("--generations", type=comma_list(int), default=[10, 50])
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per case, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results here as JSON")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown as a fraction, default 0.1")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for name in args.engines:
+        for size in args.sizes:
+            for density in args.densities:
+                for generations in args.generations:
+                    result = run_one(name, size, density, generations, args.seed, args.repeat)
+                    results.append(result)
+                    print(
+                        "{engine:>16} {size:>6}x{size:<6} density={density:<5} gens={generations:<6}"
+                        " {generations_per_sec:12.1f} gen/s {cells_per_sec:14.0f} cells/s"
+                        " {peak_bytes:12d} peak bytes".format(**result)
+                    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump(
+                {
+                    "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "seed": args.seed,
+                    "results": results,
+                },
+                outfile,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        for result, before, ratio in regressions:
+            print(
+                "REGRESSION {} {}x{} density={} gens={}: {:.1f} -> {:.1f} gen/s ({:.0%})".format(
+                    result["engine"], result["size"], result["size"], result["density"],
+                    result["generations"], before["generations_per_sec"],
+                    result["generations_per_sec"], ratio,
+                )
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if "__main__" == __name__:
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Bit packed version: every row is packed into 64 bit words (column c is bit c % 64 of
+word c // 64) so a cell costs one bit. There is no neighbor count grid, the 8
+neighbor bitboards of a band of rows are summed with bitwise full adders and the
+rule is applied to the resulting count bits, 64 cells at a time.
+"""
+
+import itertools
+import random
+
+import numpy as np
+
+import deltas
+import render
+import rules
+import seeding
+
+
+WORD_BITS = 64
+
+
+def _west(words):
+    """Each bit replaced by the bit of its left hand (col - 1) neighbor."""
+    shifted = words << 1
+    shifted[..., 1:] |= words[..., :-1] >> (WORD_BITS - 1)
+    return shifted
+
+
+def _east(words):
+    """Each bit replaced by the bit of its right hand (col + 1) neighbor."""
+    shifted = words >> 1
+    shifted[..., :-1] |= words[..., 1:] << (WORD_BITS - 1)
+    return shifted
+
+
+def _full_add(a, b, c):
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def _count_is(count_bits, counts):
+    """Bits of the cells whose neighbor count (given as ones, twos, fours, eights bits) is in counts."""
+    result = None
+    remaining = sorted(counts, reverse=True)
+    while remaining:
+        count = remaining.pop()
+        bits = range(4)
+        if count % 2 == 0 and remaining and remaining[-1] == count + 1:
+            # count and count + 1 only differ in the ones bit
+            remaining.pop()
+            bits = range(1, 4)
+        term = None
+        for bit in bits:
+            word = count_bits[bit] if count >> bit & 1 else ~count_bits[bit]
+            term = word if term is None else term & word
+        result = term if result is None else result | term
+    if result is None:
+        return np.zeros_like(count_bits[0])
+    return result
+
+
+def count_bits(above, middle, below):
+    """(ones, twos, fours, eights) bits of the live neighbor counts of middle."""
+    ones_a, twos_a = _full_add(_west(above), above, _east(above))
+    ones_b, twos_b = _full_add(_west(middle), _east(middle), _west(below))
+    east_below = _east(below)
+    ones_c = below ^ east_below
+    twos_c = below & east_below
+    ones, twos_d = _full_add(ones_a, ones_b, ones_c)
+    twos_e, fours_a = _full_add(twos_a, twos_b, twos_c)
+    twos = twos_e ^ twos_d
+    fours_b = twos_e & twos_d
+    return (ones, twos, fours_a ^ fours_b, fours_a & fours_b)
+
+
+def apply_band_rule(counts, middle, rule=rules.LIFE):
+    born = _count_is(counts, rule.birth)
+    survives = _count_is(counts, rule.survival)
+    return (born & ~middle) | (survives & middle)
+
+
+def next_band(above, middle, below, rule=rules.LIFE):
+    """Next generation of middle given the rows directly above and below it."""
+    return apply_band_rule(count_bits(above, middle, below), middle, rule)
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.uint64))
+    return int(np.unpackbits(words.astype("<u8").view(np.uint8)).sum())
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+
+    def __init__(self, rows=4, cols=4, band_rows=None, rule=None):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        self.dimensions = (rows, cols)
+        # the padding bits are masked off every generation, so B0 is fine
+        self.rule = rules.make_rule(rule)
+        self.row_words = -(-cols // WORD_BITS)
+        # one dead halo row above and below the board
+        self.words = np.zeros((rows + 2, self.row_words), dtype=np.uint64)
+        self.next_words = np.zeros_like(self.words)
+        self.generation = 0
+        # mask off the padding bits past the last column
+        self.last_word_mask = np.uint64((1 << (cols - (self.row_words - 1) * WORD_BITS)) - 1)
+        # keep the adder temporaries to roughly a megabyte per band
+        self.band_rows = band_rows or max(1, (1 << 17) // self.row_words)
+
+    def zero_out(self):
+        self.words.fill(0)
+        self.next_words.fill(0)
+        self.generation = 0
+
+    def get_cell(self, rowidx, colidx):
+        word = self.words[rowidx + 1, colidx // WORD_BITS]
+        return int(word >> (colidx % WORD_BITS)) & 1
+
+    def set_cell(self, rowidx, colidx, state):
+        bit = np.uint64(1 << (colidx % WORD_BITS))
+        if state:
+            self.words[rowidx + 1, colidx // WORD_BITS] |= bit
+        else:
+            self.words[rowidx + 1, colidx // WORD_BITS] &= ~bit
+
+    def to_array(self):
+        """Unpack the board into a dense (rows, cols) uint8 array."""
+        as_bytes = self.words[1:-1].astype("<u8").view(np.uint8)
+        bits = np.unpackbits(as_bytes, axis=1, bitorder="little")
+        return bits[:, :self.dimensions[1]]
+
+    def dump(self):
+        print("Cell states:")
+        for irow in self.to_array():
+            print("".join("██" if cell else "  " for cell in irow))
+        print()
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        """Bring cells to life, a chunk at a time, ORing in one mask per word touched."""
+        rows, cols = self.dimensions
+        flat_words = self.words.reshape(-1)
+        cells = iter(cells)
+        while True:
+            chunk = np.fromiter(
+                itertools.chain.from_iterable(itertools.islice(cells, chunk_size)),
+                dtype=np.int64,
+            ).reshape((-1, 2))
+            if not len(chunk):
+                break
+            rowidxs, colidxs = chunk[:, 0], chunk[:, 1]
+            on_board = (0 <= rowidxs) & (rowidxs < rows) & (0 <= colidxs) & (colidxs < cols)
+            rowidxs, colidxs = rowidxs[on_board], colidxs[on_board]
+            if not len(rowidxs):
+                continue
+            word_indices = (rowidxs + 1) * self.row_words + colidxs // WORD_BITS
+            bits = np.left_shift(np.uint64(1), (colidxs % WORD_BITS).astype(np.uint64))
+            order = np.argsort(word_indices, kind="stable")
+            word_indices, bits = word_indices[order], bits[order]
+            starts = np.flatnonzero(np.concatenate(([True], word_indices[1:] != word_indices[:-1])))
+            flat_words[word_indices[starts]] |= np.bitwise_or.reduceat(bits, starts)
+
+    def live_cell_count(self):
+        return _popcount(self.words)
+
+    def _count(self, start, stop):
+        return count_bits(self.words[start - 1:stop - 1], self.words[start:stop], self.words[start + 1:stop + 1])
+
+    def _decide(self, counts, middle):
+        return apply_band_rule(counts, middle, self.rule)
+
+    def _examined(self, counts, middle):
+        return min(middle.shape[0] * self.row_words * WORD_BITS, middle.shape[0] * self.dimensions[1])
+
+    def _apply(self, start, stop, band, changed):
+        """Write band into the next board, return whether anything has changed so far."""
+        band[:, -1] &= self.last_word_mask
+        changed = changed or not np.array_equal(band, self.words[start:stop])
+        self.next_words[start:stop] = band
+        return changed
+
+    def advance(self):
+        rows = self.dimensions[0]
+        changed = False
+        for start in range(1, rows + 1, self.band_rows):
+            stop = min(start + self.band_rows, rows + 1)
+            counts = self._count(start, stop)
+            band = self._decide(counts, self.words[start:stop])
+            changed = self._apply(start, stop, band, changed)
+        self.words, self.next_words = self.next_words, self.words
+        self.generation += 1
+        # return the boolean of were any changes made
+        return changed
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+
+def main():
+    mygame = GameOfLife(rows=20, cols=20)  # setup the board
+    random.seed(0)
+    mygame.seed(30)
+    renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=70):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
+            break
+    renderer.close()
+    if message is not None:
+        print(message)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Block lookup table version, pure Python with no dependencies: the board is cut into
+2x2 blocks, one per byte of a bytearray (bit 0 top left, 1 top right, 2 bottom
+left, 3 bottom right). Four blocks side by side make a 4x4 neighborhood, a 16 bit
+number, and a 65536 entry table gives the 2x2 center of that neighborhood one
+generation on, so each table lookup advances 4 cells with no neighbor counting.
+
+The center of a 4x4 is offset by one cell from the blocks it is made of, so the
+block grid alternates between two phases: in phase 0 the blocks start at cell -2,
+in phase 1 at cell -1, and each phase has its own bytearray. The blocks reach
+past the board all round, cells off the board are masked back to dead after
+every generation.
+
+The table is built the first time it is needed and cached on disk (per rule),
+building it takes around a second of pure Python, loading it is instant.
+"""
+
+import collections
+import itertools
+import os
+import random
+
+import deltas
+import render
+import rules
+import seeding
+
+
+# which block of a 4x4 each cell is in (as a shift into the 16 bit index) and
+# which bit of that block it is
+CELL_BITS = tuple(
+    tuple(
+        (4 * (2 * (rowidx // 2) + colidx // 2)) + 2 * (rowidx % 2) + colidx % 2
+        for colidx in range(4)
+    )
+    for rowidx in range(4)
+)
+# the center 2x2 of a 4x4, in block bit order
+CENTER = ((1, 1), (1, 2), (2, 1), (2, 2))
+TOP, BOTTOM = 0x3, 0xC
+LEFT, RIGHT = 0x5, 0xA
+POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+_TABLES = {}
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "game_of_life")
+
+
+def build_table(rule):
+    """Entry for every 4x4 neighborhood: its next center 2x2 in the low nibble, which
+    of those 4 cells flipped in the high nibble."""
+    table = bytearray(1 << 16)
+    born, survives = rule.table
+    for index in range(1 << 16):
+        cells = [[index >> CELL_BITS[rowidx][colidx] & 1 for colidx in range(4)] for rowidx in range(4)]
+        entry = 0
+        for bit, (rowidx, colidx) in enumerate(CENTER):
+            count = (
+                sum(cells[rowidx - 1][colidx - 1:colidx + 2])
+                + cells[rowidx][colidx - 1] + cells[rowidx][colidx + 1]
+                + sum(cells[rowidx + 1][colidx - 1:colidx + 2])
+            )
+            state = cells[rowidx][colidx]
+            next_state = (survives if state else born)[count]
+            entry |= next_state << bit
+            entry |= (next_state ^ state) << (bit + 4)
+        table[index] = entry
+    return bytes(table)
+
+
+def load_table(rule, cache_dir=None):
+    """The table for rule: from memory, else from the disk cache, else built (and cached)."""
+    table = _TABLES.get(rule)
+    if table is not None:
+        return table
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, "blocktable-{}.bin".format(str(rule).replace("/", "")))
+    try:
+        with open(path, "rb") as infile:
+            table = infile.read()
+    except OSError:
+        table = None
+    if table is None or len(table) != 1 << 16:
+        table = build_table(rule)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            with open(tmp_path, "wb") as outfile:
+                outfile.write(table)
+            os.replace(tmp_path, path)
+        except OSError:
+            # no cache then, it just gets built again next time
+            pass
+    _TABLES[rule] = table
+    return table
+
+
+def _masked(mask):
+    """Translate tables: entry to its next nibble, and entry to its changes nibble, both & mask."""
+    return (
+        bytes(entry & 0xF & mask for entry in range(256)),
+        bytes(entry >> 4 & mask for entry in range(256)),
+    )
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+
+    def __init__(self, rows=4, cols=4, rule=None, cache_dir=None):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        self.dimensions = (rows, cols)
+        self.rule = rules.make_rule(rule)
+        self.cache_dir = cache_dir
+        self._table = None
+        # phase 0 blocks start at cell -2, phase 1 at -1, both with a dead margin
+        self.block_rows = (rows + 5) // 2
+        self.block_cols = (cols + 5) // 2
+        self.blocks = [bytearray(self.block_rows * self.block_cols) for phase in range(2)]
+        self.phase = 0
+        self.generation = 0
+        self.masks = [self._phase_masks(phase) for phase in range(2)]
+
+    def _keep(self, origin, index, size, first, second):
+        """Bits of block index (starting at cell origin) that are on a board of size cells."""
+        cell = origin + 2 * index
+        return (first if 0 <= cell < size else 0) | (second if 0 <= cell + 1 < size else 0)
+
+    def _phase_masks(self, phase):
+        """What writing the blocks of phase has to mask off, per block row and for the edge cols."""
+        rows, cols = self.dimensions
+        origin = phase - 2
+        row_masks = [_masked(self._keep(origin, brow, rows, TOP, BOTTOM)) for brow in range(self.block_rows)]
+        # a generation writes block cols [shift, shift + block_cols - 1) of phase
+        shift = 1 - phase
+        col_keeps = [
+            self._keep(origin, bcol + shift, cols, LEFT, RIGHT)
+            for bcol in range(self.block_cols - 1)
+        ]
+        inner = [bcol for bcol, keep in enumerate(col_keeps) if keep == 0xF] or [0, -1]
+        edges = [(bcol, keep) for bcol, keep in enumerate(col_keeps) if keep != 0xF]
+        return row_masks, (inner[0], inner[-1] + 1), edges
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = load_table(self.rule, self.cache_dir)
+        return self._table
+
+    def _locate(self, rowidx, colidx):
+        origin = self.phase - 2
+        brow, rowbit = divmod(rowidx - origin, 2)
+        bcol, colbit = divmod(colidx - origin, 2)
+        return brow * self.block_cols + bcol, 2 * rowbit + colbit
+
+    def get_cell(self, rowidx, colidx):
+        index, bit = self._locate(rowidx, colidx)
+        return self.blocks[self.phase][index] >> bit & 1
+
+    def set_cell(self, rowidx, colidx, state):
+        index, bit = self._locate(rowidx, colidx)
+        if state:
+            self.blocks[self.phase][index] |= 1 << bit
+        else:
+            self.blocks[self.phase][index] &= ~(1 << bit)
+
+    @property
+    def live_cells(self):
+        origin = self.phase - 2
+        cells = set()
+        for index, block in enumerate(self.blocks[self.phase]):
+            if not block:
+                continue
+            brow, bcol = divmod(index, self.block_cols)
+            for bit in range(4):
+                if block >> bit & 1:
+                    cells.add((origin + 2 * brow + bit // 2, origin + 2 * bcol + bit % 2))
+        return cells
+
+    def zero_out(self):
+        for blocks in self.blocks:
+            blocks[:] = bytes(len(blocks))
+        self.phase = 0
+        self.generation = 0
+
+    def dump(self):
+        rows, cols = self.dimensions
+        print("Cell states:")
+        for rowidx in range(rows):
+            print("".join("██" if self.get_cell(rowidx, colidx) else "  " for colidx in range(cols)))
+        print()
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        """Bring cells to life, a chunk at a time, ORing in one mask per block touched."""
+        rows, cols = self.dimensions
+        # _locate worked out once per row and per col instead of once per cell
+        origin = self.phase - 2
+        row_offsets = [(rowidx - origin) // 2 * self.block_cols for rowidx in range(rows)]
+        row_bits = [2 * ((rowidx - origin) % 2) for rowidx in range(rows)]
+        col_offsets = [(colidx - origin) // 2 for colidx in range(cols)]
+        col_bits = [(colidx - origin) % 2 for colidx in range(cols)]
+        blocks = self.blocks[self.phase]
+        cells = iter(cells)
+        while True:
+            chunk = list(itertools.islice(cells, chunk_size))
+            if not chunk:
+                break
+            masks = collections.defaultdict(int)
+            for rowidx, colidx in chunk:
+                if 0 <= rowidx < rows and 0 <= colidx < cols:
+                    masks[row_offsets[rowidx] + col_offsets[colidx]] |= 1 << (row_bits[rowidx] + col_bits[colidx])
+            for index, mask in masks.items():
+                blocks[index] |= mask
+
+    def live_cell_count(self):
+        return sum(self.blocks[self.phase].translate(POPCOUNT))
+
+    def _decide(self):
+        """The table entry of every 4x4 of the board, a row of them per block row (None for blank rows)."""
+        table = self.table
+        source = self.blocks[self.phase]
+        block_cols = self.block_cols
+        skip_blank = table[0] == 0
+        decisions = []
+        for brow in range(self.block_rows - 1):
+            start = brow * block_cols
+            top = source[start:start + block_cols]
+            bottom = source[start + block_cols:start + 2 * block_cols]
+            if skip_blank and top.count(0) == block_cols and bottom.count(0) == block_cols:
+                decisions.append(None)
+                continue
+            # the left (nw | sw) and right (ne | se) halves of each 4x4 index
+            pairs = [upper | lower << 8 for upper, lower in zip(top, bottom)]
+            decisions.append(bytes([table[left | right << 4] for left, right in zip(pairs, pairs[1:])]))
+        return decisions
+
+    def _examined(self):
+        return self.dimensions[0] * self.dimensions[1]
+
+    def _apply(self, decisions):
+        """Write the next blocks out of the table entries, return whether anything changed."""
+        target = self.blocks[1 - self.phase]
+        row_masks, (inner_start, inner_stop), edges = self.masks[1 - self.phase]
+        block_cols = self.block_cols
+        width = block_cols - 1
+        # the 4x4 made of blocks (brow, bcol) to (brow + 1, bcol + 1) has its center
+        # in block (brow, bcol) of phase 1, but in block (brow + 1, bcol + 1) of phase 0
+        shift = self.phase
+        blank = bytes(width)
+        changed = False
+        for brow, entries in enumerate(decisions):
+            target_start = (brow + shift) * block_cols + shift
+            if entries is None:
+                target[target_start:target_start + width] = blank
+                continue
+            next_blocks, changes = row_masks[brow + shift]
+            row = bytearray(entries.translate(next_blocks))
+            for bcol, keep in edges:
+                row[bcol] &= keep
+            target[target_start:target_start + width] = row
+            if not changed:
+                flipped = entries.translate(changes)
+                changed = (
+                    flipped.count(0, inner_start, inner_stop) < inner_stop - inner_start
+                    or any(flipped[bcol] & keep for bcol, keep in edges)
+                )
+        self.phase = 1 - self.phase
+        self.generation += 1
+        return changed
+
+    def advance(self):
+        # return the boolean of were any changes made
+        return self._apply(self._decide())
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+
+def main():
+    mygame = GameOfLife(rows=20, cols=20)  # setup the board
+    random.seed(0)
+    mygame.seed(30)
+    renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=70):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
+            break
+    renderer.close()
+    if message is not None:
+        print(message)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Run any engine headless, as fast as it goes.
+
+    python cli.py --engine numpy_dense --size 512 --density 0.3 --seed 1 --generations 5000
+    python cli.py --engine short_fns --pattern glider_gun.rle --output snapshots --format rle --every 30
+    python cli.py --engine game_of_life --stop extinct,steady,cycle --output stats --every 100
+
+Nothing is drawn and nothing sleeps. Runs stop after --generations or the first of
+the --stop conditions: extinct (no live cells), steady (a generation with no
+changes), cycle (the board repeats, for engines with detect_cycle()) or
+--max-seconds of wall time. The output is a one line summary at the end (the
+default), or JSON lines of stats every --every generations followed by the summary
+as JSON, or the board every --every generations as RLE, plaintext or JSON lines.
+
+Only the chosen engine's module (and what it imports itself) is loaded.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+
+import engines
+import lifeio
+import render
+import rules
+import seeding
+import topology
+
+STOP_CONDITIONS = ("extinct", "steady", "cycle")
+OUTPUTS = ("summary", "stats", "snapshots")
+FORMATS = ("rle", "cells", "jsonl")
+
+
+def comma_list(choices):
+    def parse(value):
+        values = [item for item in value.split(",") if item]
+        for item in values:
+            if item not in choices:
+                raise argparse.ArgumentTypeError("{!r} is not one of {}".format(item, ", ".join(choices)))
+        return values
+    return parse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", default="game_of_life", choices=list(engines.ENGINES))
+    parser.add_argument("--size", type=int, default=64, help="rows and cols of a square board")
+    parser.add_argument("--rows", type=int, help="overrides --size")
+    parser.add_argument("--cols", type=int, help="overrides --size")
+    parser.add_argument("--rule", help="B/S rulestring or a name from rules.RULES")
+    parser.add_argument("--topology", help="dead, torus or klein, for the engines that take one")
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument("--density", type=float, default=0.3, help="chance of each cell starting live")
+    start.add_argument("--cells", type=int, help="exact number of random live cells to start with")
+    start.add_argument("--pattern", help="start from a pattern file (.rle, .cells or .mc) or a name from seeding.PATTERNS")
+    parser.add_argument("--seed", type=int, help="seed of the random start, random if not given")
+    parser.add_argument("--generations", type=int, default=1000, help="generations to run at most")
+    parser.add_argument("--stop", type=comma_list(STOP_CONDITIONS), default=[], help="comma separated, any of " + ", ".join(STOP_CONDITIONS))
+    parser.add_argument("--max-seconds", type=float, help="stop after this much wall time")
+    parser.add_argument("--output", choices=OUTPUTS, default="summary")
+    parser.add_argument("--format", choices=FORMATS, default="rle", help="of the snapshots")
+    parser.add_argument("--every", type=int, default=100, help="generations between stats lines or snapshots")
+    parser.add_argument("--out", help="write the output here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    args.rows = args.size if args.rows is None else args.rows
+    args.cols = args.size if args.cols is None else args.cols
+    if min(args.rows, args.cols) < 1:
+        parser.error("the board needs at least one row and one col")
+    engine_cls = engines.load_engine(args.engine)
+    parameters = inspect.signature(engine_cls).parameters
+    for option in ("rule", "topology"):
+        if getattr(args, option) is not None and option not in parameters:
+            parser.error("the {} engine does not take --{}".format(args.engine, option))
+    if "cycle" in args.stop and not hasattr(engine_cls, "detect_cycle"):
+        parser.error("the {} engine can not detect cycles, --stop cycle needs one that can".format(args.engine))
+    if args.rule is not None:
+        try:
+            rules.make_rule(args.rule, allow_b0=getattr(engine_cls, "ALLOW_B0", True))
+        except ValueError as error:
+            parser.error("--rule: {}".format(error))
+    if args.topology is not None and args.topology not in topology.TOPOLOGIES:
+        parser.error("--topology must be one of {}".format(", ".join(topology.TOPOLOGIES)))
+    if args.pattern is not None and args.pattern not in seeding.PATTERNS:
+        if os.path.splitext(args.pattern)[1].lower() not in lifeio.READERS:
+            parser.error("--pattern {} is not a pattern name, .rle, .cells or .mc file".format(args.pattern))
+        if not os.path.isfile(args.pattern):
+            parser.error("--pattern {} does not exist".format(args.pattern))
+    return args
+
+
+def make_board(args):
+    engine_cls = engines.load_engine(args.engine)
+    options = {}
+    if args.rule is not None:
+        options["rule"] = args.rule
+    if args.topology is not None:
+        options["topology"] = args.topology
+    rows, cols = args.rows, args.cols
+    board = engine_cls(rows=rows, cols=cols, **options)
+    if args.pattern in seeding.PATTERNS:
+        # in the middle of the board
+        cells = list(seeding.pattern_cells(args.pattern))
+        height = 1 + max(rowidx for rowidx, colidx in cells)
+        width = 1 + max(colidx for rowidx, colidx in cells)
+        seeding.stamp(board, cells, (rows - height) // 2, (cols - width) // 2)
+    elif args.pattern is not None:
+        lifeio.load(args.pattern, board)
+    elif args.cells is not None:
+        board.seed(args.cells, rng=args.seed)
+    else:
+        board.seed(density=args.density, rng=args.seed)
+    return board
+
+
+def write_snapshot(board, generation, fmt, outfile):
+    if fmt == "jsonl":
+        cells = sorted(render.live_cells_of(board))
+        outfile.write(json.dumps({"generation": generation, "cells": [list(cell) for cell in cells]}) + "\n")
+    elif fmt == "rle":
+        outfile.write("#C generation {}\n".format(generation))
+        lifeio.write_rle(board, outfile)
+    else:
+        lifeio.write_plaintext(board, outfile, name="generation {}".format(generation))
+
+
+def run(board, args, outfile):
+    """Advance board until a limit or stop condition, return the summary."""
+    stop = set(args.stop)
+    if "cycle" in stop and not hasattr(board, "detect_cycle"):
+        raise AssertionError("The {} engine can not detect cycles".format(args.engine))
+    rows, cols = args.rows, args.cols
+    generation = 0
+    stopped = "generations"
+    if args.output == "snapshots":
+        write_snapshot(board, generation, args.format, outfile)
+    start = last_time = time.perf_counter()
+    last_generation = 0
+    while generation < args.generations:
+        changed = board.advance()
+        generation += 1
+        if "steady" in stop and changed is False:
+            stopped = "steady"
+        elif "extinct" in stop and board.live_cell_count() == 0:
+            stopped = "extinct"
+        elif "cycle" in stop and board.detect_cycle() is not None:
+            stopped = "cycle"
+        elif args.max_seconds is not None and time.perf_counter() - start >= args.max_seconds:
+            stopped = "max_seconds"
+        if generation % args.every == 0 or stopped != "generations":
+            if args.output == "stats":
+                now = time.perf_counter()
+                outfile.write(json.dumps({
+                    "generation": generation,
+                    "population": board.live_cell_count(),
+                    "elapsed": now - start,
+                    "generations_per_sec": (generation - last_generation) / max(now - last_time, 1e-9),
+                }) + "\n")
+                last_time, last_generation = now, generation
+            elif args.output == "snapshots":
+                write_snapshot(board, generation, args.format, outfile)
+        if stopped != "generations":
+            break
+    elapsed = time.perf_counter() - start
+    summary = {
+        "engine": args.engine,
+        "rows": rows,
+        "cols": cols,
+        "seed": args.seed,
+        "generations": generation,
+        "population": board.live_cell_count(),
+        "stopped": stopped,
+        "elapsed": elapsed,
+        "generations_per_sec": generation / max(elapsed, 1e-9),
+        "cells_per_sec": generation * rows * cols / max(elapsed, 1e-9),
+    }
+    cycle = board.detect_cycle() if hasattr(board, "detect_cycle") else None
+    if cycle is not None:
+        summary["cycle"] = {"start": cycle.start, "period": cycle.period}
+    return summary
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    outfile = open(args.out, "w") if args.out else sys.stdout
+    board = make_board(args)
+    try:
+        summary = run(board, args, outfile)
+        if args.output == "summary":
+            outfile.write(
+                "{engine} {rows}x{cols}: {generations} generations in {elapsed:.3f} s"
+                " ({generations_per_sec:.1f} gen/s, {cells_per_sec:.0f} cells/s),"
+                " population {population}, stopped on {stopped}\n".format(**summary)
+            )
+        elif args.output == "stats":
+            outfile.write(json.dumps(summary) + "\n")
+    finally:
+        close = getattr(board, "close", None)
+        if close is not None:
+            close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    return 0
+
+
+if "__main__" == __name__:
+    sys.exit(main())
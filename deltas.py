@@ -0,0 +1,64 @@
+"""
+Per generation change records, streamed straight out of the engines.
+
+Every engine gets a generations() generator from here, so consumers see only what
+changed instead of rereading the whole board. Engines with a step() method (which
+advances one generation and returns the (to_birth, to_die) cells it applied) say
+what changed themselves, step_engine() gets the same out of the engines that only
+have advance(), by comparing the board before and after.
+"""
+
+import collections
+import itertools
+import json
+
+import render
+
+
+Generation = collections.namedtuple(
+    "Generation",
+    ["generation", "births", "deaths", "population", "changed"],
+)
+
+
+def step_engine(engine):
+    """Advance engine one generation, return the (to_birth, to_die) cells."""
+    step = getattr(engine, "step", None)
+    if step is not None:
+        return step()
+    before = set(render.live_cells_of(engine))
+    engine.advance()
+    after = set(render.live_cells_of(engine))
+    return after - before, before - after
+
+
+def generations(engine, limit=None):
+    """Advance engine one generation at a time, yielding a Generation for each."""
+    generation = getattr(engine, "generation", 0)
+    turns = itertools.count() if limit is None else range(limit)
+    for iturn in turns:
+        to_birth, to_die = step_engine(engine)
+        generation += 1
+        yield Generation(
+            generation=generation,
+            births=to_birth,
+            deaths=to_die,
+            population=engine.live_cell_count(),
+            changed=bool(to_birth) or bool(to_die),
+        )
+
+
+def write_jsonl(records, outfile):
+    """Write records to outfile as they come, one JSON object per line."""
+    written = 0
+    for record in records:
+        outfile.write(json.dumps({
+            "generation": record.generation,
+            "births": [list(cell) for cell in record.births],
+            "deaths": [list(cell) for cell in record.deaths],
+            "population": record.population,
+            "changed": record.changed,
+        }))
+        outfile.write("\n")
+        written += 1
+    return written
@@ -0,0 +1,30 @@
+"""
+Every engine by name. Modules are only imported when an engine is asked for, so
+picking one engine never pays for importing the others (or numpy).
+"""
+
+import importlib
+
+
+ENGINES = {
+    "game_of_life": "game_of_life",
+    "adaptive": "adaptive",
+    "short_fns": "short_fns",
+    "no_conditionals": "no_conditionals",
+    "frozen": "no_conditionals:FrozenGameOfLife",
+    "numpy_dense": "numpy_dense",
+    "bitpacked": "bitpacked",
+    "blocktable": "blocktable",
+    "packed_sparse": "packed_sparse",
+    "hashlife": "hashlife",
+    "parallel": "parallel",
+}
+
+
+def load_engine(name):
+    """The GameOfLife class (or the class after the ":") of the named engine."""
+    try:
+        module_name, _, class_name = ENGINES[name].partition(":")
+    except KeyError:
+        raise AssertionError("Unknown engine {!r}, expected one of {}".format(name, ", ".join(ENGINES)))
+    return getattr(importlib.import_module(module_name), class_name or "GameOfLife")
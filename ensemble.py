@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Many independent small boards advanced together.
+
+All the boards are stacked into one (boards, rows + 2, cols + 2) uint8 array (same
+dead border as numpy_dense) and each advance() runs the numpy_dense kernel once over
+the whole stack. Boards that die out or reach a steady state are dropped from the
+working stack, so each step only pays for the boards that are still going.
+"""
+
+import random
+
+import numpy as np
+
+import numpy_dense
+import rules
+
+
+class Ensemble:
+    LIVE = 1
+    DEAD = 0
+
+    def __init__(self, boards=1000, rows=64, cols=64, rule=None):
+        if min(boards, rows, cols) < 1:
+            raise AssertionError("Must have boards, rows and cols!")
+        self.dimensions = (rows, cols)
+        self.rule = rules.make_rule(rule)
+        self.rule_table = numpy_dense.rule_table(self.rule)
+        self.padded_states = np.zeros((boards, rows + 2, cols + 2), dtype=np.uint8)
+        self.changed = np.zeros(boards, dtype=bool)
+        self.live_counts = np.zeros(boards, dtype=np.int64)
+        # generation each board finished on, -1 while it is still active
+        self.finished_at = np.full(boards, -1, dtype=np.int64)
+        self.generation = 0
+        self.zero_out()
+
+    def __len__(self):
+        return len(self.padded_states)
+
+    def zero_out(self):
+        self.padded_states.fill(self.DEAD)
+        self.changed.fill(False)
+        self.live_counts.fill(0)
+        self.finished_at.fill(-1)
+        self.generation = 0
+        self.active = np.arange(len(self))
+        self._working = self.padded_states.copy()
+        self._counts = np.zeros((len(self),) + self.dimensions, dtype=np.uint8)
+        self._next = np.zeros_like(self._counts)
+
+    @property
+    def cell_states(self):
+        """(boards, rows, cols) view of every board, active ones included."""
+        self.padded_states[self.active] = self._working
+        return self.padded_states[:, 1:-1, 1:-1]
+
+    def seed(self, num_cells, rng=None):
+        """Restart every board with num_cells (an int or one per board) random live cells."""
+        self.zero_out()
+        rng = np.random.default_rng(random.getrandbits(64) if rng is None else rng)
+        rows, cols = self.dimensions
+        num_cells = np.broadcast_to(np.asarray(num_cells), (len(self),))
+        # a cell is live if its rank among its board's random keys is below num_cells
+        ranks = rng.random((len(self), rows * cols)).argsort(axis=1).argsort(axis=1)
+        live = ranks < num_cells[:, np.newaxis]
+        self.padded_states[:, 1:-1, 1:-1] = live.reshape((len(self), rows, cols))
+        self._working[...] = self.padded_states
+        self.live_counts[...] = np.count_nonzero(live, axis=1)
+        self.changed.fill(True)
+
+    def live_cell_count(self):
+        return int(self.live_counts.sum())
+
+    def advance(self):
+        """Advance every active board, return (changed, live_counts) for all boards."""
+        self.changed.fill(False)
+        active = self.active
+        if len(active):
+            working = self._working
+            counts = self._counts[:len(active)]
+            next_states = self._next[:len(active)]
+            numpy_dense.count_neighbors(working, counts)
+            numpy_dense.apply_rule(working[:, 1:-1, 1:-1], counts, next_states, self.rule_table)
+            changed = (next_states != working[:, 1:-1, 1:-1]).any(axis=(1, 2))
+            working[:, 1:-1, 1:-1] = next_states
+            live_counts = np.count_nonzero(next_states.reshape((len(active), -1)), axis=1)
+            self.changed[active] = changed
+            self.live_counts[active] = live_counts
+            self.generation += 1
+
+            finished = ~changed | (live_counts == 0)
+            if finished.any():
+                self.padded_states[active[finished]] = working[finished]
+                self.finished_at[active[finished]] = self.generation
+                self.active = active[~finished]
+                self._working = working[~finished]
+        return self.changed.copy(), self.live_counts.copy()
+
+
+def main():
+    random.seed(0)
+    myensemble = Ensemble(boards=500, rows=64, cols=64)
+    myensemble.seed(1200)
+    for iturn in range(500):
+        if 0 == len(myensemble.active):
+            break
+        myensemble.advance()
+    print("{} of {} boards still running after {} generations".format(
+        len(myensemble.active), len(myensemble), myensemble.generation))
+    print("{} boards died out".format(int((myensemble.live_counts == 0).sum())))
+
+
+if "__main__" == __name__:
+    main()
@@ -9,32 +9,58 @@ So keep track of state of cell (live/dead)
 and counts of neighbors (birth of cell increments all neighbors (8) by 1, death of cell decrements live neighbors by 1)
 """
 
-import itertools
+import collections
 import pprint
 import random
-import time
+
+import deltas
+import render
+import rules
+import seeding
+from topology import make_topology
+
+
+Cycle = collections.namedtuple("Cycle", ["start", "period"])
+
+MASK64 = (1 << 64) - 1
+
+
+def zobrist_key(rowidx, colidx):
+    """Pseudo random 64 bit key for a cell (splitmix64 of its position)."""
+    z = (((rowidx << 32) ^ colidx) + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
 
 
 class GameOfLife:
     LIVE = 1
     DEAD = 0
+    ALLOW_B0 = False
 
-    def __init__(self, rows=4, cols=4):
+    def __init__(self, rows=4, cols=4, history_size=1024, rule=None, topology=None):
         if min(rows, cols) < 1:
             raise AssertionError("Must have both rows and cols!")
         self.dimensions = (rows, cols)
+        # a dead cell off the frontier has 0 neighbors, so B0 would break the frontier
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
         self.cell_states = []
         self.live_neighbor_counts = []
+        # cells whose state or neighbor count changed last generation, only these
+        # can change in the next one
+        self.frontier = set()
+        self.population = 0
+        # xor of the zobrist keys of all live cells, and the generation each of the
+        # last history_size board hashes was seen at
+        self.board_hash = 0
+        self.generation = 0
+        self.history_size = history_size
+        self.hash_history = collections.OrderedDict()
+        self.cycle = None
+        # precomputed neighbors, no bounds checks when counting
+        self.topology = make_topology(topology, rows, cols)
         self.zero_out()
 
-        self.neighbors_map = set(
-            itertools.product(
-                range(-1, 2),
-                range(-1, 2)
-            )
-        )
-        self.neighbors_map.remove((0, 0))
-
     def zero_out(self):
         self.cell_states[:] = []
         self.live_neighbor_counts[:] = []
@@ -44,6 +70,11 @@ class GameOfLife:
             for colnum in range(self.dimensions[1]):
                 self.cell_states[-1].append(self.DEAD)
                 self.live_neighbor_counts[-1].append(0)
+        self.frontier.clear()
+        self.population = 0
+        self.board_hash = 0
+        self.generation = 0
+        self.reset_history()
 
     def dump(self):
         width = 5 + 3 * self.dimensions[0]
@@ -54,40 +85,39 @@ class GameOfLife:
             print("Neighbor counts:")
             pprint.pprint(self.live_neighbor_counts, width=width)
 
-    def seed(self, num_cells):
-        while num_cells > 0:
-            for attempt in range(5):
-                proposed_row = random.choice(self.cell_states)
-                proposed_col = random.randint(0, len(proposed_row) - 1)
-                if proposed_row[proposed_col]:
-                    continue
-                else:
-                    proposed_row[proposed_col] = self.LIVE
-                    break
-            else:
-                break
-            num_cells -= 1
-        self.init_neighbors()
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells):
+        """Bring cells to life, updating only their neighbors' counts."""
+        maxrow, maxcol = self.dimensions
+        for rowidx, colidx in cells:
+            if rowidx < 0 or colidx < 0:
+                continue
+            if rowidx >= maxrow or colidx >= maxcol:
+                continue
+            if self.cell_states[rowidx][colidx] is self.LIVE:
+                continue
+            self.cell_states[rowidx][colidx] = self.LIVE
+            self.frontier.add((rowidx, colidx))
+            self.increment_neighbors(rowidx, colidx)
+            self.board_hash ^= zobrist_key(rowidx, colidx)
+            self.population += 1
+        self.reset_history()
 
     def live_cell_count(self):
-        total = 0
-        for irow in self.cell_states:
-            total += sum(irow)
-        return total
+        return self.population
 
     def delta_neighbors(self, rowidx, colidx, step=0):
         if step not in [-1, 1]:
             raise AssertionError("can only increment or decrement")
-        maxrow = self.dimensions[0]
-        maxcol = self.dimensions[1]
-        for rowoffset, coloffset in self.neighbors_map:
-            newrow = rowidx + rowoffset
-            newcol = colidx + coloffset
-            if newrow < 0 or newcol < 0:
-                continue
-            if newrow >= maxrow or newcol >= maxcol:
-                continue
-            self.live_neighbor_counts[newrow][newcol] += step
+        live_neighbor_counts = self.live_neighbor_counts
+        frontier = self.frontier
+        for newrow, newcol in self.topology.neighbors(rowidx, colidx):
+            live_neighbor_counts[newrow][newcol] += step
+            frontier.add((newrow, newcol))
 
     def increment_neighbors(self, rowidx, colidx):
         return self.delta_neighbors(rowidx, colidx, step=1)
@@ -101,64 +131,116 @@ class GameOfLife:
         for irow in self.live_neighbor_counts:
             for icol in range(len(irow)):
                 irow[icol] = 0
+        self.frontier.clear()
+        self.population = 0
+        board_hash = 0
 
         for rowidx, irow in enumerate(self.cell_states):
             for colidx, cell_state in enumerate(irow):
                 if cell_state:
+                    self.frontier.add((rowidx, colidx))
                     self.increment_neighbors(rowidx, colidx)
+                    board_hash ^= zobrist_key(rowidx, colidx)
+                    self.population += 1
+        self.board_hash = board_hash
+        self.reset_history()
+
+    def reset_history(self):
+        self.hash_history.clear()
+        self.cycle = None
+        self.record_hash()
+
+    def record_hash(self):
+        seen_at = self.hash_history.get(self.board_hash)
+        if seen_at is not None and self.cycle is None:
+            self.cycle = Cycle(start=seen_at, period=self.generation - seen_at)
+        self.hash_history[self.board_hash] = self.generation
+        self.hash_history.move_to_end(self.board_hash)
+        if len(self.hash_history) > self.history_size:
+            self.hash_history.popitem(last=False)
+
+    def detect_cycle(self):
+        """Cycle(start, period) once the board repeats (within history_size generations), else None."""
+        return self.cycle
 
     def advance(self):
-        # Any live cell with fewer than two live neighbours dies, as if by underpopulation.
-        # Any live cell with more than three live neighbours dies, as if by overpopulation.
-        # Any dead cell with exactly three live neighbours becomes a live cell,
-        # as if by reproduction.
+        to_birth, to_die = self.step()
+        # return the boolean of were any changes made
+        return bool(to_die) or bool(to_birth)
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def _decide(self, frontier):
+        """The (to_birth, to_die) cells of frontier, from the rule table."""
         to_birth = []
         to_die = []
-        for rowidx, irow in enumerate(self.cell_states):
-            for colidx, cell_state in enumerate(irow):
-                cell_neighbor_count = self.live_neighbor_counts[rowidx][colidx]
-                if cell_state is self.LIVE:
-                    if cell_neighbor_count < 2:
-                        to_die.append((rowidx, colidx))
-                    elif 3 < cell_neighbor_count:
-                        to_die.append((rowidx, colidx))
-                    else:
-                        pass
-                elif cell_state is self.DEAD:
-                    if 3 == cell_neighbor_count:
-                        to_birth.append((rowidx, colidx))
-                else:
-                    raise AssertionError("Bad cell state")
-
-        # birth cells
+        # changes[state] is where a cell in that state goes if it flips
+        changes = (to_birth, to_die)
+        table = self.rule.table
+        cell_states = self.cell_states
+        live_neighbor_counts = self.live_neighbor_counts
+        for rowidx, colidx in frontier:
+            cell_state = cell_states[rowidx][colidx]
+            if table[cell_state][live_neighbor_counts[rowidx][colidx]] != cell_state:
+                changes[cell_state].append((rowidx, colidx))
+        return to_birth, to_die
+
+    def _examined(self, frontier):
+        return len(frontier)
+
+    def _apply(self, to_birth, to_die):
+        for cells, state in ((to_birth, self.LIVE), (to_die, self.DEAD)):
+            for rowidx, colidx in cells:
+                self.cell_states[rowidx][colidx] = state
+                self.frontier.add((rowidx, colidx))
+                self.board_hash ^= zobrist_key(rowidx, colidx)
+
+    def _count(self, to_birth, to_die):
+        """Bring the neighbor counts (and with them the frontier) up to date with the changes."""
         for rowidx, colidx in to_birth:
-            self.cell_states[rowidx][colidx] = self.LIVE
             self.increment_neighbors(rowidx, colidx)
-
-        # death cells
         for rowidx, colidx in to_die:
-            self.cell_states[rowidx][colidx] = self.DEAD
             self.decrement_neighbors(rowidx, colidx)
 
-        # return the boolean of were any changes made
-        return bool(to_die) or bool(to_birth)
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        # Anything off the frontier has the same state and neighbor count as last
+        # generation, so it would make the same (no change) decision again.
+        frontier, self.frontier = self.frontier, set()
+        to_birth, to_die = self._decide(frontier)
+        self._apply(to_birth, to_die)
+        self._count(to_birth, to_die)
+        self.population += len(to_birth) - len(to_die)
+        self.generation += 1
+        self.record_hash()
+        return to_birth, to_die
 
 
 def main():
     mygame = GameOfLife()  # setup the board
     random.seed(0)
     mygame.seed(10)
-    mygame.dump()
-    for iturn in range(50):
-        if 0 == mygame.live_cell_count():
-            print("All cells are dead, game over.")
-            break
-        made_changes = mygame.advance()
-        mygame.dump()
-        if made_changes is False:
-            print("Reached a steady state, game over.")
+    renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=50):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        elif mygame.detect_cycle() is not None:
+            cycle = mygame.detect_cycle()
+            message = "Entered a cycle of period {} at generation {}, game over.".format(
+                cycle.period, cycle.start)
+        if message is not None:
             break
-        time.sleep(0.1)
+    renderer.close()
+    if message is not None:
+        print(message)
 
 
 if "__main__" == __name__:
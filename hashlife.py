@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Hashlife version: the (unbounded) universe is a quadtree of canonical nodes, a node
+of level k is a 2**k x 2**k square made of 4 level k-1 quadrants and identical
+squares are the same object. The result of running a node forward is memoized per
+node, so repeated structure (in space or in time) is only ever computed once and
+advance(n) can jump ahead 2**j generations at a time.
+
+The root is always centered on the origin, it covers rows and cols in
+[-2**(level-1), 2**(level-1)).
+"""
+
+import itertools
+import random
+
+import deltas
+import render
+import rules
+import seeding
+
+
+class Node:
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+
+    def __repr__(self):
+        return "Node(level={}, population={})".format(self.level, self.population)
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+    ALLOW_B0 = False
+    MIN_LEVEL = 3
+
+    def __init__(self, rows=4, cols=4, cache_limit=1 << 20, rule=None):
+        # rows and cols are only the window used by seed and dump, the universe
+        # itself has no edges
+        self.rows, self.cols = rows, cols
+        # B0 would light up the whole infinite universe
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
+        self.cache_limit = cache_limit
+        self.off = Node(0, population=0)
+        self.on = Node(0, population=1)
+        self._nodes = {}
+        self._results = {}
+        self._empties = [self.off]
+        self.generation = 0
+        self.root = self.empty(self.MIN_LEVEL)
+
+    # node construction
+
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = self._nodes[key] = Node(nw.level + 1, nw, ne, sw, se, population)
+        return node
+
+    def empty(self, level):
+        while len(self._empties) <= level:
+            smaller = self._empties[-1]
+            self._empties.append(self.join(smaller, smaller, smaller, smaller))
+        return self._empties[level]
+
+    def center(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def expand(self, node):
+        """Same pattern one level up, still centered on the origin."""
+        border = self.empty(node.level - 1)
+        return self.join(
+            self.join(border, border, border, node.nw),
+            self.join(border, border, node.ne, border),
+            self.join(border, node.sw, border, border),
+            self.join(node.se, border, border, border),
+        )
+
+    def is_padded(self, node):
+        """Is every live cell of node inside its center quadrant?"""
+        inner = (
+            node.nw.se.population + node.ne.sw.population
+            + node.sw.ne.population + node.se.nw.population
+        )
+        return inner == node.population
+
+    def crop(self, node):
+        while node.level > self.MIN_LEVEL and self.is_padded(node):
+            node = self.center(node)
+        return node
+
+    # evolution
+
+    def life_4x4(self, node):
+        """Center 2x2 of a level 2 node, one generation on."""
+        grid = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        grid = [[cell.population for cell in irow] for irow in grid]
+        table = self.rule.table
+        cells = (self.off, self.on)
+        next_cells = []
+        for rowidx in (1, 2):
+            for colidx in (1, 2):
+                neighbor_count = sum(
+                    grid[rowidx + rowoffset][colidx + coloffset]
+                    for rowoffset in (-1, 0, 1)
+                    for coloffset in (-1, 0, 1)
+                ) - grid[rowidx][colidx]
+                next_cells.append(cells[table[grid[rowidx][colidx]][neighbor_count]])
+        return self.join(*next_cells)
+
+    def successor(self, node, j):
+        """Center level-1 node of node, 2**j generations on (j <= level - 2)."""
+        if node.population == 0:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        if node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self.join
+            c1 = self.successor(nw, j)
+            c2 = self.successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self.successor(ne, j)
+            c4 = self.successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self.successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self.successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self.successor(sw, j)
+            c8 = self.successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self.successor(se, j)
+            if j < node.level - 2:
+                # the 9 pieces are already far enough on, just take their centers
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), j),
+                    self.successor(join(c2, c3, c5, c6), j),
+                    self.successor(join(c4, c5, c7, c8), j),
+                    self.successor(join(c5, c6, c8, c9), j),
+                )
+        self._results[key] = result
+        return result
+
+    def jump(self, j):
+        """Move the whole universe 2**j generations on."""
+        root = self.root
+        while root.level < j + 2 or not self.is_padded(root):
+            root = self.expand(root)
+        root = self.successor(self.expand(root), j)
+        self.root = self.crop(root)
+        self.generation += 1 << j
+
+    def advance(self, generations=1):
+        before = self.root
+        remaining, j = generations, 0
+        while remaining:
+            if remaining & 1:
+                self.jump(j)
+            remaining >>= 1
+            j += 1
+        if len(self._results) > self.cache_limit:
+            self.collect()
+        # roots are canonical and cropped the same way, so same object == same board
+        return self.root is not before
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def collect(self):
+        """Drop cached nodes and results that are no longer reachable from the root."""
+        reachable = set()
+        self._mark(self.root, reachable)
+        results = {
+            key: result
+            for key, result in self._results.items()
+            if key[0] in reachable
+        }
+        if len(results) > self.cache_limit // 2:
+            results = {}
+        for result in results.values():
+            self._mark(result, reachable)
+        for empty in self._empties:
+            self._mark(empty, reachable)
+        self._results = results
+        self._nodes = {
+            key: node
+            for key, node in self._nodes.items()
+            if node in reachable
+        }
+
+    def _mark(self, node, reachable):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or node in reachable:
+                continue
+            reachable.add(node)
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+
+    # conversion to / from a set of (row, col) live cells
+
+    def _build(self, cells, level, top, left):
+        if not cells:
+            return self.empty(level)
+        if level == 0:
+            return self.on
+        half = 1 << (level - 1)
+        quadrants = ([], [], [], [])
+        for rowidx, colidx in cells:
+            quadrants[2 * (rowidx >= top + half) + (colidx >= left + half)].append((rowidx, colidx))
+        return self.join(
+            self._build(quadrants[0], level - 1, top, left),
+            self._build(quadrants[1], level - 1, top, left + half),
+            self._build(quadrants[2], level - 1, top + half, left),
+            self._build(quadrants[3], level - 1, top + half, left + half),
+        )
+
+    def node_from_cells(self, cells, level):
+        """A level node with (row, col) cells relative to its top left corner."""
+        return self._build(list(cells), level, 0, 0)
+
+    def union(self, first, second):
+        """Node with the live cells of two nodes of the same level."""
+        if first.population == 0 or first is second:
+            return second
+        if second.population == 0:
+            return first
+        if first.level == 0:
+            return self.on
+        return self.join(
+            self.union(first.nw, second.nw),
+            self.union(first.ne, second.ne),
+            self.union(first.sw, second.sw),
+            self.union(first.se, second.se),
+        )
+
+    def iter_live_cells(self):
+        half = 1 << (self.root.level - 1)
+        stack = [(self.root, -half, -half)]
+        while stack:
+            node, top, left = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield (top, left)
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, top, left))
+            stack.append((node.ne, top, left + half))
+            stack.append((node.sw, top + half, left))
+            stack.append((node.se, top + half, left + half))
+
+    @property
+    def live_cells(self):
+        return set(self.iter_live_cells())
+
+    @live_cells.setter
+    def live_cells(self, cells):
+        self.root = self._root_from_cells(list(cells))
+
+    def _root_from_cells(self, cells):
+        extent = max((max(abs(rowidx), abs(colidx)) for rowidx, colidx in cells), default=0)
+        level = self.MIN_LEVEL
+        while (1 << (level - 1)) <= extent:
+            level += 1
+        half = 1 << (level - 1)
+        return self.crop(self._build(cells, level, -half, -half))
+
+    # same interface as the other engines
+
+    def zero_out(self):
+        self.root = self.empty(self.MIN_LEVEL)
+
+    def dump(self):
+        print("Cell states:")
+        live_cells = self.live_cells
+        for irow in range(self.rows):
+            to_output = []
+            for icol in range(self.cols):
+                if (irow, icol) in live_cells:
+                    to_output.append("██")
+                else:
+                    to_output.append("  ")
+            print("".join(to_output))
+        print()
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.live_cells = seeding.random_cells(self.rows, self.cols, count=num_cells, density=density, rng=rng)
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        """Bring cells to life, merging them into the tree a chunk at a time."""
+        cells = iter(cells)
+        while True:
+            chunk = list(itertools.islice(cells, chunk_size))
+            if not chunk:
+                break
+            root, added = self.root, self._root_from_cells(chunk)
+            while root.level < added.level:
+                root = self.expand(root)
+            while added.level < root.level:
+                added = self.expand(added)
+            self.root = self.crop(self.union(root, added))
+
+    def live_cell_count(self):
+        return self.root.population
+
+
+def main():
+    mygame = GameOfLife(rows=20, cols=20)  # setup the board
+    random.seed(0)
+    mygame.seed(30)
+    renderer = render.TerminalRenderer(mygame.rows, mygame.cols, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=70):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
+            break
+    renderer.close()
+    if message is not None:
+        print(message)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,169 @@
+"""
+Rewindable history of any engine, without copying the board every generation.
+
+History(engine) advances the engine and journals what each generation changed:
+the births and deaths, packed as (row, col) pairs into array("i"), 8 bytes a cell.
+Every keyframe_every generations it also keeps a keyframe, all the live cells
+packed the same way. A keyframe and the deltas after it make a segment.
+
+cells_at(generation) starts from the keyframe at or before generation and plays
+the deltas forward, at most keyframe_every of them. seek(generation) does the same
+and puts the engine back into that state (dropping the history after it, which is
+about to be rewritten). states() plays a range of generations forward for searches
+like find(), one delta per generation. With max_bytes set, the oldest segments are
+dropped whenever the journal grows past it, so the earliest generations go first.
+"""
+
+import array
+import sys
+
+import deltas
+import render
+
+
+def pack(cells):
+    packed = array.array("i")
+    for cell in cells:
+        packed.extend(cell)
+    return packed
+
+
+def unpack(packed):
+    return zip(packed[0::2], packed[1::2])
+
+
+class Segment:
+
+    def __init__(self, generation, cells):
+        self.generation = generation
+        self.keyframe = pack(sorted(cells))
+        # (births, deaths) of generations generation + 1, generation + 2, ...
+        self.deltas = []
+        self.nbytes = sys.getsizeof(self.keyframe)
+
+    def append(self, births, deaths):
+        delta = (pack(births), pack(deaths))
+        self.deltas.append(delta)
+        self.nbytes += sys.getsizeof(delta[0]) + sys.getsizeof(delta[1])
+
+    def truncate(self, generation):
+        """Forget the deltas after generation."""
+        for births, deaths in self.deltas[generation - self.generation:]:
+            self.nbytes -= sys.getsizeof(births) + sys.getsizeof(deaths)
+        del self.deltas[generation - self.generation:]
+
+
+class History:
+
+    def __init__(self, engine, keyframe_every=64, max_bytes=None):
+        if keyframe_every < 1:
+            raise AssertionError("keyframe_every must be at least 1")
+        self.engine = engine
+        self.keyframe_every = keyframe_every
+        self.max_bytes = max_bytes
+        self.generation = getattr(engine, "generation", 0)
+        self.segments = [Segment(self.generation, render.live_cells_of(engine))]
+
+    @property
+    def first_generation(self):
+        """The earliest generation that can still be restored."""
+        return self.segments[0].generation
+
+    @property
+    def nbytes(self):
+        return sum(segment.nbytes for segment in self.segments)
+
+    def live_cell_count(self):
+        return self.engine.live_cell_count()
+
+    def advance(self):
+        to_birth, to_die = self.step()
+        # return the boolean of were any changes made
+        return bool(to_die) or bool(to_birth)
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance the engine one generation and journal it, return the (to_birth, to_die) cells."""
+        to_birth, to_die = deltas.step_engine(self.engine)
+        self.generation += 1
+        segment = self.segments[-1]
+        if self.generation - segment.generation >= self.keyframe_every:
+            segment = Segment(self.generation, render.live_cells_of(self.engine))
+            self.segments.append(segment)
+        else:
+            segment.append(to_birth, to_die)
+        self.retain()
+        return to_birth, to_die
+
+    def retain(self):
+        """Drop the oldest segments until the journal fits in max_bytes (the newest always stays)."""
+        if self.max_bytes is None:
+            return
+        total = self.nbytes
+        while total > self.max_bytes and len(self.segments) > 1:
+            total -= self.segments.pop(0).nbytes
+
+    def _segment_index(self, generation):
+        if not self.first_generation <= generation <= self.generation:
+            raise AssertionError("Generation {} is not in the history ({} to {})".format(
+                generation, self.first_generation, self.generation))
+        for index in range(len(self.segments) - 1, -1, -1):
+            if self.segments[index].generation <= generation:
+                return index
+
+    def states(self, start=None, stop=None):
+        """Yield (generation, live cells) from start up to stop (both inclusive).
+
+        The live cells are one set updated as the generator goes on, copy it to keep it.
+        """
+        start = self.first_generation if start is None else start
+        stop = self.generation if stop is None else stop
+        index = self._segment_index(start)
+        cells = set(unpack(self.segments[index].keyframe))
+        generation = self.segments[index].generation
+        for segment in self.segments[index:]:
+            if segment.generation != generation:
+                # the generation after a full segment is a keyframe, not a delta
+                generation = segment.generation
+                cells.clear()
+                cells.update(unpack(segment.keyframe))
+            if generation >= start:
+                yield generation, cells
+            for births, deaths in segment.deltas:
+                if generation >= stop:
+                    return
+                cells.difference_update(unpack(deaths))
+                cells.update(unpack(births))
+                generation += 1
+                if generation >= start:
+                    yield generation, cells
+            if generation >= stop:
+                return
+
+    def cells_at(self, generation):
+        """The set of live cells at generation."""
+        for state_generation, cells in self.states(generation, generation):
+            return set(cells)
+
+    def find(self, predicate, start=None):
+        """The first generation from start on whose live cells satisfy predicate, None if there is none."""
+        for generation, cells in self.states(start):
+            if predicate(cells):
+                return generation
+        return None
+
+    def seek(self, generation):
+        """Put the engine back the way it was at generation, forgetting everything after it."""
+        cells = self.cells_at(generation)
+        index = self._segment_index(generation)
+        del self.segments[index + 1:]
+        self.segments[index].truncate(generation)
+        engine = self.engine
+        engine.zero_out()
+        if hasattr(engine, "generation"):
+            engine.generation = generation
+        engine.add_cells(cells)
+        self.generation = generation
+        return engine
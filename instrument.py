@@ -0,0 +1,225 @@
+"""
+Per generation instrumentation for any engine.
+
+    with instrument.Instrument(game, sinks=[print, ring]):
+        game.advance()
+
+While enabled, each generation produces a GenerationStats: wall time in total and
+split into its count (neighbor counting), decide (rule lookup) and apply (writing
+the next board) phases, births, deaths, cells examined, population and, with
+track_memory, bytes allocated (peak over the generation, from tracemalloc).
+
+The engines split their generation into _count, _decide and _apply methods (and
+_examined, how many cells a _decide call looks at). Enabling an Instrument sets
+timed wrappers for those, advance and step as attributes of the engine instance,
+disabling deletes them again, so a disabled engine runs its class methods with
+nothing in between. Engines without the phase methods (hashlife, and parallel,
+which sets them to None since its workers run them) only get the total, and
+adaptive's switches between representations show up as convert. advance(n) on
+the engines that take one is a single GenerationStats, numbered with the last of
+its n generations. A sink is any callable taking a GenerationStats, JsonLinesSink and
+RingBuffer are the usual two.
+"""
+
+import collections
+import json
+import time
+import tracemalloc
+
+
+PHASES = ("count", "decide", "apply", "convert")
+TIMINGS = ("total",) + PHASES
+
+GenerationStats = collections.namedtuple(
+    "GenerationStats",
+    ["generation", "total", "count", "decide", "apply", "births", "deaths", "examined", "population", "allocated", "convert"],
+    defaults=(None,),
+)
+
+
+class JsonLinesSink:
+    """Write every record to a file (a path or an open file) as one JSON object per line."""
+
+    def __init__(self, target):
+        if isinstance(target, str):
+            self.outfile = open(target, "a")
+            self.owns_file = True
+        else:
+            self.outfile = target
+            self.owns_file = False
+
+    def __call__(self, stats):
+        self.outfile.write(json.dumps(stats._asdict()))
+        self.outfile.write("\n")
+
+    def close(self):
+        if self.owns_file:
+            self.outfile.close()
+        else:
+            self.outfile.flush()
+
+
+class RingBuffer:
+    """The last size records, with aggregates over them."""
+
+    def __init__(self, size=1000):
+        self.records = collections.deque(maxlen=size)
+
+    def __call__(self, stats):
+        self.records.append(stats)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def aggregate(self):
+        """{timing: {mean, min, max, sum}} for each timing, plus sums of the counts."""
+        records = self.records
+        summary = {"generations": len(records)}
+        for field in TIMINGS:
+            values = [getattr(stats, field) for stats in records if getattr(stats, field) is not None]
+            if values:
+                summary[field] = {
+                    "mean": sum(values) / len(values),
+                    "min": min(values),
+                    "max": max(values),
+                    "sum": sum(values),
+                }
+        for field in ("births", "deaths", "examined"):
+            values = [getattr(stats, field) for stats in records if getattr(stats, field) is not None]
+            if values:
+                summary[field] = sum(values)
+        allocated = [stats.allocated for stats in records if stats.allocated is not None]
+        if allocated:
+            summary["allocated"] = max(allocated)
+        if records:
+            summary["population"] = records[-1].population
+        return summary
+
+
+class Instrument:
+
+    def __init__(self, engine, sinks=(), track_memory=False):
+        self.engine = engine
+        self.sinks = list(sinks)
+        self.track_memory = track_memory
+        self.enabled = False
+        self.generation = 0
+        self._depth = 0
+        self._timings = {}
+        self._examined = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def enable(self):
+        if self.enabled:
+            return
+        engine = self.engine
+        self._phases = [phase for phase in PHASES if getattr(engine, "_" + phase, None) is not None]
+        for phase in self._phases:
+            setattr(engine, "_" + phase, self._timed_phase(phase, getattr(engine, "_" + phase)))
+        step = getattr(engine, "step", None)
+        if step is not None:
+            engine.step = self._timed_step(step)
+        engine.advance = self._timed_advance(engine.advance, step)
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        # the wrappers live on the instance, deleting them uncovers the class methods
+        for name in ["_" + phase for phase in self._phases] + ["step", "advance"]:
+            self.engine.__dict__.pop(name, None)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.enabled = False
+
+    def _timed_phase(self, phase, method):
+        timings = self._timings
+        examined = getattr(self.engine, "_examined", None) if phase == "decide" else None
+
+        def timed(*args):
+            if examined is not None:
+                self._examined = (self._examined or 0) + examined(*args)
+            start = time.perf_counter()
+            result = method(*args)
+            timings[phase] += time.perf_counter() - start
+            return result
+        return timed
+
+    def _timed_step(self, step):
+        def timed():
+            if self._depth:
+                return step()
+            return self._measure(step)
+        return timed
+
+    def _timed_advance(self, advance, step):
+        def timed(*args, **kwargs):
+            if self._depth:
+                return advance(*args, **kwargs)
+            if step is not None and not args and not kwargs:
+                # one generation through step, which says what was born and what died
+                to_birth, to_die = self._measure(step)
+                return bool(to_birth) or bool(to_die)
+            generations = args[0] if args else kwargs.get("generations", 1)
+            return self._measure(lambda: advance(*args, **kwargs), changes=False, generations=generations)
+        return timed
+
+    def _measure(self, run, changes=True, generations=1):
+        """Run one (outermost) advance or step, send its GenerationStats to the sinks."""
+        for phase in PHASES:
+            self._timings[phase] = 0.0
+        self._examined = None
+        tracing = tracemalloc.is_tracing() and self.track_memory
+        if tracing:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        self._depth += 1
+        try:
+            start = time.perf_counter()
+            result = run()
+            total = time.perf_counter() - start
+        finally:
+            self._depth -= 1
+        allocated = tracemalloc.get_traced_memory()[1] - before if tracing else None
+        self.generation += generations
+        births = deaths = None
+        if changes:
+            births, deaths = len(result[0]), len(result[1])
+        timings = self._timings
+        stats = GenerationStats(
+            generation=getattr(self.engine, "generation", self.generation),
+            total=total,
+            births=births,
+            deaths=deaths,
+            examined=self._examined,
+            population=self.engine.live_cell_count(),
+            allocated=allocated,
+            **{phase: timings[phase] if phase in self._phases else None for phase in PHASES}
+        )
+        for sink in self.sinks:
+            sink(stats)
+        return result
+
+
+def instrument(engine, *sinks, track_memory=False):
+    """An enabled Instrument on engine sending to sinks."""
+    instrumented = Instrument(engine, sinks, track_memory=track_memory)
+    instrumented.enable()
+    return instrumented
@@ -0,0 +1,309 @@
+"""
+Reading and writing the standard Life pattern formats.
+
+    RLE        .rle    run length encoded rows, "bo$2bo$3o!"
+    plaintext  .cells  one line per row, "." dead and "O" live
+    macrocell  .mc     hashlife's quadtree, one node per line
+
+The readers take any iterable of lines (an open file works) and yield (row, col)
+live cells as they parse, so a pattern of any size goes straight into an engine's
+add_cells() without ever being held as a list. Macrocell files are read straight
+into a hashlife.GameOfLife tree, which is the only sane home for the patterns that
+format exists for. RLE and plaintext are written relative to the top left of the
+occupied cells, macrocell keeps the coordinates the cells have in the engine.
+"""
+
+import itertools
+import os
+
+
+RLE_LINE_LENGTH = 70
+
+
+# readers
+
+def read_rle(lines):
+    """Yield (row, col) of every live cell of an RLE pattern."""
+    rowidx = colidx = 0
+    run = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("x"):
+            continue
+        for char in line:
+            if char.isdigit():
+                run += char
+                continue
+            if char.isspace():
+                continue
+            length = int(run or 1)
+            run = ""
+            if char == "b" or char == ".":
+                colidx += length
+            elif char == "$":
+                rowidx += length
+                colidx = 0
+            elif char == "!":
+                return
+            elif char.isalpha():
+                # "o", or any other state of a multi state rule, is live
+                for offset in range(length):
+                    yield (rowidx, colidx + offset)
+                colidx += length
+            else:
+                raise ValueError("Unexpected {!r} in RLE data".format(char))
+
+
+def read_plaintext(lines):
+    """Yield (row, col) of every live cell of a plaintext (.cells) pattern."""
+    rowidx = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("!"):
+            continue
+        for colidx, char in enumerate(line):
+            if char in "O*":
+                yield (rowidx, colidx)
+            elif char not in ". ":
+                raise ValueError("Unexpected {!r} in plaintext data".format(char))
+        rowidx += 1
+
+
+def read_macrocell(lines, game=None):
+    """Build the quadtree of a macrocell file, return the hashlife game holding it."""
+    if game is None:
+        import hashlife
+        game = hashlife.GameOfLife()
+    # node 0 is the empty node (of whatever level it is used at)
+    nodes = [None]
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("[") or line.startswith("#"):
+            continue
+        if line[0] in ".*$":
+            nodes.append(game.node_from_cells(_leaf_cells(line), 3))
+            continue
+        level, *children = (int(field) for field in line.split())
+        if level < 4 or len(children) != 4:
+            raise ValueError("Bad macrocell node {!r}".format(line))
+        game_nodes = [
+            game.empty(level - 1) if child == 0 else nodes[child]
+            for child in children
+        ]
+        nodes.append(game.join(*game_nodes))
+    if len(nodes) == 1:
+        game.zero_out()
+    else:
+        root = nodes[-1]
+        while root.level < game.MIN_LEVEL + 1:
+            root = game.expand(root)
+        game.root = game.crop(root)
+    return game
+
+
+def _leaf_cells(line):
+    """Cells of an 8x8 macrocell leaf like "..*$...*$.***$"."""
+    for rowidx, row in enumerate(line.split("$")):
+        for colidx, char in enumerate(row):
+            if char == "*":
+                yield (rowidx, colidx)
+
+
+def read_macrocell_cells(lines):
+    """Yield (row, col) of every live cell of a macrocell pattern."""
+    return read_macrocell(lines).iter_live_cells()
+
+
+READERS = {
+    ".rle": read_rle,
+    ".cells": read_plaintext,
+    ".mc": read_macrocell_cells,
+}
+
+
+def _is_hashlife(engine):
+    # hashlife is only imported once a macrocell needs it, so loading any other
+    # engine never pays for it
+    import hashlife
+    return isinstance(engine, hashlife.GameOfLife)
+
+
+def load(path, engine, row=0, col=0):
+    """Replace engine's board with the pattern in path, top left corner at (row, col)."""
+    reader = READERS[os.path.splitext(path)[1].lower()]
+    engine.zero_out()
+    with open(path) as infile:
+        if reader is read_macrocell_cells and (row, col) == (0, 0) and _is_hashlife(engine):
+            read_macrocell(infile, engine)
+            return engine
+        engine.add_cells(
+            (rowidx + row, colidx + col)
+            for rowidx, colidx in reader(infile)
+        )
+    return engine
+
+
+# writers
+
+def _occupied_rows(engine):
+    """(top, left, height, width, rows) where rows yields (rowidx, sorted cols) of occupied rows."""
+    if hasattr(engine, "iter_live_cells"):
+        cells = sorted(engine.iter_live_cells())
+    elif hasattr(engine, "live_cells"):
+        cells = sorted(engine.live_cells)
+    else:
+        cell_states = engine.to_array() if hasattr(engine, "to_array") else engine.cell_states
+        cells = [
+            (rowidx, colidx)
+            for rowidx, irow in enumerate(cell_states)
+            for colidx, cell_state in enumerate(irow)
+            if cell_state
+        ]
+    if not cells:
+        return 0, 0, 0, 0, iter(())
+    top, bottom = cells[0][0], cells[-1][0]
+    left = min(colidx for rowidx, colidx in cells)
+    right = max(colidx for rowidx, colidx in cells)
+    rows = (
+        (rowidx, [colidx for rowidx, colidx in row_cells])
+        for rowidx, row_cells in itertools.groupby(cells, key=lambda cell: cell[0])
+    )
+    return top, left, bottom - top + 1, right - left + 1, rows
+
+
+def _runs(cols):
+    """(start, length) of each run of consecutive cols."""
+    start = previous = None
+    for colidx in cols:
+        if previous is not None and colidx == previous + 1:
+            previous = colidx
+            continue
+        if start is not None:
+            yield start, previous - start + 1
+        start = previous = colidx
+    if start is not None:
+        yield start, previous - start + 1
+
+
+def _rle_items(rows, top, left):
+    """RLE tokens for the occupied rows, without the final "!"."""
+    current_row = top
+    for rowidx, cols in rows:
+        if rowidx > current_row:
+            gap = rowidx - current_row
+            yield "{}$".format(gap if gap > 1 else "")
+            current_row = rowidx
+        colidx = left
+        for start, length in _runs(cols):
+            if start > colidx:
+                dead = start - colidx
+                yield "{}b".format(dead if dead > 1 else "")
+            yield "{}o".format(length if length > 1 else "")
+            colidx = start + length
+
+
+def _rule_of(engine):
+    return str(getattr(engine, "rule", "B3/S23"))
+
+
+def write_rle(engine, outfile, rule=None):
+    """Write the live cells of engine as RLE, relative to the top left of what is occupied.
+
+    The rule defaults to the engine's own.
+    """
+    top, left, height, width, rows = _occupied_rows(engine)
+    rule = _rule_of(engine) if rule is None else rule
+    outfile.write("x = {}, y = {}, rule = {}\n".format(width, height, rule))
+    line = ""
+    for item in itertools.chain(_rle_items(rows, top, left), ["!"]):
+        if len(line) + len(item) > RLE_LINE_LENGTH:
+            outfile.write(line + "\n")
+            line = ""
+        line += item
+    outfile.write(line + "\n")
+
+
+def write_plaintext(engine, outfile, name=None):
+    """Write the live cells of engine as plaintext, trailing dead cells left off."""
+    top, left, height, width, rows = _occupied_rows(engine)
+    if name:
+        outfile.write("!Name: {}\n".format(name))
+    current_row = top
+    for rowidx, cols in rows:
+        outfile.write("\n" * (rowidx - current_row))
+        line = ["."] * (cols[-1] - left + 1)
+        for colidx in cols:
+            line[colidx - left] = "O"
+        outfile.write("".join(line) + "\n")
+        current_row = rowidx + 1
+
+
+def write_macrocell(engine, outfile):
+    """Write engine (a hashlife game, or any engine via one) as a macrocell file."""
+    rule = _rule_of(engine)
+    if not _is_hashlife(engine):
+        import hashlife
+        game = hashlife.GameOfLife()
+        game.live_cells = _iter_live_cells(engine)
+        engine = game
+    outfile.write("[M2] (game_of_life)\n#R {}\n".format(rule))
+    root = engine.root
+    if root.population == 0:
+        return
+    ids = {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if node in ids or node.population == 0:
+            continue
+        if node.level == 3:
+            ids[node] = len(ids) + 1
+            outfile.write(_leaf_line(engine, node) + "\n")
+        elif children_done:
+            ids[node] = len(ids) + 1
+            outfile.write("{} {} {} {} {}\n".format(
+                node.level,
+                *(ids.get(child, 0) for child in (node.nw, node.ne, node.sw, node.se))
+            ))
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in (node.se, node.sw, node.ne, node.nw))
+
+
+def _leaf_line(engine, node):
+    grid = [["."] * 8 for irow in range(8)]
+    stack = [(node, 0, 0)]
+    while stack:
+        node, top, left = stack.pop()
+        if node.population == 0:
+            continue
+        if node.level == 0:
+            grid[top][left] = "*"
+            continue
+        half = 1 << (node.level - 1)
+        stack.append((node.nw, top, left))
+        stack.append((node.ne, top, left + half))
+        stack.append((node.sw, top + half, left))
+        stack.append((node.se, top + half, left + half))
+    return "".join("".join(irow).rstrip(".") + "$" for irow in grid).rstrip("$") + "$"
+
+
+def _iter_live_cells(engine):
+    top, left, height, width, rows = _occupied_rows(engine)
+    for rowidx, cols in rows:
+        for colidx in cols:
+            yield (rowidx, colidx)
+
+
+WRITERS = {
+    ".rle": write_rle,
+    ".cells": write_plaintext,
+    ".mc": write_macrocell,
+}
+
+
+def save(path, engine):
+    """Write engine to path in the format its extension names."""
+    writer = WRITERS[os.path.splitext(path)[1].lower()]
+    with open(path, "w") as outfile:
+        writer(engine, outfile)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+"""
+On-disk version of the numpy dense engine.
+
+The board lives in a file: a one page header (magic, rows, cols, generation) then
+the padded uint8 board of numpy_dense, one byte per cell, border included. The
+file is mapped with np.memmap and the engine works straight on the mapping, so the
+OS pages the board in and out as it pleases.
+
+The mapped file itself is always being written to, so next to it there is a
+checkpoint file in the same format that only ever holds a whole generation. Every
+advance() remembers which pages of the board it changed, and checkpoint() copies
+just those pages across:
+
+    1. the dirty pages (plus the generation) go to path.journal.tmp, fsync
+    2. os.replace() it to path.journal, fsync the directory - the commit point
+    3. write the pages into path.checkpoint, fsync
+    4. remove path.journal
+
+A crash before 2 leaves the previous checkpoint, a crash after it leaves a journal
+that resume() replays (replaying twice is harmless). Opening with resume=True
+replays any journal and copies the checkpoint back into the board.
+"""
+
+import mmap
+import os
+import random
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+import numpy_dense
+import render
+
+
+MAGIC = b"GOLBOARD"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQQ")
+# the board starts on a page boundary so board pages are file pages
+HEADER_SIZE = mmap.ALLOCATIONGRANULARITY
+PAGE_SIZE = mmap.PAGESIZE
+JOURNAL_PAGE = struct.Struct("<QI")
+JOURNAL_CRC = struct.Struct("<I")
+
+
+def write_header(fd, rows, cols, generation):
+    os.pwrite(fd, HEADER.pack(MAGIC, VERSION, rows, cols, generation), 0)
+
+
+def read_header(path):
+    """(rows, cols, generation) of a board file."""
+    with open(path, "rb") as infile:
+        magic, version, rows, cols, generation = HEADER.unpack(infile.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{} is not a version {} board file".format(path, VERSION))
+    return rows, cols, generation
+
+
+def create_board_file(path, rows, cols, generation=0):
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # the board is all zeros, so a sparse file is enough
+        os.ftruncate(fd, HEADER_SIZE + (rows + 2) * (cols + 2))
+        write_header(fd, rows, cols, generation)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(path):
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_journal(path, generation, pages):
+    """Atomically replace the journal at path with the (index, bytes) pages."""
+    tmp_path = path + ".tmp"
+    crc = zlib.crc32(struct.pack("<QQ", generation, len(pages)))
+    with open(tmp_path, "wb") as outfile:
+        outfile.write(struct.pack("<QQ", generation, len(pages)))
+        for index, data in pages:
+            record = JOURNAL_PAGE.pack(index, len(data))
+            outfile.write(record)
+            outfile.write(data)
+            crc = zlib.crc32(data, zlib.crc32(record, crc))
+        outfile.write(JOURNAL_CRC.pack(crc))
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(path)
+
+
+def read_journal(path):
+    """(generation, pages) of a journal, None if it is missing or was never completed."""
+    try:
+        with open(path, "rb") as infile:
+            data = infile.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < 16 + JOURNAL_CRC.size:
+        return None
+    generation, count = struct.unpack_from("<QQ", data)
+    (crc,) = JOURNAL_CRC.unpack_from(data, len(data) - JOURNAL_CRC.size)
+    if zlib.crc32(data[:-JOURNAL_CRC.size]) != crc:
+        return None
+    pages = []
+    offset = 16
+    for ipage in range(count):
+        index, length = JOURNAL_PAGE.unpack_from(data, offset)
+        offset += JOURNAL_PAGE.size
+        pages.append((index, data[offset:offset + length]))
+        offset += length
+    return generation, pages
+
+
+def apply_journal(journal_path, checkpoint_path):
+    """Write a committed journal into the checkpoint and drop it, return its generation."""
+    journal = read_journal(journal_path)
+    if journal is None:
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        return None
+    generation, pages = journal
+    rows, cols, old_generation = read_header(checkpoint_path)
+    fd = os.open(checkpoint_path, os.O_RDWR)
+    try:
+        for index, data in pages:
+            os.pwrite(fd, data, HEADER_SIZE + index * PAGE_SIZE)
+        write_header(fd, rows, cols, generation)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.remove(journal_path)
+    return generation
+
+
+class GameOfLife(numpy_dense.GameOfLife):
+
+    def __init__(self, rows=4, cols=4, path=None, resume=False, checkpoint_every=None, rule=None, topology=None):
+        self.set_rule(rule)
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(suffix=".board")
+            os.close(fd)
+        self.path = path
+        self.checkpoint_path = path + ".checkpoint"
+        self.journal_path = path + ".journal"
+        self.checkpoint_every = checkpoint_every
+        if resume:
+            rows, cols, generation = read_header(path)
+        elif min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        else:
+            create_board_file(path, rows, cols)
+            create_board_file(self.checkpoint_path, rows, cols)
+        self.dimensions = (rows, cols)
+        self.set_topology(topology)
+        self.padded_states = np.memmap(
+            path, dtype=np.uint8, mode="r+", offset=HEADER_SIZE, shape=(rows + 2, cols + 2),
+        )
+        self.cell_states = self.padded_states[1:-1, 1:-1]
+        self.live_neighbor_counts = np.zeros(self.dimensions, dtype=np.uint8)
+        self.next_states = np.zeros(self.dimensions, dtype=np.uint8)
+        self.generation = 0
+        # indices of the board pages written since the last checkpoint
+        self.dirty_pages = set()
+        if resume:
+            self.resume()
+
+    def mark_dirty(self, rowidxs, colidxs):
+        """Remember the pages holding the (interior) cells rowidxs, colidxs."""
+        offsets = (np.asarray(rowidxs, dtype=np.int64) + 1) * (self.dimensions[1] + 2) + np.asarray(colidxs) + 1
+        self.dirty_pages.update(np.unique(offsets // PAGE_SIZE).tolist())
+
+    def mark_all_dirty(self):
+        self.dirty_pages.update(range(-(-self.padded_states.size // PAGE_SIZE)))
+
+    def zero_out(self):
+        super().zero_out()
+        self.mark_all_dirty()
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        rows, cols = self.dimensions
+        pages = self.dirty_pages
+        row_bytes = cols + 2
+
+        def noted(cells):
+            for rowidx, colidx in cells:
+                if 0 <= rowidx < rows and 0 <= colidx < cols:
+                    pages.add(((rowidx + 1) * row_bytes + colidx + 1) // PAGE_SIZE)
+                yield (rowidx, colidx)
+
+        super().add_cells(noted(cells), chunk_size)
+
+    def _apply(self):
+        """Write next_states over the board, touching only the cells that flip."""
+        flipped = self.next_states != self.cell_states
+        rowidxs, colidxs = self.flipped = np.nonzero(flipped)
+        self.cell_states[rowidxs, colidxs] = self.next_states[rowidxs, colidxs]
+        self.mark_dirty(rowidxs, colidxs)
+        self.generation += 1
+        if self.checkpoint_every and self.generation % self.checkpoint_every == 0:
+            self.checkpoint()
+        return len(rowidxs) > 0
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        self._count()
+        self._decide(self.live_neighbor_counts)
+        self._apply()
+        rowidxs, colidxs = self.flipped
+        born = self.cell_states[rowidxs, colidxs] != 0
+        cells = list(zip(rowidxs.tolist(), colidxs.tolist()))
+        to_birth = [cell for cell, is_born in zip(cells, born.tolist()) if is_born]
+        to_die = [cell for cell, is_born in zip(cells, born.tolist()) if not is_born]
+        return to_birth, to_die
+
+    # persistence
+
+    def checkpoint(self):
+        """Make the current board and generation the state resume() comes back to."""
+        pages = []
+        flat = self.padded_states.reshape(-1)
+        for index in sorted(self.dirty_pages):
+            pages.append((index, flat[index * PAGE_SIZE:(index + 1) * PAGE_SIZE].tobytes()))
+        write_journal(self.journal_path, self.generation, pages)
+        apply_journal(self.journal_path, self.checkpoint_path)
+        self.dirty_pages.clear()
+
+    def resume(self):
+        """Throw away everything since the last checkpoint."""
+        apply_journal(self.journal_path, self.checkpoint_path)
+        rows, cols, generation = read_header(self.checkpoint_path)
+        if (rows, cols) != self.dimensions:
+            raise ValueError("{} does not match {}".format(self.checkpoint_path, self.path))
+        checkpoint = np.memmap(
+            self.checkpoint_path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=self.padded_states.shape,
+        )
+        self.padded_states[...] = checkpoint
+        del checkpoint
+        self.generation = generation
+        self.dirty_pages.clear()
+
+    def flush(self):
+        self.padded_states.flush()
+        fd = os.open(self.path, os.O_RDWR)
+        try:
+            write_header(fd, *self.dimensions, self.generation)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        if self.padded_states is None:
+            return
+        self.flush()
+        self.padded_states = self.cell_states = None
+        if self.temporary:
+            for path in (self.path, self.checkpoint_path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    with GameOfLife(rows=20, cols=20, checkpoint_every=10) as mygame:
+        random.seed(0)
+        mygame.seed(60)
+        renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+        renderer.reset(render.live_cells_of(mygame))
+        renderer.draw()
+        message = None
+        for record in mygame.generations(limit=50):
+            renderer.update(record.births, record.deaths)
+            renderer.draw(wait=True)
+            if 0 == record.population:
+                message = "All cells are dead, game over."
+            elif record.changed is False:
+                message = "Reached a steady state, game over."
+            if message is not None:
+                break
+        renderer.close()
+        if message is not None:
+            print(message)
+
+
+if "__main__" == __name__:
+    main()
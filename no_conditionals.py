@@ -16,43 +16,70 @@ So keep track of state of cell (live/dead)
 and counts of neighbors (birth of cell increments all neighbors (8) by 1, death of cell decrements live neighbors by 1)
 """
 
+import collections
 import itertools
 import pprint
 import random
-import time
+
+import deltas
+import render
+import rules
+import seeding
+from topology import make_topology
 
 
 def no_op(*args, **kwargs):
     pass
 
 
+def raise_error_for_valid_size():
+    raise AssertionError("Must have both rows and cols!")
+
+
+def birth_this_cell(game, rowidx, colidx):
+    game.cell_states[rowidx][colidx] = game.LIVE
+    game.increment_neighbors(rowidx, colidx)
+    game.population += 1
+
+
+def birth_if_dead(game, rowidx, colidx):
+    BIRTH_IF_DEAD[game.cell_states[rowidx][colidx]](game, rowidx, colidx)
+
+
+# the dispatch tables, built once here instead of in every call
+CHECK_SIZE = {
+    True: raise_error_for_valid_size,
+    False: no_op,
+}
+# keyed on the cell's state, DEAD then LIVE
+BIRTH_IF_DEAD = {
+    0: birth_this_cell,
+    1: no_op,
+}
+BIRTH_IF_ON_BOARD = {
+    True: birth_if_dead,
+    False: no_op,
+}
+EMPTY_TILE = frozenset()
+
+
 class GameOfLife:
     LIVE = 1
     DEAD = 0
 
-    def __init__(self, rows=4, cols=4):
-        def raise_error_for_valid_size():
-            raise AssertionError("Must have both rows and cols!")
-        {
-            True: raise_error_for_valid_size,
-            False: no_op,
-        }[min(rows, cols) < 1]()
+    def __init__(self, rows=4, cols=4, rule=None, topology=None):
+        CHECK_SIZE[min(rows, cols) < 1]()
         self.dimensions = (rows, cols)
+        # a whole board scan every generation, so even B0 rules are fine
+        self.rule = rules.make_rule(rule)
         self.cell_states = []
         self.live_neighbor_counts = []
+        self.population = 0
         self.zero_out()
 
-        # move like a king
-        # make a set of the 3x3 grid centered at origin
-        self.neighbors_map = set(
-            itertools.product(
-                range(-1,2),
-                range(-1,2)
-            )
-        )
-        # remove (0,0)
-        self.neighbors_map.remove((0,0))
-
+        # move like a king, the topology has the neighbors of every cell worked
+        # out already (wrapped or cut off at the edges) so there's nothing to check
+        self.topology = make_topology(topology, rows, cols)
 
     def zero_out(self):
         # reset board to correct size and fill in with dead cells and everyone
@@ -65,6 +92,8 @@ class GameOfLife:
             for colnum in range(self.dimensions[1]):
                 self.cell_states[-1].append(self.DEAD)
                 self.live_neighbor_counts[-1].append(0)
+        self.population = 0
+        self.generation = 0
 
     def dump(self):
         width = 5 + 3 * self.dimensions[0]
@@ -74,26 +103,20 @@ class GameOfLife:
         # print("Neighbor counts:")
         # pprint.pprint(self.live_neighbor_counts, width=width)
 
-    def seed(self, num_cells):
-        """Starting with a zero'd out map, toggle num_cells on (or make best effort)"""
-        # if someone tries to turn on more cells than are currently turned off, what to do?
-        dead_cells = self.get_dead_cells()
-        if False:
-            try:
-                dead_cells[num_cells]
-            except IndexError:
-                raise AssertionError("Can't turn on that many cells")
-        random.shuffle(dead_cells)
-        to_toggle_on = dead_cells[:num_cells]
-        for proposed_row, proposed_col in to_toggle_on:
-            self.cell_states[proposed_row][proposed_col] = self.LIVE
-        self.init_neighbors()
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Starting with a zero'd out map, toggle num_cells on (or each cell with probability density)"""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells):
+        """Bring cells to life, updating only their neighbors' counts."""
+        maxrow, maxcol = self.dimensions
+        for rowidx, colidx in cells:
+            on_board = (0 <= rowidx < maxrow) and (0 <= colidx < maxcol)
+            BIRTH_IF_ON_BOARD[on_board](self, rowidx, colidx)
 
     def live_cell_count(self):
-        total = 0
-        for irow in self.cell_states:
-            total += sum(irow)
-        return total
+        return self.population
 
     def get_dead_cells(self):
         return list(
@@ -117,23 +140,9 @@ class GameOfLife:
         except KeyError:
             raise AssertionError("can only increment or decrement")
 
-        maxrow = self.dimensions[0]
-        maxcol = self.dimensions[1]
-
-        # replace nested loops with single loop over neighbors map
-        for neighbor in self.neighbors_map:
-            rowoffset, coloffset = neighbor
-            newrow = rowidx + rowoffset
-            newcol = colidx + coloffset
-            not_below = (0 <= newrow) and (0 <= newcol)
-            not_above = (newrow < maxrow) and (newcol < maxcol)
-            computed_step = step * not_below * not_above
-            try:
-                {
-                    0: no_op,
-                }[computed_step]
-            except KeyError:
-                self.live_neighbor_counts[newrow][newcol] += step
+        # single loop over the precomputed neighbors
+        for newrow, newcol in self.topology.neighbors(rowidx, colidx):
+            self.live_neighbor_counts[newrow][newcol] += step
 
     def increment_neighbors(self, rowidx, colidx):
         return self.delta_neighbors(rowidx, colidx, step=1)
@@ -154,70 +163,285 @@ class GameOfLife:
                     self.LIVE: self.increment_neighbors,
                     self.DEAD: no_op,
                 }[cell_state](rowidx, colidx)
+        self.population = sum(map(sum, self.cell_states))
 
     def advance(self):
-        # Any live cell with fewer than two live neighbours dies, as if by underpopulation.
-        # Any live cell with more than three live neighbours dies, as if by overpopulation.
-        # Any dead cell with exactly three live neighbours becomes a live cell,
-        # as if by reproduction.
+        to_birth, to_die = self.step()
+        # return the boolean of were any changes made
+        return bool(to_die) or bool(to_birth)
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        to_birth, to_die = self._decide(self.cell_states)
+        self._apply(to_birth, to_die)
+        self._count(to_birth, to_die)
+        self.population += len(to_birth) - len(to_die)
+        return to_birth, to_die
+
+    def _decide(self, cell_states):
+        # the rule table gives the next state for each (state, neighbor count), and
+        # (state, next state) picks what to do with the cell, both built once per
+        # generation rather than per cell
         to_birth = []
         to_die = []
+        table = self.rule.table
+        actions = {
+            (self.DEAD, self.DEAD): no_op,
+            (self.DEAD, self.LIVE): to_birth.append,
+            (self.LIVE, self.DEAD): to_die.append,
+            (self.LIVE, self.LIVE): no_op,
+        }
+
+        for rowidx, (irow, count_row) in enumerate(zip(cell_states, self.live_neighbor_counts)):
+            for colidx, (cell_state, cell_neighbor_count) in enumerate(zip(irow, count_row)):
+                actions[(cell_state, table[cell_state][cell_neighbor_count])]((rowidx, colidx))
+        return to_birth, to_die
+
+    def _examined(self, cell_states):
+        return self.dimensions[0] * self.dimensions[1]
+
+    def _apply(self, to_birth, to_die):
+        for cells, state in ((to_birth, self.LIVE), (to_die, self.DEAD)):
+            for rowidx, colidx in cells:
+                self.cell_states[rowidx][colidx] = state
+        self.generation += 1
+
+    def _count(self, to_birth, to_die):
+        for cells, delta in ((to_birth, self.increment_neighbors), (to_die, self.decrement_neighbors)):
+            for rowidx, colidx in cells:
+                delta(rowidx, colidx)
+
+
+Generation = collections.namedtuple("Generation", ["generation", "tiles", "changed", "population"])
+
+
+class TileNeighbors(dict):
+    """Tile index -> frozenset of itself and every tile its cells have neighbors in, filled in as tiles are asked for."""
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def __missing__(self, tile):
+        # the neighbors of a tile's cells are in the tile or in the ring of cells
+        # around it, wherever the topology puts that ring
+        game = self.game
+        rows, cols = game.dimensions
+        size = game.tile_size
+        top, left = divmod(tile, game.tile_cols)
+        top, left = top * size, left * size
+        bottom, right = min(rows, top + size), min(cols, left + size)
+        ring = itertools.chain(
+            ((rowidx, colidx) for rowidx in (top - 1, bottom) for colidx in range(left - 1, right + 1)),
+            ((rowidx, colidx) for rowidx in range(top, bottom) for colidx in (left - 1, right)),
+        )
+        neighbors = frozenset(itertools.chain((tile,), map(
+            lambda cell: (cell[0] // size) * game.tile_cols + cell[1] // size,
+            filter(None, itertools.starmap(game.topology.wrap, ring)),
+        )))
+        self[tile] = neighbors
+        return neighbors
+
+
+class FrozenGameOfLife:
+    """
+    Immutable version: a generation is a Generation of frozen pieces. The board is
+    cut into tile_size x tile_size tiles and tiles is a tuple holding the frozenset
+    of the live cells (as flat row * cols + col indices) of each tile. A tile only
+    gets a new frozenset when it changes, the next generation's tuple holds the very
+    same frozenset for every other tile, so keeping old generations around (state)
+    costs about the tiles that changed in each. Only tiles next to a tile that
+    changed last generation (changed) can change, the others are not even looked at.
+    The tile neighbor table and the topology are shared by every generation.
+    """
+    LIVE = 1
+    DEAD = 0
+    ALLOW_B0 = False
 
-        def live_action(rowidx, colidx, cell_neighor_count):
-            # cell_neighbor_count [0, 8], [0, 9)
-            def kill_this_cell(r, c):
-                to_die.append((r, c))
+    def __init__(self, rows=4, cols=4, rule=None, topology=None, tile_size=16):
+        CHECK_SIZE[min(rows, cols) < 1]()
+        self.dimensions = (rows, cols)
+        # only cells next to a live one are looked at, so no B0
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
+        self.topology = make_topology(topology, rows, cols)
+        self.tile_size = tile_size
+        self.tile_cols = -(-cols // tile_size)
+        self.tile_count = -(-rows // tile_size) * self.tile_cols
+        self.tile_neighbors = TileNeighbors(self)
+        self.zero_out()
 
-            action_map = {n: kill_this_cell for n in range(0, 9)}
-            for i in [2, 3]:
-                action_map[i] = no_op
-            action_map[cell_neighbor_count](rowidx, colidx)
+    @property
+    def state(self):
+        """The current Generation, which nothing ever changes."""
+        return self._state
 
+    def restore(self, state):
+        """Go back to (or on to) a Generation this board made before."""
+        self._state = state
 
-        def dead_action(rowidx, colidx, cell_neighbor_count):
-            def birth_this_cell(r, c):
-                to_birth.append((r,c))
-            action_map = {n: no_op for n in range(0, 9)}
-            action_map[3] = birth_this_cell
-            action_map[cell_neighbor_count](rowidx, colidx)
+    def tile_of(self, index):
+        """The tile a flat index is in, worked out rather than stored to keep the board small."""
+        cols, size = self.dimensions[1], self.tile_size
+        return (index // cols // size) * self.tile_cols + (index % cols) // size
 
-        for rowidx, irow in enumerate(self.cell_states):
-            for colidx, cell_state in enumerate(irow):
-                cell_neighbor_count = self.live_neighbor_counts[rowidx][colidx]
-                {
-                    self.LIVE: live_action,
-                    self.DEAD: dead_action,
-                }[cell_state](rowidx, colidx, cell_neighbor_count)
+    @property
+    def generation(self):
+        return self._state.generation
 
-        # birth cells
-        for rowidx, colidx in to_birth:
-            self.cell_states[rowidx][colidx] = self.LIVE
-            self.increment_neighbors(rowidx, colidx)
+    @generation.setter
+    def generation(self, generation):
+        self._state = self._state._replace(generation=generation)
 
-        # death cells
-        for rowidx, colidx in to_die:
-            self.cell_states[rowidx][colidx] = self.DEAD
-            self.decrement_neighbors(rowidx, colidx)
+    @property
+    def live_cells(self):
+        cols = self.dimensions[1]
+        return set(map(lambda index: divmod(index, cols), itertools.chain.from_iterable(self._state.tiles)))
 
+    def zero_out(self):
+        self._state = Generation(
+            generation=0,
+            tiles=(EMPTY_TILE,) * self.tile_count,
+            changed=frozenset(),
+            population=0,
+        )
+
+    def dump(self):
+        rows, cols = self.dimensions
+        live = frozenset(itertools.chain.from_iterable(self._state.tiles))
+        print("Cell states:")
+        pprint.pprint(
+            [[int(rowidx * cols + colidx in live) for colidx in range(cols)] for rowidx in range(rows)],
+            width=5 + 3 * cols,
+        )
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Starting with a zero'd out map, toggle num_cells on (or each cell with probability density)"""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells):
+        """Bring cells to life, the tiles they land in are looked at next generation."""
+        rows, cols = self.dimensions
+        on_board = filter(lambda cell: 0 <= cell[0] < rows and 0 <= cell[1] < cols, cells)
+        added = self._by_tile(map(lambda cell: cell[0] * cols + cell[1], on_board))
+        state = self._state
+        tiles = self._replace(state.tiles, {
+            tile: state.tiles[tile].union(indices)
+            for tile, indices in added.items()
+        })
+        self._state = state._replace(
+            tiles=tiles,
+            changed=state.changed.union(added),
+            population=sum(map(len, tiles)),
+        )
+
+    def _by_tile(self, indices):
+        """{tile: [indices in it]}"""
+        by_tile = collections.defaultdict(list)
+        tile_of = self.tile_of
+        for index in indices:
+            by_tile[tile_of(index)].append(index)
+        return by_tile
+
+    def _replace(self, tiles, new_tiles):
+        """tiles with new_tiles put in, every other tile is the same frozenset as before."""
+        replaced = list(tiles)
+        for tile, cells in new_tiles.items():
+            replaced[tile] = cells
+        return tuple(replaced)
+
+    def live_cell_count(self):
+        return self._state.population
+
+    def advance(self):
+        to_birth, to_die = self.step()
         # return the boolean of were any changes made
         return bool(to_die) or bool(to_birth)
 
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        return self._apply(self._decide(*self._count()))
+
+    def _count(self):
+        """(active, counts, candidates): the tiles that can change, the live neighbor
+        counts around them and the cells in them that could be live next generation."""
+        state = self._state
+        tiles = state.tiles
+        tile_of = self.tile_of
+        tile_neighbors = self.tile_neighbors
+        # tiles that can change, and the tiles with live cells that can touch them
+        active = frozenset(itertools.chain.from_iterable(map(tile_neighbors.__getitem__, state.changed)))
+        sources = frozenset(itertools.chain.from_iterable(map(tile_neighbors.__getitem__, active)))
+        counts = collections.Counter(itertools.chain.from_iterable(map(
+            self.topology.flat_neighbors,
+            itertools.chain.from_iterable(map(tiles.__getitem__, sources)),
+        )))
+        candidates = set(filter(lambda index: tile_of(index) in active, counts))
+        candidates.update(itertools.chain.from_iterable(map(tiles.__getitem__, active)))
+        return active, counts, candidates
+
+    def _examined(self, active, counts, candidates):
+        return len(candidates)
+
+    def _decide(self, active, counts, candidates):
+        """The next frozenset of every active tile."""
+        tiles = self._state.tiles
+        tile_of = self.tile_of
+        table = self.rule.table
+        next_live = filter(lambda index: table[index in tiles[tile_of(index)]][counts[index]], candidates)
+        next_tiles = dict.fromkeys(active, EMPTY_TILE)
+        next_tiles.update((tile, frozenset(indices)) for tile, indices in self._by_tile(next_live).items())
+        return next_tiles
+
+    def _apply(self, next_tiles):
+        """Make the next Generation out of the tiles that changed, return the (to_birth, to_die) cells."""
+        state = self._state
+        tiles = state.tiles
+        changed = frozenset(filter(lambda tile: next_tiles[tile] != tiles[tile], next_tiles))
+        changes = {tile: next_tiles[tile] for tile in changed}
+        cols = self.dimensions[1]
+        to_birth = list(map(
+            lambda index: divmod(index, cols),
+            itertools.chain.from_iterable(map(lambda tile: changes[tile] - tiles[tile], changed)),
+        ))
+        to_die = list(map(
+            lambda index: divmod(index, cols),
+            itertools.chain.from_iterable(map(lambda tile: tiles[tile] - changes[tile], changed)),
+        ))
+        self._state = Generation(
+            generation=state.generation + 1,
+            tiles=self._replace(tiles, changes),
+            changed=changed,
+            population=state.population + len(to_birth) - len(to_die),
+        )
+        return to_birth, to_die
 
 def main():
     mygame = GameOfLife()  # setup the board
     random.seed(0)
     mygame.seed(17)
-    mygame.dump()
-    for iturn in range(50):
-        if 0 == mygame.live_cell_count():
-            print("All cells are dead, game over.")
-            break
-        made_changes = mygame.advance()
-        mygame.dump()
-        if made_changes is False:
-            print("Reached a steady state, game over.")
+    renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=50):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
             break
-        time.sleep(0.1)
+    renderer.close()
+    if message is not None:
+        print(message)
 
 
 if "__main__" == __name__:
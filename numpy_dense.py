@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Dense numpy version: the board is one contiguous uint8 array with a dead border one
+cell wide around it, so the neighbor counts for the whole board are the sum of the
+8 shifted views of that array, and the birth/survival decision is a lookup into
+the rule's table, a couple of elementwise shifts.
+"""
+
+import itertools
+import pprint
+import random
+
+import numpy as np
+
+import deltas
+import render
+import rules
+import seeding
+from topology import make_topology
+
+
+NEIGHBOR_OFFSETS = tuple(
+    (rowoffset, coloffset)
+    for rowoffset in range(3)
+    for coloffset in range(3)
+    if (rowoffset, coloffset) != (1, 1)
+)
+
+
+def count_neighbors(padded, out):
+    """Sum the 8 shifted views of padded (board plus a 1 cell border) into out."""
+    rows = padded.shape[-2] - 2
+    cols = padded.shape[-1] - 2
+    out[...] = 0
+    for rowoffset, coloffset in NEIGHBOR_OFFSETS:
+        np.add(
+            out,
+            padded[..., rowoffset:rowoffset + rows, coloffset:coloffset + cols],
+            out=out,
+        )
+    return out
+
+
+def rule_table(rule):
+    """A rule's table as one 9 bit mask per state, bit count of mask[state] is the next state."""
+    return tuple(
+        sum(next_state << count for count, next_state in enumerate(next_states))
+        for next_states in rule.table
+    )
+
+
+LIFE_TABLE = rule_table(rules.LIFE)
+
+
+def apply_rule(states, counts, out, table=LIFE_TABLE):
+    """Look the next state of every cell up in a rule_table()."""
+    # pick each cell's mask and shift its count'th bit down, a few times quicker
+    # than fancy indexing into the table
+    born, survives = table
+    masks = states.astype(np.uint16)
+    # wraps around when survives < born, which mod 2**16 is still right
+    masks *= (survives - born) & 0xFFFF
+    masks += born
+    np.right_shift(masks, counts, out=masks)
+    np.bitwise_and(masks, 1, out=out, casting="unsafe")
+    return out
+
+
+def changed_cells(before, after):
+    """The (to_birth, to_die) cells that take board before to board after."""
+    flipped = before != after
+    to_birth = [tuple(cell) for cell in np.argwhere(flipped & (after != 0)).tolist()]
+    to_die = [tuple(cell) for cell in np.argwhere(flipped & (before != 0)).tolist()]
+    return to_birth, to_die
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+
+    def __init__(self, rows=4, cols=4, rule=None, topology=None):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        self.dimensions = (rows, cols)
+        self.set_rule(rule)
+        self.set_topology(topology)
+        # cell_states is a view onto the interior of the padded board, the border
+        # is filled in from the topology before counting (and stays dead by default)
+        self.padded_states = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self.cell_states = self.padded_states[1:-1, 1:-1]
+        self.live_neighbor_counts = np.zeros(self.dimensions, dtype=np.uint8)
+        self.next_states = np.zeros(self.dimensions, dtype=np.uint8)
+        self.generation = 0
+
+    def set_rule(self, rule=None):
+        # the border is never written, so B0 only ever lights up the board itself
+        self.rule = rules.make_rule(rule)
+        self.rule_table = rule_table(self.rule)
+
+    def set_topology(self, topology=None):
+        self.topology = make_topology(topology, *self.dimensions)
+        targets, sources = self.topology.halo()
+        self.halo_targets = np.array(targets, dtype=np.intp)
+        self.halo_sources = np.array(sources, dtype=np.intp)
+
+    def fill_halo(self):
+        if len(self.halo_targets):
+            flat = self.padded_states.reshape(-1)
+            flat[self.halo_targets] = flat[self.halo_sources]
+
+    def zero_out(self):
+        self.padded_states.fill(self.DEAD)
+        self.live_neighbor_counts.fill(0)
+        self.generation = 0
+
+    def dump(self):
+        width = 5 + 3 * self.dimensions[0]
+        print("Cell states:")
+        pprint.pprint(self.cell_states.tolist(), width=width)
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(*self.dimensions, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        """Bring cells to life, a chunk at a time so huge iterables stay cheap."""
+        rows, cols = self.dimensions
+        cells = iter(cells)
+        while True:
+            chunk = np.fromiter(
+                itertools.chain.from_iterable(itertools.islice(cells, chunk_size)),
+                dtype=np.int64,
+            ).reshape((-1, 2))
+            if not len(chunk):
+                break
+            rowidxs, colidxs = chunk[:, 0], chunk[:, 1]
+            on_board = (0 <= rowidxs) & (rowidxs < rows) & (0 <= colidxs) & (colidxs < cols)
+            self.cell_states[rowidxs[on_board], colidxs[on_board]] = self.LIVE
+
+    def live_cell_count(self):
+        return int(np.count_nonzero(self.cell_states))
+
+    def init_neighbors(self):
+        self.fill_halo()
+        count_neighbors(self.padded_states, self.live_neighbor_counts)
+
+    def advance(self):
+        self._count()
+        self._decide(self.live_neighbor_counts)
+        # return the boolean of were any changes made
+        return self._apply()
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        self._count()
+        self._decide(self.live_neighbor_counts)
+        to_birth, to_die = changed_cells(self.cell_states, self.next_states)
+        self._apply()
+        return to_birth, to_die
+
+    def _count(self):
+        self.init_neighbors()
+
+    def _decide(self, counts):
+        apply_rule(self.cell_states, counts, self.next_states, self.rule_table)
+
+    def _examined(self, counts):
+        return counts.size
+
+    def _apply(self):
+        changed = not np.array_equal(self.next_states, self.cell_states)
+        self.cell_states[...] = self.next_states
+        self.generation += 1
+        return changed
+
+
+def main():
+    mygame = GameOfLife()  # setup the board
+    random.seed(0)
+    mygame.seed(10)
+    renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=50):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
+            break
+    renderer.close()
+    if message is not None:
+        print(message)
+
+
+if "__main__" == __name__:
+    main()
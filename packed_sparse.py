@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""
+Any live cell with fewer than two live neighbours dies, as if by underpopulation.
+Any live cell with two or three live neighbours lives on to the next generation.
+Any live cell with more than three live neighbours dies, as if by overpopulation.
+Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
+
+Sparse version with packed integer keys: a cell (row, col) is the int64
+((row + BIAS) << SHIFT) + (col + BIAS), so moving to a neighbor is adding a constant.
+The live cells are a sorted numpy array of keys, and neighbor counts for a generation
+come from unique-counting the flat array of every live cell's 8 neighbor keys in one
+go, no tuples and no per cell dict updates.
+
+Rows and cols have to stay within [-BIAS, BIAS).
+"""
+
+import itertools
+import random
+
+import numpy as np
+
+import deltas
+import render
+import rules
+import seeding
+
+
+SHIFT = 31
+BIAS = 1 << 30
+COL_MASK = (1 << SHIFT) - 1
+
+NEIGHBOR_OFFSETS = np.array(
+    [
+        (rowoffset << SHIFT) + coloffset
+        for rowoffset in range(-1, 2)
+        for coloffset in range(-1, 2)
+        if (rowoffset, coloffset) != (0, 0)
+    ],
+    dtype=np.int64,
+)
+
+
+def encode(rows, cols):
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    return ((rows + BIAS) << SHIFT) + (cols + BIAS)
+
+
+def decode(keys):
+    return (keys >> SHIFT) - BIAS, (keys & COL_MASK) - BIAS
+
+
+class GameOfLife:
+    LIVE = 1
+    DEAD = 0
+    ALLOW_B0 = False
+
+    def __init__(self, rows=4, cols=4, bounded=True, rule=None):
+        # bounded boards clip to rows x cols, unbounded ones only use rows x cols
+        # as the area to seed
+        self.rows, self.cols = rows, cols
+        # only neighbors of live cells are ever counted, so no B0
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
+        # indexed by neighbor count
+        self.born_table = np.array(self.rule.table[self.DEAD], dtype=bool)
+        self.survive_table = np.array(self.rule.table[self.LIVE], dtype=bool)
+        self.bounded = bounded
+        self.keys = np.empty(0, dtype=np.int64)
+        self.generation = 0
+
+    @property
+    def live_cells(self):
+        rows, cols = decode(self.keys)
+        return set(zip(rows.tolist(), cols.tolist()))
+
+    @live_cells.setter
+    def live_cells(self, cells):
+        cells = list(cells)
+        rows = [cr for cr, cc in cells]
+        cols = [cc for cr, cc in cells]
+        self.keys = np.unique(encode(rows, cols))
+
+    @property
+    def bounding_box(self):
+        """(min_row, min_col, max_row, max_col) of the live cells, None if there are none."""
+        if not len(self.keys):
+            return None
+        rows, cols = decode(self.keys)
+        # keys are sorted by row first
+        return (int(rows[0]), int(cols.min()), int(rows[-1]), int(cols.max()))
+
+    def zero_out(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.generation = 0
+
+    def dump(self):
+        print("Cell states:")
+        box = self.bounding_box
+        if self.bounded:
+            top, left, bottom, right = 0, 0, self.rows - 1, self.cols - 1
+        elif box is None:
+            top, left, bottom, right = 0, 0, -1, -1
+        else:
+            top, left, bottom, right = box
+        live_cells = self.live_cells
+        for irow in range(top, bottom + 1):
+            to_output = []
+            for icol in range(left, right + 1):
+                if (irow, icol) in live_cells:
+                    to_output.append("██")
+                else:
+                    to_output.append("  ")
+            print("".join(to_output))
+        print()
+
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
+        self.zero_out()
+        self.add_cells(seeding.random_cells(self.rows, self.cols, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells, chunk_size=1 << 16):
+        """Bring cells to life, a chunk at a time so huge iterables stay cheap."""
+        cells = iter(cells)
+        while True:
+            chunk = np.fromiter(
+                itertools.chain.from_iterable(itertools.islice(cells, chunk_size)),
+                dtype=np.int64,
+            ).reshape((-1, 2))
+            if not len(chunk):
+                break
+            rows, cols = chunk[:, 0], chunk[:, 1]
+            if self.bounded:
+                on_board = (0 <= rows) & (rows < self.rows) & (0 <= cols) & (cols < self.cols)
+                rows, cols = rows[on_board], cols[on_board]
+            self.keys = np.union1d(self.keys, encode(rows, cols))
+
+    def live_cell_count(self):
+        return len(self.keys)
+
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        keys = self.keys
+        survivors, born = self._next_keys()
+        self._apply(survivors, born)
+        to_die = np.setdiff1d(keys, survivors, assume_unique=True)
+        return self._cells(born), self._cells(to_die)
+
+    def _cells(self, keys):
+        rows, cols = decode(keys)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def _next_keys(self):
+        """The (survivors, born) keys of the next generation, both sorted."""
+        return self._decide(*self._count())
+
+    def _count(self):
+        """(candidates, counts, is_live) for every cell next to a live one."""
+        keys = self.keys
+        neighbor_keys = (keys[:, np.newaxis] + NEIGHBOR_OFFSETS).ravel()
+        candidates, counts = np.unique(neighbor_keys, return_counts=True)
+        # candidates is empty whenever keys is, so the clipped index is always valid
+        positions = np.minimum(np.searchsorted(keys, candidates), len(keys) - 1)
+        is_live = keys[positions] == candidates
+        return candidates, counts, is_live
+
+    def _examined(self, candidates, counts, is_live):
+        return len(candidates)
+
+    def _decide(self, candidates, counts, is_live):
+        keys = self.keys
+        born = ~is_live & self.born_table[counts]
+        if self.bounded:
+            rows, cols = decode(candidates)
+            born &= (0 <= rows) & (rows < self.rows) & (0 <= cols) & (cols < self.cols)
+        if self.survive_table[0]:
+            # live cells with no live neighbors are not among the candidates
+            survivors = np.setdiff1d(keys, candidates[is_live & ~self.survive_table[counts]], assume_unique=True)
+        else:
+            survivors = candidates[is_live & self.survive_table[counts]]
+        return survivors, candidates[born]
+
+    def _apply(self, survivors, born):
+        changed = len(survivors) != len(self.keys) or len(born) != 0
+        self.keys = np.union1d(survivors, born)
+        self.generation += 1
+        return changed
+
+    def advance(self):
+        # return the boolean of were any changes made
+        return self._apply(*self._next_keys())
+
+
+def main():
+    mygame = GameOfLife(rows=20, cols=20)  # setup the board
+    random.seed(0)
+    mygame.seed(30)
+    renderer = render.TerminalRenderer(mygame.rows, mygame.cols, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=70):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
+            break
+    renderer.close()
+    if message is not None:
+        print(message)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Multi-core version of the numpy dense engine.
+
+The board is split into horizontal stripes, one per worker process. Both generations
+of the board live in multiprocessing.shared_memory buffers (with the same one cell
+dead border as numpy_dense), every worker reads its stripe plus the one row halo
+above and below it from the current buffer and writes its stripe of the next one.
+The halo exchange is the barrier at the end of each generation: once every worker
+is through it, all the rows a stripe needs for the next generation are in place.
+Workers run the same kernel as numpy_dense so the result is bit identical to it.
+
+The main process hands out work and collects the results over a pipe per worker,
+waiting on the pipes and the worker processes together, so if a worker dies
+advance() raises instead of hanging on a barrier that will never fill up.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import numpy_dense
+import render
+
+
+# control block layout: index of the current buffer, then one changed flag per worker
+CURRENT = 0
+CHANGED = 1
+
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(index, board_names, shape, control_name, control_size, start, stop, conn, step_barrier, table):
+    attached = [_attach(name, shape, np.uint8) for name in board_names]
+    boards = [board for shm, board in attached]
+    control_shm, control = _attach(control_name, (control_size,), np.int64)
+    counts = np.zeros((stop - start, shape[1] - 2), dtype=np.uint8)
+    try:
+        while True:
+            # generations to run, -1 to stop
+            generations = conn.recv()
+            if generations < 0:
+                break
+            current = int(control[CURRENT])
+            changed = False
+            for iturn in range(generations):
+                source = boards[current]
+                target = boards[1 - current]
+                # source[start - 1:stop + 1] is the stripe plus its halo rows
+                numpy_dense.count_neighbors(source[start - 1:stop + 1], counts)
+                stripe = source[start:stop, 1:-1]
+                next_stripe = target[start:stop, 1:-1]
+                numpy_dense.apply_rule(stripe, counts, next_stripe, table)
+                changed = not np.array_equal(stripe, next_stripe)
+                current = 1 - current
+                step_barrier.wait()
+            control[CHANGED + index] = changed
+            conn.send(None)
+    finally:
+        del boards, control
+        for shm, board in attached:
+            shm.close()
+        control_shm.close()
+
+
+class GameOfLife(numpy_dense.GameOfLife):
+    # the phases run inside the workers, not here
+    _count = _decide = _apply = _examined = None
+
+    def __init__(self, rows=4, cols=4, workers=None, rule=None):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        self.dimensions = (rows, cols)
+        self.generation = 0
+        self.set_rule(rule)
+        workers = max(1, min(workers or os.cpu_count(), rows))
+        shape = (rows + 2, cols + 2)
+        self._board_shms = [
+            shared_memory.SharedMemory(create=True, size=shape[0] * shape[1])
+            for ibuffer in range(2)
+        ]
+        self._boards = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in self._board_shms]
+        for board in self._boards:
+            board.fill(self.DEAD)
+        control_size = CHANGED + workers
+        self._control_shm = shared_memory.SharedMemory(create=True, size=8 * control_size)
+        self._control = np.ndarray((control_size,), dtype=np.int64, buffer=self._control_shm.buf)
+        self._control.fill(0)
+        self._use_board(0)
+        # neighbor counts only ever exist per stripe, inside the workers
+        self.live_neighbor_counts = None
+
+        context = multiprocessing.get_context()
+        step_barrier = context.Barrier(workers)
+        pipes = [context.Pipe() for iworker in range(workers)]
+        self._conns = [conn for conn, worker_conn in pipes]
+        bounds = [1 + rows * iworker // workers for iworker in range(workers + 1)]
+        self._workers = [
+            context.Process(
+                target=_worker,
+                args=(
+                    iworker,
+                    [shm.name for shm in self._board_shms],
+                    shape,
+                    self._control_shm.name,
+                    control_size,
+                    bounds[iworker],
+                    bounds[iworker + 1],
+                    pipes[iworker][1],
+                    step_barrier,
+                    self.rule_table,
+                ),
+                daemon=True,
+            )
+            for iworker in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _use_board(self, index):
+        self._control[CURRENT] = index
+        self.padded_states = self._boards[index]
+        self.cell_states = self.padded_states[1:-1, 1:-1]
+
+    def zero_out(self):
+        self.padded_states.fill(self.DEAD)
+        self.generation = 0
+
+    def init_neighbors(self):
+        pass
+
+    def _run(self, generations):
+        sentinels = {worker.sentinel for worker in self._workers}
+        try:
+            for conn in self._conns:
+                conn.send(generations)
+        except OSError:
+            self._fail()
+        waiting = set(self._conns)
+        while waiting:
+            for ready in multiprocessing.connection.wait(list(waiting) + list(sentinels)):
+                if ready in sentinels:
+                    self._fail()
+                ready.recv()
+                waiting.discard(ready)
+
+    def _fail(self):
+        # the rest are stuck on the step barrier waiting for the dead one
+        for worker in self._workers:
+            worker.terminate()
+        self.close()
+        raise RuntimeError("A worker process died")
+
+    def advance(self, generations=1):
+        self._run(generations)
+        self._use_board((int(self._control[CURRENT]) + generations) % 2)
+        self.generation += generations
+        # return the boolean of were any changes made (in the last generation)
+        return bool(self._control[CHANGED:].any())
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        before = self.cell_states.copy()
+        self.advance()
+        return numpy_dense.changed_cells(before, self.cell_states)
+
+    def close(self):
+        if not self._workers:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(-1)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.join()
+        for conn in self._conns:
+            conn.close()
+        self._workers = []
+        del self.padded_states, self.cell_states, self._boards, self._control
+        for shm in self._board_shms + [self._control_shm]:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    with GameOfLife(rows=20, cols=20, workers=4) as mygame:  # setup the board
+        random.seed(0)
+        mygame.seed(30)
+        renderer = render.TerminalRenderer(*mygame.dimensions, max_fps=10)
+        renderer.reset(render.live_cells_of(mygame))
+        renderer.draw()
+        message = None
+        for record in mygame.generations(limit=70):
+            renderer.update(record.births, record.deaths)
+            renderer.draw(wait=True)
+            if 0 == record.population:
+                message = "All cells are dead, game over."
+            elif record.changed is False:
+                message = "Reached a steady state, game over."
+            if message is not None:
+                break
+        renderer.close()
+        if message is not None:
+            print(message)
+
+
+if "__main__" == __name__:
+    main()
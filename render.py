@@ -0,0 +1,128 @@
+"""
+Incremental terminal renderer.
+
+Every character cell shows two pixels stacked with half block glyphs, and a pixel
+is a zoom x zoom block of board cells. The renderer keeps a live count per pixel,
+so it is fed births and deaths (e.g. the records from an engine's generations())
+and on draw() only rewrites the character cells whose glyph actually changed,
+using ANSI cursor positioning. With zoom > 1 pixels are shaded by how full their
+block is. max_fps caps how often draw() touches the terminal: calls in between
+just keep collecting changes, so the simulation never waits on the display unless
+asked to with draw(wait=True).
+"""
+
+import sys
+import time
+
+
+ESC = "\x1b["
+GLYPHS = {
+    (False, False): " ",
+    (True, False): "▀",
+    (False, True): "▄",
+    (True, True): "█",
+}
+# the 24 step grayscale ramp of the 256 color palette
+GRAY_BASE = 232
+GRAY_STEPS = 23
+
+
+def live_cells_of(engine):
+    """(row, col) of every live cell of any engine."""
+    if hasattr(engine, "live_cells"):
+        return engine.live_cells
+    cell_states = engine.to_array() if hasattr(engine, "to_array") else engine.cell_states
+    return (
+        (rowidx, colidx)
+        for rowidx, irow in enumerate(cell_states)
+        for colidx, cell_state in enumerate(irow)
+        if cell_state
+    )
+
+
+class TerminalRenderer:
+
+    def __init__(self, rows, cols, top=0, left=0, zoom=1, max_fps=None, stream=None):
+        # the viewport is board rows [top, top + rows) and cols [left, left + cols)
+        self.viewport = (top, left, rows, cols)
+        self.zoom = zoom
+        self.max_fps = max_fps
+        self.stream = stream or sys.stdout
+        self.screen_rows = -(-rows // (2 * zoom))
+        self.screen_cols = -(-cols // zoom)
+        self.counts = {}
+        self.drawn = {}
+        self.dirty = set()
+        self.last_frame = None
+
+    def pixel(self, rowidx, colidx):
+        """The pixel a board cell falls in, None if it is outside the viewport."""
+        top, left, rows, cols = self.viewport
+        rowidx -= top
+        colidx -= left
+        if 0 <= rowidx < rows and 0 <= colidx < cols:
+            return (rowidx // self.zoom, colidx // self.zoom)
+        return None
+
+    def reset(self, live_cells):
+        """Forget everything, take the board from live_cells and redraw it all."""
+        self.counts.clear()
+        self.drawn.clear()
+        self.update(live_cells, ())
+        self.dirty = {
+            (screen_row, screen_col)
+            for screen_row in range(self.screen_rows)
+            for screen_col in range(self.screen_cols)
+        }
+        self.stream.write(ESC + "?25l" + ESC + "2J")
+
+    def update(self, births, deaths):
+        for step, cells in ((1, births), (-1, deaths)):
+            for rowidx, colidx in cells:
+                pixel = self.pixel(rowidx, colidx)
+                if pixel is None:
+                    continue
+                self.counts[pixel] = self.counts.get(pixel, 0) + step
+                self.dirty.add((pixel[0] // 2, pixel[1]))
+
+    def glyph(self, screen_row, screen_col):
+        upper = self.counts.get((2 * screen_row, screen_col), 0)
+        lower = self.counts.get((2 * screen_row + 1, screen_col), 0)
+        if self.zoom == 1 or not (upper or lower):
+            return GLYPHS[(bool(upper), bool(lower))]
+        block = self.zoom * self.zoom
+        return "{}38;5;{};48;5;{}m▀{}0m".format(
+            ESC,
+            GRAY_BASE + round(GRAY_STEPS * upper / block),
+            GRAY_BASE + round(GRAY_STEPS * lower / block),
+            ESC,
+        )
+
+    def draw(self, wait=False):
+        """Write out the changed character cells, return False if the frame was skipped."""
+        if self.max_fps and self.last_frame is not None:
+            next_frame = self.last_frame + 1 / self.max_fps
+            now = time.monotonic()
+            if now < next_frame:
+                if not wait:
+                    return False
+                time.sleep(next_frame - now)
+        self.last_frame = time.monotonic()
+        output = []
+        for screen_row, screen_col in self.dirty:
+            glyph = self.glyph(screen_row, screen_col)
+            # reset() cleared the screen, so anything never drawn is blank
+            if self.drawn.get((screen_row, screen_col), " ") == glyph:
+                continue
+            self.drawn[(screen_row, screen_col)] = glyph
+            output.append("{}{};{}H{}".format(ESC, screen_row + 1, screen_col + 1, glyph))
+        self.dirty.clear()
+        self.stream.write("".join(output))
+        self.stream.flush()
+        return True
+
+    def close(self):
+        """Put the cursor back below the frame."""
+        self.stream.write("{}{};1H{}0m{}?25h\n".format(ESC, self.screen_rows + 1, ESC, ESC))
+        self.stream.flush()
+
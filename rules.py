@@ -0,0 +1,87 @@
+"""
+Life-like rules in B/S notation.
+
+"B36/S23" is born with 3 or 6 live neighbors and survives with 2 or 3. A Rule is
+parsed once into table, where table[state][live_neighbor_count] is the next state,
+so engines look the next state up instead of branching on the counts. The old
+survival/birth form "23/36" and the names in RULES are accepted too.
+"""
+
+DEAD = 0
+LIVE = 1
+
+RULES = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "day_and_night": "B3678/S34678",
+    "seeds": "B2/S",
+    "life_without_death": "B3/S012345678",
+    "diamoeba": "B35678/S5678",
+    "2x2": "B36/S125",
+    "morley": "B368/S245",
+    "replicator": "B1357/S1357",
+}
+
+
+def _counts(digits, rulestring):
+    if not all(digit in "012345678" for digit in digits):
+        raise ValueError("Bad neighbor counts {!r} in rule {!r}".format(digits, rulestring))
+    return frozenset(int(digit) for digit in digits)
+
+
+def parse(rulestring):
+    """(birth counts, survival counts) of a rulestring."""
+    text = RULES.get(rulestring.lower(), rulestring).replace(" ", "").upper()
+    if "/" in text:
+        first, second = text.split("/", 1)
+    elif "S" in text:
+        first, second = text[:text.index("S")], text[text.index("S"):]
+    else:
+        raise ValueError("Bad rule {!r}".format(rulestring))
+    if first.startswith("B") and second.startswith("S"):
+        return _counts(first[1:], rulestring), _counts(second[1:], rulestring)
+    if first.startswith("S") and second.startswith("B"):
+        return _counts(second[1:], rulestring), _counts(first[1:], rulestring)
+    # survival/birth without letters
+    return _counts(second, rulestring), _counts(first, rulestring)
+
+
+class Rule:
+
+    def __init__(self, rulestring="B3/S23"):
+        self.birth, self.survival = parse(rulestring)
+        self.table = (
+            tuple(LIVE if count in self.birth else DEAD for count in range(9)),
+            tuple(LIVE if count in self.survival else DEAD for count in range(9)),
+        )
+
+    @property
+    def births_on_zero(self):
+        """B0 rules turn empty space on, which only a dense bounded board can hold."""
+        return 0 in self.birth
+
+    def __str__(self):
+        return "B{}/S{}".format("".join(map(str, sorted(self.birth))), "".join(map(str, sorted(self.survival))))
+
+    def __repr__(self):
+        return "Rule({!r})".format(str(self))
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.table == other.table
+
+    def __hash__(self):
+        return hash(self.table)
+
+
+LIFE = Rule()
+
+
+def make_rule(rule=None, allow_b0=True):
+    """A Rule from a Rule, a rulestring or a name, Life for None."""
+    if rule is None:
+        rule = LIFE
+    elif not isinstance(rule, Rule):
+        rule = Rule(rule)
+    if rule.births_on_zero and not allow_b0:
+        raise ValueError("{} births on 0 neighbors, that needs a dense engine".format(rule))
+    return rule
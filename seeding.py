@@ -0,0 +1,88 @@
+"""
+Reproducible bulk seeding and pattern stamping, shared by every engine.
+
+random_cells() picks the live cells of a rows x cols board from either an exact
+count or a density, in time linear in the number of cells it yields, and picks the
+same cells for the same rng (a random.Random, a seed for one, or None for the
+random module itself) whichever engine they end up in. stamp() drops a named
+pattern, an RLE string or a set of cells onto an engine at an offset through the
+engine's add_cells(), which births them incrementally instead of rebuilding every
+neighbor count.
+"""
+
+import math
+import random
+
+import lifeio
+
+
+PATTERNS = {
+    "block": "2o$2o!",
+    "blinker": "3o!",
+    "glider": "bo$2bo$3o!",
+    "lwss": "bo2bo$o4b$o3bo$4o!",
+    "r_pentomino": "b2o$2o$bo!",
+    "diehard": "6bob$2o6b$bo3b3o!",
+    "acorn": "bo5b$3bo3b$2o2b3o!",
+    "gosper_glider_gun": (
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4bobo$"
+        "10bo5bo7bo$11bo3bo$12b2o!"
+    ),
+}
+
+
+def make_rng(rng=None):
+    if rng is None:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
+
+
+def random_cells(rows, cols, count=None, density=None, rng=None):
+    """Yield (row, col) of random distinct cells, exactly count of them or each with probability density."""
+    rng = make_rng(rng)
+    total = rows * cols
+    if count is not None:
+        positions = rng.sample(range(total), min(count, total))
+    elif density is not None:
+        positions = _bernoulli_positions(total, density, rng)
+    else:
+        raise AssertionError("Need a count or a density")
+    for position in positions:
+        yield divmod(position, cols)
+
+
+def _bernoulli_positions(total, density, rng):
+    """Increasing positions in [0, total), each present with probability density.
+
+    Jumps straight from one live cell to the next with geometrically distributed
+    gaps, so the work is proportional to the live cells, not the board.
+    """
+    if density >= 1:
+        yield from range(total)
+        return
+    if density <= 0:
+        return
+    log_dead = math.log(1 - density)
+    position = -1
+    while True:
+        position += 1 + int(math.log(1 - rng.random()) / log_dead)
+        if position >= total:
+            return
+        yield position
+
+
+def pattern_cells(pattern):
+    """Cells of a pattern given by name, as an RLE string or as (row, col) cells."""
+    if isinstance(pattern, str):
+        return lifeio.read_rle([PATTERNS.get(pattern, pattern)])
+    return iter(pattern)
+
+
+def stamp(engine, pattern, row=0, col=0):
+    """Add the live cells of pattern to engine with its top left corner at (row, col)."""
+    engine.add_cells(
+        (rowidx + row, colidx + col)
+        for rowidx, colidx in pattern_cells(pattern)
+    )
@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""
+Many simulations in one asyncio server, watched over a local socket.
+
+Each Simulation owns an engine, an optional generation budget and an optional
+rate (generations per second). Its generations run one at a time in a thread pool
+(the Service's own unless it is given a ThreadPoolExecutor), so the event loop
+stays free to talk to clients while advance() grinds. It has to be threads: a
+process pool would advance a pickled copy of the engine and never the engine
+itself. Stopping a simulation lets the generation in flight finish before the
+engine is closed.
+
+Clients connect to a Unix socket or a TCP port on localhost and speak JSON lines,
+one request per line, one {"ok": ...} reply per request:
+
+    {"op": "create", "name": "soup", "engine": "game_of_life", "rows": 64,
+     "cols": 64, "density": 0.3, "seed": 1, "budget": 1000, "rate": 30}
+    {"op": "list"}
+    {"op": "snapshot", "name": "soup"}
+    {"op": "subscribe", "name": "soup"}
+    {"op": "unsubscribe", "name": "soup"}
+    {"op": "stop", "name": "soup"}
+
+A subscriber first gets a snapshot event (every live cell) and then diff events,
+the cells born and died going from generation base to generation. Diffs are
+buffered per subscriber and coalesced while the client is still reading the last
+one, so a slow client gets fewer, bigger diffs. If the buffer goes over
+max_pending cells it is dropped and the client gets a fresh snapshot instead. The
+simulation only ever adds to the buffers, it never waits on a client.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+
+import deltas
+import engines
+import render
+import seeding
+
+
+def cell_list(cells):
+    return [list(cell) for cell in sorted(cells)]
+
+
+class Subscriber:
+    """What one connection still has to be told about one simulation."""
+
+    def __init__(self, simulation, writer, max_pending=10000):
+        self.simulation = simulation
+        self.writer = writer
+        self.max_pending = max_pending
+        self.births = set()
+        self.deaths = set()
+        self.base = None
+        self.needs_snapshot = True
+        self.finished = False
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def offer(self, births, deaths):
+        """Fold one generation into the pending diff, never blocks."""
+        if not self.needs_snapshot:
+            # a cell that comes back to life (or dies again) cancels out
+            for cell in deaths:
+                if cell in self.births:
+                    self.births.remove(cell)
+                else:
+                    self.deaths.add(cell)
+            for cell in births:
+                if cell in self.deaths:
+                    self.deaths.remove(cell)
+                else:
+                    self.births.add(cell)
+            if len(self.births) + len(self.deaths) > self.max_pending:
+                self.needs_snapshot = True
+                self.births, self.deaths = set(), set()
+        self.wakeup.set()
+
+    def finish(self):
+        self.finished = True
+        self.wakeup.set()
+
+    def take(self):
+        """The next event to send, None if there is nothing."""
+        simulation = self.simulation
+        if self.needs_snapshot:
+            self.needs_snapshot = False
+            self.births, self.deaths = set(), set()
+            self.base = simulation.generation
+            return simulation.snapshot_event()
+        if self.base == simulation.generation:
+            return None
+        births, deaths = self.births, self.deaths
+        self.births, self.deaths = set(), set()
+        event = {
+            "event": "diff",
+            "name": simulation.name,
+            "base": self.base,
+            "generation": simulation.generation,
+            "births": cell_list(births),
+            "deaths": cell_list(deaths),
+            "population": len(simulation.live_cells),
+        }
+        self.base = simulation.generation
+        return event
+
+    async def run(self):
+        try:
+            while True:
+                event = self.take()
+                if event is not None:
+                    # the simulation keeps offering while this waits on the client
+                    await send(self.writer, event)
+                    continue
+                if self.finished:
+                    await send(self.writer, self.simulation.done_event())
+                    return
+                self.wakeup.clear()
+                await self.wakeup.wait()
+        except ConnectionError:
+            pass
+
+
+class Simulation:
+
+    def __init__(self, name, engine, budget=None, rate=None):
+        if rate is not None and rate <= 0:
+            raise AssertionError("rate must be positive")
+        self.name = name
+        self.engine = engine
+        self.budget = budget
+        self.rate = rate
+        self.generation = 0
+        self.error = None
+        # kept on the event loop from the diffs, so snapshots never touch the
+        # engine while a generation is running in the executor
+        self.live_cells = set(render.live_cells_of(engine))
+        self.subscribers = []
+        self.task = None
+        self.closed = False
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "generation": self.generation,
+            "population": len(self.live_cells),
+            "budget": self.budget,
+            "rate": self.rate,
+            "running": self.running,
+            "error": self.error,
+        }
+
+    def snapshot_event(self):
+        return {
+            "event": "snapshot",
+            "name": self.name,
+            "generation": self.generation,
+            "cells": cell_list(self.live_cells),
+        }
+
+    def done_event(self):
+        return {"event": "done", "name": self.name, "generation": self.generation, "error": self.error}
+
+    async def run(self, executor):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        turns = itertools.count() if self.budget is None else range(self.budget)
+        step = None
+        try:
+            for iturn in turns:
+                step = executor.submit(deltas.step_engine, self.engine)
+                births, deaths = await asyncio.wrap_future(step)
+                self.publish(births, deaths)
+                if self.rate is not None:
+                    next_tick += 1 / self.rate
+                    delay = next_tick - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        # running behind, don't try to catch up in a burst
+                        next_tick = loop.time()
+        except Exception as error:
+            self.error = "{}: {}".format(type(error).__name__, error)
+        finally:
+            for subscriber in self.subscribers:
+                subscriber.finish()
+            if step is not None and not step.done():
+                # cancelled while a generation is running in its thread, which goes on regardless
+                await asyncio.wait([asyncio.wrap_future(step)])
+            if self.closed:
+                self.close_engine()
+
+    def publish(self, births, deaths):
+        """Take in one generation's changes and pass them on to the subscribers."""
+        self.generation += 1
+        self.live_cells -= set(deaths)
+        self.live_cells |= set(births)
+        for subscriber in self.subscribers:
+            subscriber.offer(births, deaths)
+
+    def subscribe(self, writer, max_pending=10000):
+        subscriber = Subscriber(self, writer, max_pending)
+        if not self.running:
+            subscriber.finish()
+        self.subscribers.append(subscriber)
+        subscriber.task = asyncio.ensure_future(subscriber.run())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+        subscriber.task.cancel()
+
+    def close(self):
+        """Stop running, subscribers still get what is pending and then done.
+
+        A running simulation closes its engine once the generation in flight is over.
+        """
+        self.closed = True
+        for subscriber in self.subscribers:
+            subscriber.finish()
+        if self.running:
+            self.task.cancel()
+        else:
+            self.close_engine()
+
+    def close_engine(self):
+        close = getattr(self.engine, "close", None)
+        if close is not None:
+            close()
+
+
+async def send(writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+class Service:
+
+    def __init__(self, executor=None, max_pending=10000):
+        if executor is not None and not isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            raise AssertionError("The engines have to advance in this process, use a ThreadPoolExecutor")
+        self.owns_executor = executor is None
+        self.executor = executor or concurrent.futures.ThreadPoolExecutor()
+        self.max_pending = max_pending
+        self.simulations = {}
+        self.names = itertools.count(1)
+        self.server = None
+        self.connections = {}
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """Listen on the Unix socket path, or on host:port if there is no path."""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host=host, port=port)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    def create(self, name=None, engine="game_of_life", rows=64, cols=64, density=None, cells=None, seed=None,
+               budget=None, rate=None, **options):
+        if name is None:
+            name = "sim-{}".format(next(self.names))
+        if name in self.simulations:
+            raise AssertionError("There is already a simulation called {!r}".format(name))
+        board = engines.load_engine(engine)(rows=rows, cols=cols, **options)
+        if cells is not None:
+            board.add_cells(tuple(cell) for cell in cells)
+        elif density is not None:
+            board.seed(density=density, rng=seeding.make_rng(seed))
+        simulation = Simulation(name, board, budget=budget, rate=rate)
+        self.simulations[name] = simulation
+        simulation.task = asyncio.ensure_future(simulation.run(self.executor))
+        return simulation
+
+    def get(self, name):
+        try:
+            return self.simulations[name]
+        except KeyError:
+            raise AssertionError("No simulation called {!r}".format(name))
+
+    def stop(self, name):
+        self.get(name).close()
+        del self.simulations[name]
+
+    async def handle(self, reader, writer):
+        subscribers = {}
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self.dispatch(request, writer, subscribers)
+                except (AssertionError, ValueError, TypeError, KeyError) as error:
+                    reply = {"ok": False, "error": "{}: {}".format(type(error).__name__, error)}
+                await send(writer, reply)
+        except ConnectionError:
+            pass
+        finally:
+            for name, subscriber in subscribers.items():
+                subscriber.simulation.unsubscribe(subscriber)
+            writer.close()
+            self.connections.pop(asyncio.current_task(), None)
+
+    def dispatch(self, request, writer, subscribers):
+        """The reply to one request."""
+        request = dict(request)
+        op = request.pop("op")
+        if op == "create":
+            return {"ok": True, "name": self.create(**request).name}
+        if op == "list":
+            return {"ok": True, "simulations": [simulation.describe() for simulation in self.simulations.values()]}
+        name = request["name"]
+        if op == "snapshot":
+            event = self.get(name).snapshot_event()
+            event.pop("event")
+            return dict(event, ok=True)
+        if op == "subscribe":
+            if name not in subscribers:
+                max_pending = request.get("max_pending", self.max_pending)
+                subscribers[name] = self.get(name).subscribe(writer, max_pending)
+            return {"ok": True, "name": name}
+        if op == "unsubscribe":
+            subscriber = subscribers.pop(name, None)
+            if subscriber is not None:
+                subscriber.simulation.unsubscribe(subscriber)
+            return {"ok": True, "name": name}
+        if op == "stop":
+            self.stop(name)
+            subscribers.pop(name, None)
+            return {"ok": True, "name": name}
+        raise ValueError("Unknown op {!r}".format(op))
+
+    async def close(self):
+        """Stop listening and every simulation, and wait for the connections to wind up."""
+        if self.server is not None:
+            self.server.close()
+        simulations = list(self.simulations.values())
+        for simulation in simulations:
+            simulation.close()
+        self.simulations.clear()
+        # their engines are closed as the generations in flight finish
+        await asyncio.gather(*(simulation.task for simulation in simulations if simulation.task), return_exceptions=True)
+        # closing a connection's writer ends its reader, so its handler returns
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--unix", help="path of a Unix socket to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7654)
+    parser.add_argument("--max-pending", type=int, default=10000, help="cells a subscriber may lag before a snapshot")
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    service = Service(max_pending=args.max_pending)
+    server = await service.start(path=args.unix, host=args.host, port=args.port)
+    print("Listening on {}".format(service.address))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if "__main__" == __name__:
+    main()
@@ -12,18 +12,77 @@ and counts of neighbors (birth of cell increments all neighbors (8) by 1, death
 import itertools
 import pprint
 import random
-import time
+
+import deltas
+import render
+import rules
+import seeding
+from topology import make_topology
 
 
 class GameOfLife:
     LIVE = 1
     DEAD = 0
+    ALLOW_B0 = False
 
-    def __init__(self, rows=4, cols=4):
+    def __init__(self, rows=4, cols=4, bounded=True, rule=None, topology=None):
+        # bounded boards have the edges of their topology (clipped by default),
+        # unbounded ones only use rows x cols as the area to seed
         self.rows, self.cols = rows, cols
+        if bounded:
+            self.topology = make_topology(topology, rows, cols)
+        elif topology is not None:
+            raise AssertionError("An unbounded board has no edges to wrap")
+        else:
+            self.topology = None
+        # only cells next to a live one are ever looked at, so no B0
+        self.rule = rules.make_rule(rule, allow_b0=self.ALLOW_B0)
+        self.bounded = bounded
         self.live_cells = set()
+        self.generation = 0
         self.neighbors_map = self.get_neighbors_map()
 
+    @property
+    def live_cells(self):
+        return self._live_cells
+
+    @live_cells.setter
+    def live_cells(self, cells):
+        self._live_cells = cells
+        self._bounding_box = None
+        self._bounding_box_stale = True
+
+    @property
+    def bounding_box(self):
+        """(min_row, min_col, max_row, max_col) of the live cells, None if there are none."""
+        if self._bounding_box_stale:
+            self._bounding_box = None
+            if self.live_cells:
+                live_rows = [cr for cr, cc in self.live_cells]
+                live_cols = [cc for cr, cc in self.live_cells]
+                self._bounding_box = (min(live_rows), min(live_cols), max(live_rows), max(live_cols))
+            self._bounding_box_stale = False
+        return self._bounding_box
+
+    def update_bounding_box(self, to_birth, to_die):
+        """Keep the bounding box up to date in O(changes), only rescan if it may shrink."""
+        if self._bounding_box_stale:
+            return
+        box = self._bounding_box
+        for cr, cc in to_die:
+            if cr in (box[0], box[2]) or cc in (box[1], box[3]):
+                self._bounding_box_stale = True
+                return
+        for cr, cc in to_birth:
+            if box is None:
+                box = (cr, cc, cr, cc)
+            else:
+                box = (min(box[0], cr), min(box[1], cc), max(box[2], cr), max(box[3], cc))
+        self._bounding_box = box
+
+    def on_board(self, cell):
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols
+
     def get_neighbors_map(self):
         nm = set(itertools.product(range(-1,2), range(-1,2)))
         nm.remove((0,0))
@@ -33,34 +92,58 @@ class GameOfLife:
         return set(itertools.product(range(self.rows), range(self.cols)))
 
     def zero_out(self):
-        self.live_cells.clear()
+        self.live_cells = set()
+        self.generation = 0
 
     def dump(self):
-        # turn it into a dense representation and dump that
+        # turn the occupied part into a dense representation and dump that, a
+        # bounded board is always shown whole
         print("Cell states:")
-        for irow in range(self.rows):
-            to_output = []
-            for icol in range(self.cols):
+        box = self.bounding_box
+        if self.bounded:
+            top, left, bottom, right = 0, 0, self.rows - 1, self.cols - 1
+        elif box is None:
+            top, left, bottom, right = 0, 0, -1, -1
+        else:
+            top, left, bottom, right = box
+        for irow in range(top, bottom + 1):
+            if box is None or not box[0] <= irow <= box[2]:
+                print("  " * (right + 1 - left))
+                continue
+            to_output = ["  " * (box[1] - left)]
+            for icol in range(box[1], box[3] + 1):
                 if (irow, icol) in self.live_cells:
                     to_output.append("██")
                 else:
                     to_output.append("  ")
+            to_output.append("  " * (right - box[3]))
             print("".join(to_output))
         print()
 
     def randcell(self):
         return random.randint(0, self.rows), random.randint(0, self.cols)
 
-    def seed(self, num_cells):
+    def seed(self, num_cells=None, density=None, rng=None):
+        """Start over with num_cells random live cells (or each cell live with probability density)."""
         self.zero_out()
-        p = sorted(self.get_dense_cells(), key=lambda x: random.random())
-        self.live_cells.update(p[:num_cells])
+        self.add_cells(seeding.random_cells(self.rows, self.cols, count=num_cells, density=density, rng=rng))
+
+    def add_cells(self, cells):
+        if self.bounded:
+            cells = filter(self.on_board, cells)
+        self.live_cells.update(cells)
+        self._bounding_box_stale = True
 
     def live_cell_count(self):
         return len(self.live_cells)
 
     def gen_all_neighbors(self):
         """Generate all neighbored cells of live cells."""
+        if self.topology is not None:
+            neighbors = self.topology.neighbors
+            for (cr, cc) in self.live_cells:
+                yield from neighbors(cr, cc)
+            return
         for (cr, cc) in self.live_cells:
             for dr, dc in self.neighbors_map:
                 yield (cr + dr, cc + dc)
@@ -72,28 +155,59 @@ class GameOfLife:
         return ncs
 
     def advance(self):
-        nc = self.get_neighbor_counts()
-        to_die = set(lc for lc in self.live_cells if nc.get(lc, 0) not in [2, 3])
-        to_birth = set(dc for dc in set(nc) - set(self.live_cells) if nc.get(dc, 0) == 3)
-        self.live_cells = (self.live_cells - to_die | to_birth) & self.get_dense_cells()
+        to_birth, to_die = self.step()
         return bool(to_die) or bool(to_birth)
 
+    def generations(self, limit=None):
+        return deltas.generations(self, limit)
+
+    def step(self):
+        """Advance one generation, return the (to_birth, to_die) cells."""
+        nc = self._count()
+        to_birth, to_die = self._decide(nc)
+        self._apply(to_birth, to_die)
+        return to_birth, to_die
+
+    def _count(self):
+        return self.get_neighbor_counts()
+
+    def _decide(self, nc):
+        born, survives = self.rule.table
+        to_die = set(lc for lc in self.live_cells if not survives[nc.get(lc, 0)])
+        # a bounded board's topology only ever names cells on the board
+        to_birth = set(dc for dc, count in nc.items() if born[count] and dc not in self.live_cells)
+        return to_birth, to_die
+
+    def _examined(self, nc):
+        # every cell next to a live one
+        return len(nc)
+
+    def _apply(self, to_birth, to_die):
+        self._live_cells = self.live_cells - to_die | to_birth
+        self.update_bounding_box(to_birth, to_die)
+        self.generation += 1
+
 
 def main():
     mygame = GameOfLife(rows=20, cols=20)  # setup the board
     random.seed(0)
     mygame.seed(30)
-    mygame.dump()
-    for iturn in range(70):
-        if 0 == mygame.live_cell_count():
-            print("All cells are dead, game over.")
-            break
-        made_changes = mygame.advance()
-        mygame.dump()
-        if made_changes is False:
-            print("Reached a steady state, game over.")
+    renderer = render.TerminalRenderer(mygame.rows, mygame.cols, max_fps=10)
+    renderer.reset(render.live_cells_of(mygame))
+    renderer.draw()
+    message = None
+    for record in mygame.generations(limit=70):
+        renderer.update(record.births, record.deaths)
+        renderer.draw(wait=True)
+        if 0 == record.population:
+            message = "All cells are dead, game over."
+        elif record.changed is False:
+            message = "Reached a steady state, game over."
+        if message is not None:
             break
-        time.sleep(0.1)
+    renderer.close()
+    if message is not None:
+        print(message)
 
 
 if "__main__" == __name__:
@@ -0,0 +1,68 @@
+import unittest
+import random
+
+import adaptive
+import game_of_life
+import instrument
+
+
+class TestAdaptive(unittest.TestCase):
+
+    def test_init(self):
+        with self.assertRaises(AssertionError):
+            adaptive.GameOfLife(rows=0, cols=0)
+        with self.assertRaises(AssertionError):
+            adaptive.GameOfLife(rows=4, cols=4, dense_below=1.0, sparse_above=0.5)
+
+    def test_matches_dense(self):
+        reference = game_of_life.GameOfLife(rows=30, cols=30)
+        mygame = adaptive.GameOfLife(rows=30, cols=30, patience=2)
+        random.seed(4)
+        reference.seed(density=0.3)
+        mygame.add_cells(
+            (rowidx, colidx)
+            for rowidx in range(30)
+            for colidx in range(30)
+            if reference.cell_states[rowidx][colidx]
+        )
+        representations = set()
+        for iturn in range(200):
+            self.assertEqual(mygame.advance(), reference.advance())
+            representations.add(mygame.representation)
+        self.assertEqual(representations, {adaptive.DENSE, adaptive.SPARSE})
+        self.assertEqual(mygame.live_cell_count(), reference.live_cell_count())
+        self.assertEqual(mygame.generation, 200)
+
+    def test_hysteresis(self):
+        # a lone blinker churns at 4 / 3 forever, over the threshold to go sparse
+        # and never under the one to come back
+        mygame = adaptive.GameOfLife(rows=10, cols=10, patience=3)
+        mygame.add_cells([(5, 4), (5, 5), (5, 6)])
+        for iturn in range(20):
+            mygame.advance()
+        self.assertEqual(mygame.representation, adaptive.SPARSE)
+        self.assertEqual(mygame.conversions, 1)
+        # a block does not churn at all, so it comes back to dense
+        mygame.zero_out()
+        mygame.add_cells([(1, 1), (1, 2), (2, 1), (2, 2)])
+        for iturn in range(20):
+            mygame.advance()
+        self.assertEqual(mygame.representation, adaptive.DENSE)
+        self.assertEqual(mygame.conversions, 2)
+        self.assertEqual(mygame.live_cells, {(1, 1), (1, 2), (2, 1), (2, 2)})
+
+    def test_conversion_is_instrumented(self):
+        mygame = adaptive.GameOfLife(rows=10, cols=10, patience=1)
+        mygame.add_cells([(5, 4), (5, 5), (5, 6)])
+        ring = instrument.RingBuffer()
+        with instrument.Instrument(mygame, sinks=[ring]):
+            mygame.advance()
+            mygame.advance()
+        first, second = ring
+        self.assertGreater(first.convert, 0)
+        self.assertEqual(second.convert, 0)
+        self.assertEqual((first.births, first.deaths), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import bench
+
+
+class TestBench(unittest.TestCase):
+
+    def main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            status = bench.main(
+                ["--engines", "short_fns", "--sizes", "8", "--densities", "0.3", "--generations", "2", "--repeat", "1"]
+                + list(argv)
+            )
+        return status, output.getvalue()
+
+    def test_output_and_compare(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline_path = os.path.join(tmpdir, "baseline.json")
+            status, output = self.main("--output", baseline_path)
+            self.assertEqual(status, 0)
+            with open(baseline_path) as infile:
+                baseline = json.load(infile)
+            self.assertEqual(len(baseline["results"]), 1)
+            result = baseline["results"][0]
+            self.assertEqual(bench.run_key(result), ("short_fns", 8, 0.3, 2))
+            self.assertGreater(result["generations_per_sec"], 0)
+
+            # no slower than itself, give or take noise
+            status, output = self.main("--compare", baseline_path, "--threshold", "0.99")
+            self.assertEqual(status, 0)
+            self.assertNotIn("REGRESSION", output)
+
+            # a baseline a thousand times faster than anything we can do
+            result["generations_per_sec"] *= 1000
+            with open(baseline_path, "w") as outfile:
+                json.dump(baseline, outfile)
+            status, output = self.main("--compare", baseline_path)
+            self.assertEqual(status, 1)
+            self.assertIn("REGRESSION short_fns 8x8", output)
+
+    def test_compare(self):
+        baseline = {"results": [{"engine": "a", "size": 1, "density": 0.1, "generations": 1, "generations_per_sec": 100.0}]}
+        within = [dict(baseline["results"][0], generations_per_sec=95.0)]
+        slower = [dict(baseline["results"][0], generations_per_sec=80.0)]
+        unmatched = [dict(baseline["results"][0], engine="b", generations_per_sec=1.0)]
+        self.assertEqual(bench.compare(within, baseline, 0.1), [])
+        self.assertEqual([ratio for result, before, ratio in bench.compare(slower, baseline, 0.1)], [0.8])
+        self.assertEqual(bench.compare(unmatched, baseline, 0.1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
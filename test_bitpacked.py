@@ -0,0 +1,87 @@
+import unittest
+import random
+import time
+
+import numpy_dense
+from bitpacked import GameOfLife
+
+class TestGameOfLife(unittest.TestCase):
+
+    def test_init(self):
+        try:
+            mygame = GameOfLife(rows=0, cols=0)
+            raise AssertionError("Must have both rows and cols!")
+        except AssertionError:
+            pass
+        mygame = GameOfLife(rows=2, cols=2)
+
+    def test_zero_out(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+        mygame.seed(2)
+        self.assertNotEqual(mygame.live_cell_count(), 0)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+    def test_birth(self):
+        # if you have 3 neighbors and are dead then you get birthed
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.seed(3)
+        self.assertEqual(mygame.live_cell_count(), 3)
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 4)
+
+    def test_death(self):
+        mygame = GameOfLife(rows=3, cols=3)
+        while mygame.live_cell_count() != 9:
+            random.seed(time.time())
+            mygame.seed(9)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 4)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, False)
+
+
+    def test_steady_state_condition(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        while mygame.live_cell_count() != 4:
+            random.seed(time.time())
+            mygame.seed(4)
+        changed = mygame.advance()
+        self.assertEqual(changed, False)
+
+
+    def test_matches_numpy_dense(self):
+        random.seed(2)
+        reference = numpy_dense.GameOfLife(rows=21, cols=150)
+        reference.seed(1200)
+        mygame = GameOfLife(rows=21, cols=150, band_rows=4)
+        for rowidx, colidx in zip(*reference.cell_states.nonzero()):
+            mygame.set_cell(rowidx, colidx, GameOfLife.LIVE)
+        for iturn in range(40):
+            self.assertEqual(mygame.advance(), reference.advance())
+            self.assertEqual(mygame.to_array().tolist(), reference.cell_states.tolist())
+            self.assertEqual(mygame.live_cell_count(), reference.live_cell_count())
+
+    def test_add_cells(self):
+        random.seed(4)
+        cells = [(random.randrange(-2, 23), random.randrange(-3, 153)) for icell in range(900)]
+        reference = numpy_dense.GameOfLife(rows=21, cols=150)
+        reference.add_cells(cells)
+        mygame = GameOfLife(rows=21, cols=150)
+        # small chunks, with cells sharing words within and across chunks
+        mygame.add_cells(cells + cells[:100], chunk_size=64)
+        self.assertEqual(mygame.to_array().tolist(), reference.cell_states.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
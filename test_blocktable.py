@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import blocktable
+import game_of_life
+import rules
+import seeding
+from blocktable import GameOfLife
+
+
+def live_cells(engine):
+    rows, cols = engine.dimensions
+    return {
+        (rowidx, colidx)
+        for rowidx in range(rows)
+        for colidx in range(cols)
+        if engine.cell_states[rowidx][colidx]
+    }
+
+
+class TestGameOfLife(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache_dir.cleanup()
+
+    def make(self, *args, **kwargs):
+        return GameOfLife(*args, cache_dir=self.cache_dir.name, **kwargs)
+
+    def test_init(self):
+        try:
+            mygame = GameOfLife(rows=0, cols=0)
+            raise AssertionError("Must have both rows and cols!")
+        except AssertionError:
+            pass
+
+    def test_steady_state_condition(self):
+        mygame = self.make(rows=2, cols=2)
+        mygame.seed(4)
+        self.assertEqual(mygame.live_cell_count(), 4)
+        self.assertEqual(mygame.advance(), False)
+        self.assertEqual(mygame.live_cell_count(), 4)
+
+    def test_matches_game_of_life(self):
+        for rows, cols in ((1, 1), (1, 6), (3, 2), (8, 9), (21, 34)):
+            for rule in (None, "highlife", "B2/S"):
+                cells = list(seeding.random_cells(rows, cols, density=0.4, rng=rows * cols))
+                mygame = self.make(rows=rows, cols=cols, rule=rule)
+                reference = game_of_life.GameOfLife(rows=rows, cols=cols, rule=rule)
+                mygame.add_cells(cells)
+                reference.add_cells(cells)
+                for iturn in range(25):
+                    self.assertEqual(mygame.advance(), reference.advance())
+                    self.assertEqual(mygame.live_cells, live_cells(reference))
+                    self.assertEqual(mygame.live_cell_count(), reference.live_cell_count())
+
+    def test_add_cells(self):
+        cells = list(seeding.random_cells(11, 14, density=0.5, rng=8))
+        for phase in (0, 1):
+            mygame = self.make(rows=9, cols=13)
+            mygame.phase = phase
+            # off the board, repeated, and split over chunks that share blocks
+            mygame.add_cells(cells + cells[:10], chunk_size=7)
+            self.assertEqual(mygame.live_cells, {(rowidx, colidx) for rowidx, colidx in cells if rowidx < 9 and colidx < 13})
+
+    def test_b0_stays_on_the_board(self):
+        mygame = self.make(rows=3, cols=5, rule="B0/S")
+        mygame.advance()
+        self.assertEqual(mygame.live_cell_count(), 15)
+        mygame.advance()
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+    def test_table_cached_on_disk(self):
+        rule = rules.Rule("B36/S125")
+        table = blocktable.load_table(rule, self.cache_dir.name)
+        path = os.path.join(self.cache_dir.name, "blocktable-B36S125.bin")
+        self.assertTrue(os.path.exists(path))
+        del blocktable._TABLES[rule]
+        with open(path, "rb") as infile:
+            self.assertEqual(infile.read(), table)
+        self.assertEqual(blocktable.load_table(rule, self.cache_dir.name), table)
+        self.assertEqual(len(table), 1 << 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import cli
+
+
+class TestCli(unittest.TestCase):
+
+    def run_cli(self, *argv):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "out")
+            self.assertEqual(cli.main(list(argv) + ["--out", path]), 0)
+            with open(path) as infile:
+                return infile.read()
+
+    def test_summary(self):
+        output = self.run_cli("--engine", "short_fns", "--size", "16", "--seed", "1", "--generations", "5")
+        self.assertTrue(output.startswith("short_fns 16x16: 5 generations in "))
+        self.assertTrue(output.strip().endswith("stopped on generations"))
+
+    def test_stop_conditions(self):
+        lines = self.run_cli("--pattern", "block", "--size", "8", "--stop", "steady", "--output", "stats", "--every", "1")
+        summary = json.loads(lines.splitlines()[-1])
+        self.assertEqual((summary["generations"], summary["stopped"]), (1, "steady"))
+        lines = self.run_cli("--engine", "numpy_dense", "--cells", "1", "--size", "8", "--stop", "extinct", "--output", "stats")
+        summary = json.loads(lines.splitlines()[-1])
+        self.assertEqual((summary["generations"], summary["population"], summary["stopped"]), (1, 0, "extinct"))
+        lines = self.run_cli("--pattern", "blinker", "--size", "8", "--stop", "cycle", "--output", "stats")
+        summary = json.loads(lines.splitlines()[-1])
+        self.assertEqual(summary["cycle"], {"start": 0, "period": 2})
+        with self.assertRaises(SystemExit):
+            cli.parse_args(["--stop", "bored"])
+
+    def test_bad_arguments(self):
+        for argv in [
+            ["--engine", "bitpacked", "--topology", "torus"],
+            ["--engine", "short_fns", "--stop", "cycle"],
+            ["--rows", "0"],
+            ["--size", "0", "--cols", "8"],
+            ["--rule", "xyz"],
+            ["--engine", "short_fns", "--rule", "B03/S23"],
+            ["--topology", "moebius"],
+            ["--pattern", "/nonexistent.rle"],
+            ["--pattern", "glider.txt"],
+        ]:
+            with self.assertRaises(SystemExit):
+                cli.parse_args(argv)
+        args = cli.parse_args(["--size", "8", "--cols", "5", "--engine", "game_of_life", "--stop", "cycle"])
+        self.assertEqual((args.rows, args.cols), (8, 5))
+        # the dense engines are fine with B0
+        self.assertEqual(cli.parse_args(["--engine", "numpy_dense", "--rule", "B03/S23"]).rule, "B03/S23")
+
+    def test_snapshots(self):
+        lines = self.run_cli(
+            "--engine", "bitpacked", "--pattern", "glider", "--size", "10", "--generations", "8",
+            "--output", "snapshots", "--format", "jsonl", "--every", "4",
+        )
+        snapshots = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual([snapshot["generation"] for snapshot in snapshots], [0, 4, 8])
+        # a glider moves one cell down and right every 4 generations
+        first = {tuple(cell) for cell in snapshots[0]["cells"]}
+        self.assertEqual({(row + 2, col + 2) for row, col in first}, {tuple(cell) for cell in snapshots[2]["cells"]})
+        rle = self.run_cli("--pattern", "glider", "--size", "10", "--generations", "4", "--output", "snapshots", "--every", "4")
+        self.assertEqual(rle.count("x = 3, y = 3"), 2)
+
+    def test_imports_only_the_engine(self):
+        code = (
+            "import sys, cli\n"
+            "cli.make_board(cli.parse_args(['--engine', 'short_fns']))\n"
+            "print(sorted(name for name in ['numpy', 'game_of_life', 'hashlife', 'numpy_dense'] if name in sys.modules))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(cli.__file__))).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
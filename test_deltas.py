@@ -0,0 +1,83 @@
+import io
+import json
+import tempfile
+import unittest
+import random
+
+import bitpacked
+import blocktable
+import game_of_life
+import hashlife
+import no_conditionals
+import numpy_dense
+import packed_sparse
+import parallel
+import short_fns
+from deltas import write_jsonl
+from render import live_cells_of
+
+
+class TestGenerations(unittest.TestCase):
+
+    def check_engine(self, engine):
+        random.seed(11)
+        engine.seed(40)
+        live_cells = set(live_cells_of(engine))
+        last = None
+        for record in engine.generations(limit=15):
+            live_cells -= set(record.deaths)
+            self.assertFalse(live_cells & set(record.births))
+            live_cells |= set(record.births)
+            self.assertEqual(record.population, len(live_cells))
+            self.assertEqual(record.changed, bool(record.births or record.deaths))
+            last = record
+        self.assertEqual(live_cells, set(live_cells_of(engine)))
+        # numbering carries on from the engine's own generation, however it got there
+        engine.advance()
+        engine.advance()
+        self.assertEqual([record.generation for record in engine.generations(limit=2)], [18, 19])
+        return last
+
+    def test_engines_agree(self):
+        finals = []
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for engine in [
+            game_of_life.GameOfLife(rows=10, cols=10),
+            no_conditionals.GameOfLife(rows=10, cols=10),
+            short_fns.GameOfLife(rows=10, cols=10),
+            numpy_dense.GameOfLife(rows=10, cols=10),
+            packed_sparse.GameOfLife(rows=10, cols=10),
+            bitpacked.GameOfLife(rows=10, cols=10),
+            blocktable.GameOfLife(rows=10, cols=10, cache_dir=cache_dir.name),
+        ]:
+            finals.append(self.check_engine(engine))
+        with parallel.GameOfLife(rows=10, cols=10, workers=2) as engine:
+            finals.append(self.check_engine(engine))
+        for record in finals:
+            self.assertEqual(record.generation, 15)
+        self.assertEqual(len({record.population for record in finals}), 1)
+
+    def test_hashlife(self):
+        # an unbounded universe, so compare with a board the glider never reaches the edge of
+        reference = short_fns.GameOfLife(rows=20, cols=20)
+        mygame = hashlife.GameOfLife(rows=20, cols=20)
+        for engine in (reference, mygame):
+            engine.live_cells = {(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)}
+        for expected, record in zip(reference.generations(limit=12), mygame.generations(limit=12)):
+            self.assertEqual(record, expected._replace(births=set(expected.births), deaths=set(expected.deaths)))
+        self.assertEqual(mygame.generation, 12)
+
+    def test_write_jsonl(self):
+        mygame = short_fns.GameOfLife(rows=5, cols=5)
+        mygame.live_cells = {(2, 1), (2, 2), (2, 3)}
+        outfile = io.StringIO()
+        self.assertEqual(write_jsonl(mygame.generations(limit=2), outfile), 2)
+        lines = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertEqual(sorted(lines[0]["births"]), [[1, 2], [3, 2]])
+        self.assertEqual(sorted(lines[0]["deaths"]), [[2, 1], [2, 3]])
+        self.assertEqual(lines[1]["population"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy_dense
+from ensemble import Ensemble
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def test_seed_counts(self):
+        myensemble = Ensemble(boards=5, rows=4, cols=4)
+        myensemble.seed([0, 1, 2, 3, 16], rng=0)
+        self.assertEqual(myensemble.live_counts.tolist(), [0, 1, 2, 3, 16])
+        self.assertEqual(myensemble.cell_states.sum(axis=(1, 2)).tolist(), [0, 1, 2, 3, 16])
+
+    def test_matches_numpy_dense(self):
+        myensemble = Ensemble(boards=20, rows=9, cols=11)
+        myensemble.seed(range(5, 45, 2), rng=7)
+        references = []
+        for board in myensemble.cell_states:
+            reference = numpy_dense.GameOfLife(rows=9, cols=11)
+            reference.cell_states[...] = board
+            references.append(reference)
+        for iturn in range(40):
+            changed, live_counts = myensemble.advance()
+            for index, reference in enumerate(references):
+                if myensemble.finished_at[index] == -1 or myensemble.finished_at[index] == myensemble.generation:
+                    self.assertEqual(changed[index], reference.advance())
+                else:
+                    self.assertEqual(changed[index], False)
+                self.assertEqual(live_counts[index], reference.live_cell_count())
+                self.assertTrue((myensemble.cell_states[index] == reference.cell_states).all())
+
+    def test_finished_boards_dropped(self):
+        myensemble = Ensemble(boards=3, rows=2, cols=2)
+        myensemble.seed([0, 4, 1], rng=1)
+        changed, live_counts = myensemble.advance()
+        self.assertEqual(changed.tolist(), [False, False, True])
+        self.assertEqual(live_counts.tolist(), [0, 4, 0])
+        self.assertEqual(myensemble.active.tolist(), [])
+        self.assertEqual(myensemble.finished_at.tolist(), [1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import random
 import time
 
+import short_fns
 from game_of_life import GameOfLife
 
 class TestGameOfLife(unittest.TestCase):
@@ -58,6 +59,65 @@ class TestGameOfLife(unittest.TestCase):
         changed = mygame.advance()
         self.assertEqual(changed, False)
 
+    def test_frontier_matches_full_scan(self):
+        random.seed(5)
+        mygame = GameOfLife(rows=15, cols=25)
+        mygame.seed(120)
+        reference = short_fns.GameOfLife(rows=15, cols=25)
+        reference.live_cells = {
+            (rowidx, colidx)
+            for rowidx, irow in enumerate(mygame.cell_states)
+            for colidx, cell_state in enumerate(irow)
+            if cell_state
+        }
+        for iturn in range(60):
+            self.assertEqual(mygame.advance(), reference.advance())
+            self.assertEqual(mygame.live_cell_count(), reference.live_cell_count())
+            for rowidx, colidx in reference.live_cells:
+                self.assertEqual(mygame.cell_states[rowidx][colidx], GameOfLife.LIVE)
+
+    def test_frontier_empties_when_settled(self):
+        mygame = GameOfLife(rows=6, cols=6)
+        for rowidx, colidx in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+            mygame.cell_states[rowidx][colidx] = GameOfLife.LIVE
+        mygame.init_neighbors()
+        self.assertEqual(mygame.advance(), False)
+        self.assertEqual(mygame.frontier, set())
+        self.assertEqual(mygame.advance(), False)
+
+    def test_blinker_cycle(self):
+        mygame = GameOfLife(rows=5, cols=5)
+        for colidx in range(1, 4):
+            mygame.cell_states[2][colidx] = GameOfLife.LIVE
+        mygame.init_neighbors()
+        self.assertIsNone(mygame.detect_cycle())
+        self.assertEqual(mygame.advance(), True)
+        self.assertIsNone(mygame.detect_cycle())
+        self.assertEqual(mygame.advance(), True)
+        self.assertEqual(mygame.detect_cycle(), (0, 2))
+
+    def test_cycle_start_after_lead_in(self):
+        # this T tetromino settles into a traffic light (period 2) after 9 generations
+        mygame = GameOfLife(rows=15, cols=15)
+        for rowidx, colidx in [(6, 6), (6, 7), (6, 8), (7, 7)]:
+            mygame.cell_states[rowidx][colidx] = GameOfLife.LIVE
+        mygame.init_neighbors()
+        while mygame.detect_cycle() is None:
+            mygame.advance()
+        cycle = mygame.detect_cycle()
+        self.assertEqual(cycle.period, 2)
+        self.assertEqual(mygame.generation, cycle.start + cycle.period)
+
+    def test_hash_tracks_board(self):
+        random.seed(8)
+        mygame = GameOfLife(rows=10, cols=10)
+        mygame.seed(40)
+        for iturn in range(10):
+            mygame.advance()
+        board_hash = mygame.board_hash
+        mygame.init_neighbors()
+        self.assertEqual(mygame.board_hash, board_hash)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import random
+
+from hashlife import GameOfLife
+
+GLIDER = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+
+def unbounded_step(live_cells):
+    counts = {}
+    for rowidx, colidx in live_cells:
+        for rowoffset in (-1, 0, 1):
+            for coloffset in (-1, 0, 1):
+                if rowoffset or coloffset:
+                    cell = (rowidx + rowoffset, colidx + coloffset)
+                    counts[cell] = counts.get(cell, 0) + 1
+    return {
+        cell for cell, count in counts.items()
+        if count == 3 or (count == 2 and cell in live_cells)
+    }
+
+
+class TestGameOfLife(unittest.TestCase):
+
+    def test_zero_out(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+        mygame.seed(2)
+        self.assertEqual(mygame.live_cell_count(), 2)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+    def test_steady_state_condition(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.seed(4)
+        changed = mygame.advance()
+        self.assertEqual(changed, False)
+        self.assertEqual(mygame.live_cells, {(0, 0), (0, 1), (1, 0), (1, 1)})
+
+    def test_round_trip(self):
+        random.seed(3)
+        mygame = GameOfLife(rows=30, cols=40)
+        mygame.seed(200)
+        cells = mygame.live_cells
+        self.assertEqual(len(cells), 200)
+        root = mygame.root
+        mygame.live_cells = cells
+        self.assertIs(mygame.root, root)
+        other = GameOfLife()
+        other.live_cells = cells
+        self.assertEqual(other.live_cells, cells)
+
+    def test_matches_single_steps(self):
+        random.seed(4)
+        mygame = GameOfLife(rows=16, cols=16)
+        mygame.seed(90)
+        expected = mygame.live_cells
+        for generations in [1, 1, 2, 3, 5, 8, 13]:
+            for iturn in range(generations):
+                expected = unbounded_step(expected)
+            mygame.advance(generations)
+            self.assertEqual(mygame.live_cells, expected)
+
+    def test_glider_jump(self):
+        mygame = GameOfLife()
+        mygame.live_cells = GLIDER
+        mygame.advance(4 << 20)
+        self.assertEqual(mygame.generation, 4 << 20)
+        shift = 1 << 20
+        self.assertEqual(mygame.live_cells, {(r + shift, c + shift) for r, c in GLIDER})
+
+    def test_blinker_and_collect(self):
+        mygame = GameOfLife(cache_limit=4)
+        mygame.live_cells = {(0, 0), (0, 1), (0, 2)}
+        self.assertEqual(mygame.advance(), True)
+        self.assertEqual(mygame.advance(), True)
+        self.assertEqual(mygame.live_cells, {(0, 0), (0, 1), (0, 2)})
+        self.assertEqual(mygame.advance(2), False)
+        self.assertLessEqual(len(mygame._results), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
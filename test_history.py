@@ -0,0 +1,91 @@
+import unittest
+import random
+
+import bitpacked
+import engines
+import game_of_life
+import history
+import seeding
+import short_fns
+
+
+def live_cells(mygame):
+    return {
+        (rowidx, colidx)
+        for rowidx in range(mygame.dimensions[0])
+        for colidx in range(mygame.dimensions[1])
+        if mygame.cell_states[rowidx][colidx]
+    }
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_cells_at_and_seek(self):
+        mygame = game_of_life.GameOfLife(rows=20, cols=20)
+        mygame.seed(density=0.3, rng=5)
+        journal = history.History(mygame, keyframe_every=8)
+        boards = [live_cells(mygame)]
+        for iturn in range(50):
+            journal.advance()
+            boards.append(live_cells(mygame))
+        self.assertEqual([segment.generation for segment in journal.segments], [0, 8, 16, 24, 32, 40, 48])
+        for generation, cells in enumerate(boards):
+            self.assertEqual(journal.cells_at(generation), cells)
+        self.assertEqual([generation for generation, cells in journal.states(45)], [45, 46, 47, 48, 49, 50])
+
+        # rewind and run again, the same future plays out
+        journal.seek(13)
+        self.assertEqual(live_cells(mygame), boards[13])
+        self.assertEqual((journal.generation, mygame.generation), (13, 13))
+        for iturn in range(10):
+            journal.advance()
+        self.assertEqual(live_cells(mygame), boards[23])
+        self.assertEqual(journal.cells_at(20), boards[20])
+        with self.assertRaises(AssertionError):
+            journal.cells_at(24)
+
+    def test_frozen_round_trip(self):
+        mygame = engines.load_engine("frozen")(rows=20, cols=20, tile_size=4)
+        mygame.seed(density=0.3, rng=3)
+        journal = history.History(mygame, keyframe_every=8)
+        boards = [mygame.live_cells]
+        for iturn in range(20):
+            journal.advance()
+            boards.append(mygame.live_cells)
+        journal.seek(11)
+        self.assertEqual((mygame.live_cells, mygame.generation), (boards[11], 11))
+        for iturn in range(9):
+            journal.advance()
+        self.assertEqual((mygame.live_cells, mygame.generation), (boards[20], 20))
+
+    def test_find(self):
+        mygame = short_fns.GameOfLife(rows=20, cols=20)
+        seeding.stamp(mygame, "r_pentomino", 8, 8)
+        journal = history.History(mygame, keyframe_every=4)
+        for iturn in range(30):
+            journal.advance()
+        generation = journal.find(lambda cells: len(cells) > 20)
+        self.assertGreater(len(journal.cells_at(generation)), 20)
+        self.assertLessEqual(len(journal.cells_at(generation - 1)), 20)
+        self.assertIsNone(journal.find(lambda cells: not cells))
+
+    def test_retention(self):
+        mygame = bitpacked.GameOfLife(rows=32, cols=32)
+        random.seed(2)
+        mygame.seed(density=0.3)
+        journal = history.History(mygame, keyframe_every=5, max_bytes=4000)
+        for iturn in range(100):
+            journal.advance()
+            self.assertTrue(journal.nbytes <= 4000 or len(journal.segments) == 1)
+        self.assertGreater(journal.first_generation, 0)
+        self.assertEqual(journal.first_generation % 5, 0)
+        self.assertEqual(
+            journal.cells_at(100),
+            {(rowidx, colidx) for rowidx, row in enumerate(mygame.to_array()) for colidx, state in enumerate(row) if state},
+        )
+        with self.assertRaises(AssertionError):
+            journal.seek(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import json
+import tempfile
+import unittest
+import random
+
+import bitpacked
+import blocktable
+import game_of_life
+import hashlife
+import instrument
+import no_conditionals
+import numpy_dense
+import packed_sparse
+import parallel
+import render
+import short_fns
+
+
+class TestInstrument(unittest.TestCase):
+
+    def test_engines(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for engine_cls, options in [
+            (game_of_life.GameOfLife, {}),
+            (no_conditionals.GameOfLife, {}),
+            (no_conditionals.FrozenGameOfLife, {"tile_size": 4}),
+            (short_fns.GameOfLife, {}),
+            (numpy_dense.GameOfLife, {}),
+            (packed_sparse.GameOfLife, {}),
+            (bitpacked.GameOfLife, {}),
+            (blocktable.GameOfLife, {"cache_dir": cache_dir.name}),
+        ]:
+            reference = game_of_life.GameOfLife(rows=12, cols=12)
+            engine = engine_cls(rows=12, cols=12, **options)
+            random.seed(5)
+            reference.seed(50)
+            engine.add_cells(render.live_cells_of(reference))
+            ring = instrument.RingBuffer()
+            with instrument.Instrument(engine, sinks=[ring]):
+                for iturn in range(10):
+                    engine.advance()
+                    to_birth, to_die = reference.step()
+            self.assertEqual(len(ring), 10, engine_cls.__module__)
+            stats = ring.records[-1]
+            self.assertEqual(stats.population, reference.live_cell_count())
+            # blocktable has no separate count, its table lookups are the decide
+            phases = [getattr(stats, field) for field in ("count", "decide", "apply")]
+            self.assertEqual(phases[0] is None, engine_cls is blocktable.GameOfLife)
+            phases = [phase for phase in phases if phase is not None]
+            self.assertTrue(all(phase >= 0 for phase in phases))
+            self.assertLessEqual(sum(phases), stats.total)
+            self.assertGreater(stats.examined, 0)
+            if hasattr(engine, "step"):
+                self.assertEqual((stats.births, stats.deaths), (len(to_birth), len(to_die)))
+            # disabled again, nothing is left on the instance
+            for name in ("advance", "step", "_count", "_decide", "_apply"):
+                self.assertNotIn(name, engine.__dict__)
+
+    def test_step_and_nesting(self):
+        mygame = game_of_life.GameOfLife(rows=5, cols=5)
+        mygame.add_cells([(2, 1), (2, 2), (2, 3)])
+        records = []
+        with instrument.Instrument(mygame, sinks=[records.append]):
+            to_birth, to_die = mygame.step()
+            mygame.advance()
+        self.assertEqual([stats.generation for stats in records], [1, 2])
+        self.assertEqual((records[0].births, records[0].deaths), (2, 2))
+        # the three live cells and everything next to them
+        self.assertEqual(records[0].examined, 15)
+
+    def test_total_only(self):
+        mygame = hashlife.GameOfLife()
+        mygame.add_cells([(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)])
+        records = []
+        with instrument.Instrument(mygame, sinks=[records.append]):
+            mygame.advance(8)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].generation, 8)
+        self.assertIsNone(records[0].count)
+        self.assertIsNone(records[0].births)
+        self.assertEqual(records[0].population, 5)
+
+    def test_parallel(self):
+        records = []
+        with parallel.GameOfLife(rows=8, cols=8, workers=2) as mygame:
+            mygame.add_cells([(2, 1), (2, 2), (2, 3)])
+            with instrument.Instrument(mygame, sinks=[records.append]):
+                mygame.advance(3)
+                mygame.advance()
+        self.assertEqual([stats.generation for stats in records], [3, 4])
+        self.assertEqual([stats.count for stats in records], [None, None])
+        self.assertEqual((records[1].births, records[1].deaths), (2, 2))
+
+    def test_json_lines_and_memory(self):
+        mygame = numpy_dense.GameOfLife(rows=20, cols=20)
+        random.seed(1)
+        mygame.seed(80)
+        outfile = io.StringIO()
+        sink = instrument.JsonLinesSink(outfile)
+        instrumented = instrument.instrument(mygame, sink, track_memory=True)
+        for iturn in range(3):
+            mygame.advance()
+        instrumented.disable()
+        mygame.advance()
+        sink.close()
+        lines = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]["examined"], 400)
+        self.assertGreater(lines[0]["allocated"], 0)
+
+    def test_aggregate(self):
+        ring = instrument.RingBuffer(size=2)
+        for generation, total in enumerate([3.0, 1.0, 2.0]):
+            ring(instrument.GenerationStats(generation, total, None, None, None, 1, 2, None, 7, None))
+        summary = ring.aggregate()
+        self.assertEqual(summary["generations"], 2)
+        self.assertEqual(summary["total"], {"mean": 1.5, "min": 1.0, "max": 2.0, "sum": 3.0})
+        self.assertEqual((summary["births"], summary["deaths"]), (2, 4))
+        self.assertNotIn("count", summary)
+        self.assertEqual(summary["population"], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+import unittest
+
+import game_of_life
+import hashlife
+import lifeio
+import numpy_dense
+import short_fns
+import seeding
+
+GLIDER = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+
+class TestLifeIO(unittest.TestCase):
+
+    def test_read_rle(self):
+        lines = ["#N Glider", "x = 3, y = 3, rule = B3/S23", "bo$2b", "o$3o!", "ignored"]
+        self.assertEqual(set(lifeio.read_rle(lines)), GLIDER)
+        self.assertEqual(set(lifeio.read_rle(["o2$o!"])), {(0, 0), (2, 0)})
+        with self.assertRaises(ValueError):
+            list(lifeio.read_rle(["b?o!"]))
+
+    def test_read_plaintext(self):
+        lines = ["!Name: Glider", ".O", "..O", "OOO"]
+        self.assertEqual(set(lifeio.read_plaintext(lines)), GLIDER)
+        with self.assertRaises(ValueError):
+            list(lifeio.read_plaintext([".x"]))
+
+    def test_rle_round_trip(self):
+        for engine_cls in (game_of_life.GameOfLife, short_fns.GameOfLife, numpy_dense.GameOfLife):
+            engine = engine_cls(rows=30, cols=40)
+            engine.seed(300, rng=1)
+            outfile = io.StringIO()
+            lifeio.write_rle(engine, outfile)
+            lines = outfile.getvalue().splitlines()
+            self.assertTrue(all(len(line) <= lifeio.RLE_LINE_LENGTH for line in lines))
+            copy = short_fns.GameOfLife(rows=30, cols=40)
+            copy.add_cells(lifeio.read_rle(lines))
+            # written relative to the top left of the occupied cells
+            expected = set(seeding.random_cells(30, 40, 300, rng=1))
+            top = min(rowidx for rowidx, colidx in expected)
+            left = min(colidx for rowidx, colidx in expected)
+            self.assertEqual(copy.live_cells, {(r - top, c - left) for r, c in expected})
+
+    def test_plaintext_round_trip(self):
+        engine = short_fns.GameOfLife(bounded=False)
+        engine.add_cells(seeding.pattern_cells("gosper_glider_gun"))
+        outfile = io.StringIO()
+        lifeio.write_plaintext(engine, outfile, name="gun")
+        cells = set(lifeio.read_plaintext(outfile.getvalue().splitlines()))
+        self.assertEqual(cells, set(seeding.pattern_cells("gosper_glider_gun")))
+
+    def test_macrocell_round_trip(self):
+        game = hashlife.GameOfLife()
+        game.add_cells(seeding.pattern_cells("gosper_glider_gun"))
+        game.advance(300)
+        outfile = io.StringIO()
+        lifeio.write_macrocell(game, outfile)
+        lines = outfile.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("[M2]"))
+        self.assertEqual(lifeio.read_macrocell(lines, game).root.population, game.live_cell_count())
+        copy = lifeio.read_macrocell(lines)
+        self.assertEqual(copy.live_cells, game.live_cells)
+
+    def test_load_and_save(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "glider.rle")
+            with open(path, "w") as outfile:
+                outfile.write("x = 3, y = 3\nbo$2bo$3o!\n")
+            engine = lifeio.load(path, game_of_life.GameOfLife(rows=10, cols=10), 2, 3)
+            self.assertEqual(engine.live_cell_count(), 5)
+            self.assertEqual(engine.cell_states[2][4], engine.LIVE)
+            for extension in (".rle", ".cells", ".mc"):
+                path = os.path.join(tmpdir, "copy" + extension)
+                lifeio.save(path, engine)
+                copy = lifeio.load(path, short_fns.GameOfLife(rows=10, cols=10), 1, 1)
+                if extension == ".mc":
+                    # macrocell keeps the engine's own coordinates
+                    expected = {(r + 3, c + 4) for r, c in GLIDER}
+                else:
+                    expected = {(r + 1, c + 1) for r, c in GLIDER}
+                self.assertEqual(copy.live_cells, expected)
+
+    def test_saves_the_rule(self):
+        engine = short_fns.GameOfLife(rows=10, cols=10, rule="highlife")
+        engine.add_cells(GLIDER)
+        outfile = io.StringIO()
+        lifeio.write_rle(engine, outfile)
+        self.assertEqual(outfile.getvalue().splitlines()[0], "x = 3, y = 3, rule = B36/S23")
+        outfile = io.StringIO()
+        lifeio.write_macrocell(engine, outfile)
+        self.assertEqual(outfile.getvalue().splitlines()[1], "#R B36/S23")
+        outfile = io.StringIO()
+        lifeio.write_rle(engine, outfile, rule="B3/S23")
+        self.assertIn("rule = B3/S23", outfile.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
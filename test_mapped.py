@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import mapped
+import numpy_dense
+import seeding
+from mapped import GameOfLife
+
+
+class TestGameOfLife(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "board")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_init(self):
+        try:
+            mygame = GameOfLife(rows=0, cols=0)
+            raise AssertionError("Must have both rows and cols!")
+        except AssertionError:
+            pass
+
+    def test_matches_numpy_dense(self):
+        reference = numpy_dense.GameOfLife(rows=31, cols=23)
+        reference.seed(300, rng=5)
+        with GameOfLife(rows=31, cols=23) as mygame:
+            mygame.seed(300, rng=5)
+            for iturn in range(20):
+                self.assertEqual(mygame.step(), reference.step())
+                self.assertTrue((mygame.cell_states == reference.cell_states).all())
+            self.assertEqual(mygame.advance(), reference.advance())
+
+    def test_checkpoint_and_resume(self):
+        mygame = GameOfLife(rows=40, cols=50, path=self.path)
+        mygame.seed(600, rng=1)
+        for iturn in range(5):
+            mygame.advance()
+        mygame.checkpoint()
+        saved = np.array(mygame.cell_states)
+        for iturn in range(5):
+            mygame.advance()
+        mygame.close()
+        resumed = GameOfLife(path=self.path, resume=True)
+        self.assertEqual(resumed.dimensions, (40, 50))
+        self.assertEqual(resumed.generation, 5)
+        self.assertTrue((resumed.cell_states == saved).all())
+        resumed.close()
+
+    def test_checkpoint_copies_changed_pages(self):
+        with GameOfLife(rows=500, cols=500, path=self.path) as mygame:
+            seeding.stamp(mygame, "glider", 250, 250)
+            mygame.checkpoint()
+            for iturn in range(4):
+                mygame.advance()
+            self.assertLessEqual(len(mygame.dirty_pages), 2)
+            mygame.checkpoint()
+            self.assertEqual(mygame.dirty_pages, set())
+
+    def test_replays_committed_journal(self):
+        mygame = GameOfLife(rows=30, cols=30, path=self.path, checkpoint_every=3)
+        seeding.stamp(mygame, "glider", 5, 5)
+        for iturn in range(3):
+            mygame.advance()
+        expected = np.array(mygame.cell_states)
+        # crash between committing the journal and writing the checkpoint
+        mygame.advance()
+        flat = mygame.padded_states.reshape(-1)
+        pages = [
+            (index, flat[index * mapped.PAGE_SIZE:(index + 1) * mapped.PAGE_SIZE].tobytes())
+            for index in sorted(mygame.dirty_pages)
+        ]
+        mapped.write_journal(mygame.journal_path, mygame.generation, pages)
+        expected_after = np.array(mygame.cell_states)
+        mygame.close()
+        resumed = GameOfLife(path=self.path, resume=True)
+        self.assertEqual(resumed.generation, 4)
+        self.assertTrue((resumed.cell_states == expected_after).all())
+        self.assertFalse(os.path.exists(resumed.journal_path))
+        resumed.close()
+
+        # a torn journal is ignored
+        with open(resumed.journal_path, "wb") as outfile:
+            outfile.write(b"\0" * 40)
+        resumed = GameOfLife(path=self.path, resume=True)
+        self.assertEqual(resumed.generation, 4)
+        self.assertTrue((resumed.cell_states == expected_after).all())
+        self.assertFalse((resumed.cell_states == expected).all())
+        resumed.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import ast
+import inspect
+import unittest
+
+import game_of_life
+import no_conditionals
+import seeding
+
+
+class TestFrozenGameOfLife(unittest.TestCase):
+
+    def test_init(self):
+        with self.assertRaises(AssertionError):
+            no_conditionals.FrozenGameOfLife(rows=0, cols=0)
+        mygame = no_conditionals.FrozenGameOfLife(rows=2, cols=2)
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+    def test_matches_game_of_life(self):
+        for rows, cols, tile_size in [(20, 20, 16), (17, 33, 4), (5, 40, 8)]:
+            reference = game_of_life.GameOfLife(rows=rows, cols=cols)
+            mygame = no_conditionals.FrozenGameOfLife(rows=rows, cols=cols, tile_size=tile_size)
+            cells = list(seeding.random_cells(rows, cols, density=0.35, rng=rows))
+            reference.add_cells(cells)
+            mygame.add_cells(cells)
+            for iturn in range(40):
+                to_birth, to_die = mygame.step()
+                expected_birth, expected_die = reference.step()
+                self.assertEqual(set(to_birth), set(expected_birth))
+                self.assertEqual(set(to_die), set(expected_die))
+                self.assertEqual(mygame.live_cell_count(), reference.live_cell_count())
+
+    def test_generations_share_tiles(self):
+        mygame = no_conditionals.FrozenGameOfLife(rows=64, cols=64, tile_size=16)
+        seeding.stamp(mygame, "block", 2, 2)
+        seeding.stamp(mygame, "blinker", 40, 40)
+        first = mygame.state
+        mygame.advance()
+        second = mygame.state
+        # only the blinker's tile is new, the block's (and every empty one) is the same object
+        new_tiles = [tile for tile, (before, after) in enumerate(zip(first.tiles, second.tiles)) if before is not after]
+        self.assertEqual(new_tiles, [2 * 4 + 2])
+        self.assertEqual(second.changed, frozenset([2 * 4 + 2]))
+        # old generations are untouched and can be gone back to
+        mygame.advance()
+        self.assertEqual(mygame.live_cells, {(2, 2), (2, 3), (3, 2), (3, 3), (40, 40), (40, 41), (40, 42)})
+        mygame.restore(second)
+        self.assertEqual(mygame.generation, 1)
+        self.assertEqual(mygame.live_cells, {(2, 2), (2, 3), (3, 2), (3, 3), (39, 41), (40, 41), (41, 41)})
+
+    def test_no_ifs(self):
+        # the engines, main() is only the demo
+        for engine in (no_conditionals.GameOfLife, no_conditionals.FrozenGameOfLife, no_conditionals.TileNeighbors):
+            tree = ast.parse(inspect.getsource(engine))
+            self.assertFalse([node.lineno for node in ast.walk(tree) if isinstance(node, (ast.If, ast.IfExp))])
+
+
+if __name__ == '__main__':
+    unittest.main()
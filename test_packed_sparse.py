@@ -0,0 +1,82 @@
+import unittest
+import random
+import time
+
+import short_fns
+from packed_sparse import GameOfLife
+
+class TestGameOfLife(unittest.TestCase):
+
+    def test_init(self):
+        try:
+            mygame = GameOfLife(rows=0, cols=0)
+            raise AssertionError("Must have both rows and cols!")
+        except AssertionError:
+            pass
+        mygame = GameOfLife(rows=2, cols=2)
+
+    def test_zero_out(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+        mygame.seed(2)
+        self.assertNotEqual(mygame.live_cell_count(), 0)
+        mygame.zero_out()
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+    def test_birth(self):
+        # if you have 3 neighbors and are dead then you get birthed
+        mygame = GameOfLife(rows=2, cols=2)
+        mygame.seed(3)
+        self.assertEqual(mygame.live_cell_count(), 3)
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 4)
+
+    def test_death(self):
+        mygame = GameOfLife(rows=3, cols=3)
+        while mygame.live_cell_count() != 9:
+            random.seed(time.time())
+            mygame.seed(9)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 4)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cell_count(), 0)
+
+        changed = mygame.advance()
+        self.assertEqual(changed, False)
+
+
+    def test_steady_state_condition(self):
+        mygame = GameOfLife(rows=2, cols=2)
+        while mygame.live_cell_count() != 4:
+            random.seed(time.time())
+            mygame.seed(4)
+        changed = mygame.advance()
+        self.assertEqual(changed, False)
+
+    def test_matches_short_fns(self):
+        for bounded in [True, False]:
+            random.seed(10)
+            reference = short_fns.GameOfLife(rows=18, cols=23, bounded=bounded)
+            reference.seed(150)
+            mygame = GameOfLife(rows=18, cols=23, bounded=bounded)
+            mygame.live_cells = reference.live_cells
+            for iturn in range(50):
+                self.assertEqual(mygame.advance(), reference.advance())
+                self.assertEqual(mygame.live_cells, reference.live_cells)
+            self.assertEqual(mygame.bounding_box, reference.bounding_box)
+
+    def test_negative_coordinates(self):
+        mygame = GameOfLife(bounded=False)
+        mygame.live_cells = {(-5, -1), (-5, 0), (-5, 1)}
+        mygame.advance()
+        self.assertEqual(mygame.live_cells, {(-6, 0), (-5, 0), (-4, 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
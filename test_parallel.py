@@ -0,0 +1,51 @@
+import unittest
+import random
+
+import numpy_dense
+from parallel import GameOfLife
+
+
+class TestGameOfLife(unittest.TestCase):
+
+    def test_init(self):
+        try:
+            mygame = GameOfLife(rows=0, cols=0)
+            raise AssertionError("Must have both rows and cols!")
+        except AssertionError:
+            pass
+
+    def test_matches_serial(self):
+        random.seed(6)
+        reference = numpy_dense.GameOfLife(rows=37, cols=29)
+        reference.seed(400)
+        with GameOfLife(rows=37, cols=29, workers=3) as mygame:
+            mygame.cell_states[...] = reference.cell_states
+            for iturn in range(25):
+                self.assertEqual(mygame.advance(), reference.advance())
+                self.assertTrue((mygame.cell_states == reference.cell_states).all())
+            for iturn in range(7):
+                reference.advance()
+            mygame.advance(7)
+            self.assertTrue((mygame.cell_states == reference.cell_states).all())
+
+    def test_steady_state_condition(self):
+        with GameOfLife(rows=2, cols=2, workers=2) as mygame:
+            mygame.seed(4)
+            self.assertEqual(mygame.live_cell_count(), 4)
+            changed = mygame.advance()
+            self.assertEqual(changed, False)
+
+    def test_dead_worker(self):
+        mygame = GameOfLife(rows=8, cols=8, workers=2)
+        try:
+            mygame.seed(20)
+            mygame.advance()
+            mygame._workers[0].kill()
+            with self.assertRaises(RuntimeError):
+                mygame.advance()
+        finally:
+            mygame.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
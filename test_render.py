@@ -0,0 +1,47 @@
+import io
+import unittest
+
+from render import TerminalRenderer
+
+
+class TestTerminalRenderer(unittest.TestCase):
+
+    def test_only_changed_cells_redrawn(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(4, 4, stream=stream)
+        renderer.reset([(0, 0), (1, 0), (3, 3)])
+        renderer.draw()
+        self.assertIn("\x1b[1;1H█", stream.getvalue())
+        self.assertIn("\x1b[2;4H▄", stream.getvalue())
+
+        stream.seek(0)
+        stream.truncate()
+        renderer.update(births=[(2, 3)], deaths=[(1, 0)])
+        renderer.draw()
+        self.assertEqual(
+            sorted(stream.getvalue().split("\x1b[")[1:]),
+            ["1;1H▀", "2;4H█"],
+        )
+
+    def test_frame_rate_limit(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(2, 2, max_fps=1, stream=stream)
+        renderer.reset([])
+        self.assertTrue(renderer.draw())
+        renderer.update(births=[(0, 0)], deaths=[])
+        self.assertFalse(renderer.draw())
+        renderer.last_frame -= 1
+        self.assertTrue(renderer.draw())
+        self.assertTrue(stream.getvalue().endswith("\x1b[1;1H▀"))
+
+    def test_zoom_and_viewport(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(4, 4, top=10, left=10, zoom=2, stream=stream)
+        renderer.reset([(10, 10), (10, 11), (11, 10), (12, 12), (0, 0)])
+        self.assertEqual(renderer.counts, {(0, 0): 3, (1, 1): 1})
+        self.assertEqual((renderer.screen_rows, renderer.screen_cols), (1, 2))
+        self.assertEqual(renderer.glyph(0, 0), "\x1b[38;5;249;48;5;232m▀\x1b[0m")
+
+
+if __name__ == '__main__':
+    unittest.main()
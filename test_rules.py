@@ -0,0 +1,98 @@
+import unittest
+
+import bitpacked
+import game_of_life
+import hashlife
+import no_conditionals
+import numpy_dense
+import packed_sparse
+import rules
+import seeding
+import short_fns
+
+from test_seeding import live_cells_of
+
+
+def reference_step(live_cells, rows, cols, rule):
+    born, survives = rule.table
+    next_cells = set()
+    for rowidx in range(rows):
+        for colidx in range(cols):
+            count = sum(
+                (rowidx + rowoffset, colidx + coloffset) in live_cells
+                for rowoffset in (-1, 0, 1)
+                for coloffset in (-1, 0, 1)
+                if rowoffset or coloffset
+            )
+            table = survives if (rowidx, colidx) in live_cells else born
+            if table[count]:
+                next_cells.add((rowidx, colidx))
+    return next_cells
+
+
+class TestRules(unittest.TestCase):
+
+    def test_parse(self):
+        highlife = rules.Rule("B36/S23")
+        self.assertEqual(highlife.birth, {3, 6})
+        self.assertEqual(highlife.survival, {2, 3})
+        self.assertEqual(str(highlife), "B36/S23")
+        self.assertEqual(rules.Rule("b36s23"), highlife)
+        self.assertEqual(rules.Rule("S23/B36"), highlife)
+        self.assertEqual(rules.Rule("23/36"), highlife)
+        self.assertEqual(rules.Rule("highlife"), highlife)
+        self.assertEqual(rules.Rule("seeds").survival, frozenset())
+        self.assertEqual(rules.make_rule(None), rules.LIFE)
+        self.assertEqual(rules.LIFE.table[0][3], rules.LIVE)
+        self.assertEqual(rules.LIFE.table[1][4], rules.DEAD)
+        for bad in ("", "B3", "B39/S23", "B3/X23", "hello"):
+            with self.assertRaises(ValueError):
+                rules.Rule(bad)
+
+    def test_b0_only_on_dense_engines(self):
+        for engine_cls in (game_of_life.GameOfLife, short_fns.GameOfLife, packed_sparse.GameOfLife, hashlife.GameOfLife):
+            with self.assertRaises(ValueError):
+                engine_cls(rows=5, cols=5, rule="B0/S")
+        for engine_cls in (no_conditionals.GameOfLife, numpy_dense.GameOfLife, bitpacked.GameOfLife):
+            engine = engine_cls(rows=5, cols=70, rule="B0/S")
+            engine.advance()
+            self.assertEqual(live_cells_of(engine), {(r, c) for r in range(5) for c in range(70)})
+
+    def test_engines_follow_rule(self):
+        engine_classes = [
+            game_of_life.GameOfLife,
+            no_conditionals.GameOfLife,
+            short_fns.GameOfLife,
+            numpy_dense.GameOfLife,
+            packed_sparse.GameOfLife,
+            bitpacked.GameOfLife,
+        ]
+        for rulestring in ("highlife", "day_and_night", "seeds", "life_without_death", "B1357/S1357"):
+            rule = rules.Rule(rulestring)
+            expected = set(seeding.random_cells(14, 11, count=60, rng=7))
+            engines = []
+            for engine_cls in engine_classes:
+                engine = engine_cls(rows=14, cols=11, rule=rulestring)
+                engine.add_cells(expected)
+                engines.append(engine)
+            for iturn in range(6):
+                expected = reference_step(expected, 14, 11, rule)
+                for engine in engines:
+                    engine.advance()
+                    self.assertEqual(live_cells_of(engine), expected, (rulestring, engine))
+
+    def test_hashlife_follows_rule(self):
+        # the highlife replicator copies itself
+        replicator = {(0, 2), (0, 3), (0, 4), (1, 1), (1, 4), (2, 0), (2, 3), (2, 4), (3, 0), (3, 3), (4, 0), (4, 1), (4, 2)}
+        game = hashlife.GameOfLife(rule="highlife")
+        game.add_cells(replicator)
+        reference = short_fns.GameOfLife(bounded=False, rule="highlife")
+        reference.add_cells(replicator)
+        for iturn in range(24):
+            reference.advance()
+        game.advance(24)
+        self.assertEqual(game.live_cells, reference.live_cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+import bitpacked
+import game_of_life
+import hashlife
+import no_conditionals
+import numpy_dense
+import packed_sparse
+import short_fns
+import seeding
+
+
+def live_cells_of(engine):
+    if hasattr(engine, "live_cells"):
+        return set(engine.live_cells)
+    if hasattr(engine, "to_array"):
+        cell_states = engine.to_array()
+    else:
+        cell_states = engine.cell_states
+    return {
+        (rowidx, colidx)
+        for rowidx, irow in enumerate(cell_states)
+        for colidx, cell_state in enumerate(irow)
+        if cell_state
+    }
+
+
+ENGINES = [
+    game_of_life.GameOfLife,
+    no_conditionals.GameOfLife,
+    short_fns.GameOfLife,
+    numpy_dense.GameOfLife,
+    packed_sparse.GameOfLife,
+    bitpacked.GameOfLife,
+    hashlife.GameOfLife,
+]
+
+
+class TestSeeding(unittest.TestCase):
+
+    def test_count(self):
+        cells = list(seeding.random_cells(10, 7, count=30, rng=1))
+        self.assertEqual(len(set(cells)), 30)
+        self.assertTrue(all(0 <= r < 10 and 0 <= c < 7 for r, c in cells))
+        self.assertEqual(cells, list(seeding.random_cells(10, 7, count=30, rng=1)))
+        self.assertEqual(len(list(seeding.random_cells(2, 2, count=10, rng=1))), 4)
+
+    def test_density(self):
+        cells = list(seeding.random_cells(200, 200, density=0.25, rng=2))
+        self.assertEqual(len(set(cells)), len(cells))
+        self.assertAlmostEqual(len(cells) / 40000, 0.25, delta=0.02)
+        self.assertEqual(list(seeding.random_cells(3, 3, density=0)), [])
+        self.assertEqual(len(list(seeding.random_cells(3, 3, density=1))), 9)
+
+    def test_same_board_on_every_engine(self):
+        boards = []
+        for engine_cls in ENGINES:
+            engine = engine_cls(rows=12, cols=9)
+            engine.seed(40, rng=3)
+            boards.append(live_cells_of(engine))
+            self.assertEqual(engine.live_cell_count(), 40)
+        for board in boards:
+            self.assertEqual(board, boards[0])
+
+        random.seed(4)
+        expected = set(seeding.random_cells(12, 9, density=0.3))
+        for engine_cls in ENGINES:
+            engine = engine_cls(rows=12, cols=9)
+            random.seed(4)
+            engine.seed(density=0.3)
+            self.assertEqual(live_cells_of(engine), expected)
+
+    def test_stamp(self):
+        glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        self.assertEqual(set(seeding.pattern_cells("glider")), glider)
+        for engine_cls in ENGINES:
+            engine = engine_cls(rows=10, cols=10)
+            seeding.stamp(engine, "glider", 3, 4)
+            seeding.stamp(engine, "blinker", 9, 8)
+            expected = {(r + 3, c + 4) for r, c in glider} | {(9, 8), (9, 9)}
+            if engine_cls is hashlife.GameOfLife:
+                # no edges to clip against
+                expected.add((9, 10))
+            self.assertEqual(live_cells_of(engine), expected)
+            for iturn in range(4):
+                engine.advance()
+            self.assertEqual(len(live_cells_of(engine) & {(r + 4, c + 5) for r, c in glider}), 5)
+
+    def test_gun_size(self):
+        self.assertEqual(len(set(seeding.pattern_cells("gosper_glider_gun"))), 36)
+
+
+if __name__ == '__main__':
+    unittest.main()
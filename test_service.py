@@ -0,0 +1,200 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import deltas
+import game_of_life
+import seeding
+import service
+
+
+async def request(reader, writer, **message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return await next_message(reader)
+
+
+async def next_message(reader):
+    return json.loads(await asyncio.wait_for(reader.readline(), timeout=10))
+
+
+def reference_cells(rows, cols, density, seed, generations):
+    mygame = game_of_life.GameOfLife(rows=rows, cols=cols)
+    mygame.seed(density=density, rng=seeding.make_rng(seed))
+    for iturn in range(generations):
+        mygame.advance()
+    return {
+        (rowidx, colidx)
+        for rowidx in range(rows)
+        for colidx in range(cols)
+        if mygame.cell_states[rowidx][colidx]
+    }
+
+
+class TestService(unittest.TestCase):
+
+    def follow(self, connect, engine="game_of_life"):
+        """Board rebuilt from a subscription to a 20 generation run, and the events it took."""
+        async def run():
+            svc = service.Service()
+            try:
+                reader, writer = await connect(svc)
+                reply = await request(reader, writer, op="create", name="soup", engine=engine, rows=20, cols=20,
+                                      density=0.3, seed=3, budget=20, rate=200)
+                self.assertEqual(reply, {"ok": True, "name": "soup"})
+                reply = await request(reader, writer, op="subscribe", name="soup")
+                self.assertTrue(reply["ok"])
+                cells, events = None, []
+                while True:
+                    event = await next_message(reader)
+                    events.append(event)
+                    if event["event"] == "snapshot":
+                        cells = {tuple(cell) for cell in event["cells"]}
+                    elif event["event"] == "diff":
+                        cells -= {tuple(cell) for cell in event["deaths"]}
+                        cells |= {tuple(cell) for cell in event["births"]}
+                        self.assertEqual(len(cells), event["population"])
+                    else:
+                        self.assertEqual(event["generation"], 20)
+                        break
+                reply = await request(reader, writer, op="list")
+                self.assertEqual(reply["simulations"][0]["generation"], 20)
+                self.assertFalse(reply["simulations"][0]["running"])
+                writer.close()
+                return cells, events
+            finally:
+                await svc.close()
+        return asyncio.run(run())
+
+    def test_tcp(self):
+        async def connect(svc):
+            await svc.start()
+            return await asyncio.open_connection(*svc.address)
+        cells, events = self.follow(connect)
+        self.assertEqual(cells, reference_cells(20, 20, 0.3, 3, 20))
+        # diffs chain from one generation to the next
+        diffs = [event for event in events if event["event"] == "diff"]
+        for first, second in zip(diffs, diffs[1:]):
+            self.assertEqual(first["generation"], second["base"])
+
+    def test_unix_and_other_engines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "life.sock")
+
+            async def connect(svc):
+                await svc.start(path=path)
+                return await asyncio.open_unix_connection(path)
+            for engine in ["numpy_dense", "bitpacked"]:
+                cells, events = self.follow(connect, engine=engine)
+                self.assertEqual(cells, reference_cells(20, 20, 0.3, 3, 20))
+
+    def test_slow_subscriber(self):
+        class StuckWriter:
+            """A client that takes forever to read what it has been sent."""
+
+            def __init__(self):
+                self.sent = []
+                self.unstuck = asyncio.Event()
+
+            def write(self, data):
+                self.sent.append(json.loads(data))
+
+            async def drain(self):
+                await self.unstuck.wait()
+
+        def board():
+            mygame = game_of_life.GameOfLife(rows=20, cols=20)
+            mygame.seed(density=0.3, rng=seeding.make_rng(3))
+            return mygame
+
+        async def run(max_pending):
+            simulation = service.Simulation("soup", board())
+            writer = StuckWriter()
+            subscriber = simulation.subscribe(writer, max_pending)
+            await asyncio.sleep(0)
+            # the snapshot went out and the client is stuck on it, the simulation carries on
+            for iturn in range(20):
+                simulation.publish(*deltas.step_engine(simulation.engine))
+            writer.unstuck.set()
+            simulation.close()
+            await asyncio.wait_for(subscriber.task, timeout=10)
+            return writer.sent
+
+        sent = asyncio.run(run(10000))
+        self.assertEqual([event["event"] for event in sent], ["snapshot", "diff", "done"])
+        cells = {tuple(cell) for cell in sent[0]["cells"]}
+        cells -= {tuple(cell) for cell in sent[1]["deaths"]}
+        cells |= {tuple(cell) for cell in sent[1]["births"]}
+        self.assertEqual((sent[1]["base"], sent[1]["generation"]), (0, 20))
+        self.assertEqual(cells, reference_cells(20, 20, 0.3, 3, 20))
+        # too far behind for a diff, a snapshot instead
+        sent = asyncio.run(run(10))
+        self.assertEqual([event["event"] for event in sent], ["snapshot", "snapshot", "done"])
+        self.assertEqual(sent[1]["generation"], 20)
+        self.assertEqual({tuple(cell) for cell in sent[1]["cells"]}, reference_cells(20, 20, 0.3, 3, 20))
+
+    def test_close_waits_for_the_step(self):
+        class SlowEngine(game_of_life.GameOfLife):
+            """Blocks in step() until told to go on, and remembers what happened when."""
+
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.go = threading.Event()
+                self.stepping = threading.Event()
+                self.events = []
+
+            def step(self):
+                self.stepping.set()
+                self.go.wait(timeout=10)
+                self.events.append("stepped")
+                return super().step()
+
+            def close(self):
+                self.events.append("closed")
+
+        async def run():
+            engine = SlowEngine(rows=5, cols=5)
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            simulation = service.Simulation("slow", engine, budget=1)
+            simulation.task = asyncio.ensure_future(simulation.run(executor))
+            await asyncio.get_running_loop().run_in_executor(None, engine.stepping.wait, 10)
+            simulation.close()
+            await asyncio.sleep(0.05)
+            self.assertEqual(engine.events, [])
+            engine.go.set()
+            await asyncio.gather(simulation.task, return_exceptions=True)
+            executor.shutdown()
+            return engine.events
+
+        self.assertEqual(asyncio.run(run()), ["stepped", "closed"])
+        with self.assertRaises(AssertionError):
+            service.Service(executor=concurrent.futures.ProcessPoolExecutor())
+
+    def test_errors(self):
+        async def run():
+            svc = service.Service()
+            await svc.start()
+            reader, writer = await asyncio.open_connection(*svc.address)
+            try:
+                reply = await request(reader, writer, op="snapshot", name="nope")
+                self.assertFalse(reply["ok"])
+                reply = await request(reader, writer, op="create", engine="nope")
+                self.assertFalse(reply["ok"])
+                reply = await request(reader, writer, op="create", cells=[[1, 0], [1, 1], [1, 2]], rows=3, cols=3)
+                name = reply["name"]
+                reply = await request(reader, writer, op="stop", name=name)
+                self.assertTrue(reply["ok"])
+                reply = await request(reader, writer, op="list")
+                self.assertEqual(reply["simulations"], [])
+            finally:
+                writer.close()
+                await svc.close()
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
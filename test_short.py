@@ -58,6 +58,31 @@ class TestGameOfLife(unittest.TestCase):
         changed = mygame.advance()
         self.assertEqual(changed, False)
 
+    def test_unbounded_glider(self):
+        mygame = GameOfLife(rows=4, cols=4, bounded=False)
+        mygame.live_cells = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        for iturn in range(40):
+            mygame.advance()
+        self.assertEqual(mygame.live_cell_count(), 5)
+        self.assertEqual(mygame.bounding_box, (10, 10, 12, 12))
+
+    def test_bounded_clips(self):
+        mygame = GameOfLife(rows=4, cols=4)
+        mygame.live_cells = {(0, 1), (0, 2), (0, 3)}
+        changed = mygame.advance()
+        self.assertEqual(changed, True)
+        self.assertEqual(mygame.live_cells, {(0, 2), (1, 2)})
+
+    def test_running_bounding_box(self):
+        random.seed(9)
+        mygame = GameOfLife(rows=20, cols=20, bounded=False)
+        mygame.seed(120)
+        for iturn in range(30):
+            mygame.advance()
+            running = mygame.bounding_box
+            mygame._bounding_box_stale = True
+            self.assertEqual(running, mygame.bounding_box)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import adaptive
+import game_of_life
+import no_conditionals
+import numpy_dense
+import seeding
+import short_fns
+import topology
+
+from test_seeding import live_cells_of
+
+ENGINES = [
+    game_of_life.GameOfLife,
+    no_conditionals.GameOfLife,
+    no_conditionals.FrozenGameOfLife,
+    short_fns.GameOfLife,
+    numpy_dense.GameOfLife,
+    adaptive.GameOfLife,
+]
+
+
+def reference_step(live_cells, board_topology):
+    counts = {}
+    for rowidx, colidx in live_cells:
+        for rowoffset, coloffset in topology.NEIGHBOR_OFFSETS:
+            cell = board_topology.wrap(rowidx + rowoffset, colidx + coloffset)
+            if cell is not None:
+                counts[cell] = counts.get(cell, 0) + 1
+    return {
+        cell for cell, count in counts.items()
+        if count == 3 or (count == 2 and cell in live_cells)
+    }
+
+
+class TestTopology(unittest.TestCase):
+
+    def test_tables(self):
+        torus = topology.make_topology("torus", 5, 6)
+        self.assertIs(torus, topology.make_topology(topology.Torus, 5, 6))
+        self.assertEqual(
+            set(torus.neighbors(0, 0)),
+            {(4, 5), (4, 0), (4, 1), (0, 5), (0, 1), (1, 5), (1, 0), (1, 1)},
+        )
+        self.assertEqual(len(torus.neighbors(2, 3)), 8)
+        self.assertEqual(len(topology.make_topology(None, 5, 6).neighbors(0, 0)), 3)
+        klein = topology.make_topology("klein", 5, 6)
+        self.assertIn((4, 5), klein.neighbors(0, 0))
+        self.assertIn((4, 4), klein.neighbors(0, 1))
+        for index in range(30):
+            self.assertEqual(
+                sorted(torus.flat_neighbors(index)),
+                sorted(r * 6 + c for r, c in torus.neighbors(*divmod(index, 6))),
+            )
+        with self.assertRaises(ValueError):
+            topology.make_topology("sphere", 5, 6)
+
+    def test_halo(self):
+        for name in topology.TOPOLOGIES:
+            for rows, cols in [(1, 1), (1, 4), (4, 1), (5, 6)]:
+                board_topology = topology.make_topology(name, rows, cols)
+                targets, sources = board_topology.halo()
+                halo = {divmod(target, cols + 2): divmod(source, cols + 2) for target, source in zip(targets, sources)}
+                self.assertEqual(len(halo), len(targets))
+                expected = {}
+                for padded_row in range(rows + 2):
+                    for padded_col in range(cols + 2):
+                        cell = board_topology.wrap(padded_row - 1, padded_col - 1)
+                        if cell is not None and not (0 < padded_row <= rows and 0 < padded_col <= cols):
+                            expected[(padded_row, padded_col)] = (cell[0] + 1, cell[1] + 1)
+                self.assertEqual(halo, expected)
+
+    def test_glider_goes_round_the_torus(self):
+        for engine_cls in ENGINES:
+            engine = engine_cls(rows=8, cols=8, topology="torus")
+            seeding.stamp(engine, "glider", 5, 5)
+            start = live_cells_of(engine)
+            for iturn in range(4 * 8):
+                engine.advance()
+            self.assertEqual(live_cells_of(engine), start, engine)
+
+    def test_engines_agree(self):
+        for name in ("dead", "torus", "klein"):
+            board_topology = topology.make_topology(name, 9, 7)
+            expected = set(seeding.random_cells(9, 7, count=25, rng=11))
+            engines = []
+            for engine_cls in ENGINES:
+                engine = engine_cls(rows=9, cols=7, topology=name)
+                engine.add_cells(expected)
+                engines.append(engine)
+            for iturn in range(12):
+                expected = reference_step(expected, board_topology)
+                for engine in engines:
+                    engine.advance()
+                    self.assertEqual(live_cells_of(engine), expected, (name, engine))
+
+
+if __name__ == '__main__':
+    unittest.main()
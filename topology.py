@@ -0,0 +1,156 @@
+"""
+What is next to what on a rows x cols board.
+
+    DeadBorder   a plane with dead cells all around it
+    Torus        off one edge and back on at the opposite one
+    KleinBottle  a torus whose top and bottom edges are glued with a flip, going
+                 off the top at col c comes back on the bottom at cols - 1 - c
+
+A topology works its neighbors out once per board shape: a cell away from the
+edges has its 8 neighbors at fixed offsets (flat_offsets for a flat index), and
+the few cells on the edges get an explicit table, so an engine never needs a
+bounds check in its hot loop. make_topology() hands out one shared instance per
+(kind, rows, cols), so every engine on the same board shares the tables.
+"""
+
+import functools
+import itertools
+
+
+NEIGHBOR_OFFSETS = tuple(
+    (rowoffset, coloffset)
+    for rowoffset in range(-1, 2)
+    for coloffset in range(-1, 2)
+    if (rowoffset, coloffset) != (0, 0)
+)
+
+
+class Topology:
+    name = None
+
+    def __init__(self, rows, cols):
+        if min(rows, cols) < 1:
+            raise AssertionError("Must have both rows and cols!")
+        self.rows, self.cols = rows, cols
+        self.flat_offsets = tuple(rowoffset * cols + coloffset for rowoffset, coloffset in NEIGHBOR_OFFSETS)
+        # neighbors of every cell on the edge of the board, what wrap() makes of
+        # the ones that are off it
+        self.edges = {}
+        for rowidx, colidx in self.edge_cells():
+            self.edges[(rowidx, colidx)] = tuple(
+                cell
+                for cell in (
+                    self.wrap(rowidx + rowoffset, colidx + coloffset)
+                    for rowoffset, coloffset in NEIGHBOR_OFFSETS
+                )
+                if cell is not None
+            )
+        self.flat_edges = {
+            rowidx * cols + colidx: tuple(nrow * cols + ncol for nrow, ncol in neighbors)
+            for (rowidx, colidx), neighbors in self.edges.items()
+        }
+
+    def __repr__(self):
+        return "{}(rows={}, cols={})".format(type(self).__name__, self.rows, self.cols)
+
+    def edge_cells(self):
+        rows, cols = self.rows, self.cols
+        for rowidx in range(rows):
+            if rowidx in (0, rows - 1):
+                yield from ((rowidx, colidx) for colidx in range(cols))
+            else:
+                yield (rowidx, 0)
+                if cols > 1:
+                    yield (rowidx, cols - 1)
+
+    def wrap(self, rowidx, colidx):
+        """The board cell that (rowidx, colidx) is, None if it is off the board."""
+        raise NotImplementedError
+
+    def neighbors(self, rowidx, colidx):
+        """The (row, col) of the neighbors of a board cell."""
+        edge = self.edges.get((rowidx, colidx))
+        if edge is not None:
+            return edge
+        return [(rowidx + rowoffset, colidx + coloffset) for rowoffset, coloffset in NEIGHBOR_OFFSETS]
+
+    def flat_neighbors(self, index):
+        """The flat (row * cols + col) indices of the neighbors of a flat index."""
+        edge = self.flat_edges.get(index)
+        if edge is not None:
+            return edge
+        return [index + offset for offset in self.flat_offsets]
+
+    def halo(self):
+        """(targets, sources) flat indices into a board padded by one cell all round.
+
+        Copying padded[sources] to padded[targets] fills in the halo for this
+        topology, halo cells that are not in targets stay dead.
+        """
+        rows, cols = self.rows, self.cols
+        padded_cols = cols + 2
+        # the two halo rows, then the two halo columns between them
+        perimeter = itertools.chain(
+            ((padded_row, padded_col) for padded_row in (0, rows + 1) for padded_col in range(padded_cols)),
+            ((padded_row, padded_col) for padded_row in range(1, rows + 1) for padded_col in (0, cols + 1)),
+        )
+        targets, sources = [], []
+        for padded_row, padded_col in perimeter:
+            cell = self.wrap(padded_row - 1, padded_col - 1)
+            if cell is None:
+                continue
+            targets.append(padded_row * padded_cols + padded_col)
+            sources.append((cell[0] + 1) * padded_cols + cell[1] + 1)
+        return targets, sources
+
+
+class DeadBorder(Topology):
+    name = "dead"
+
+    def wrap(self, rowidx, colidx):
+        if 0 <= rowidx < self.rows and 0 <= colidx < self.cols:
+            return (rowidx, colidx)
+        return None
+
+
+class Torus(Topology):
+    name = "torus"
+
+    def wrap(self, rowidx, colidx):
+        return (rowidx % self.rows, colidx % self.cols)
+
+
+class KleinBottle(Topology):
+    name = "klein"
+
+    def wrap(self, rowidx, colidx):
+        if not 0 <= rowidx < self.rows:
+            colidx = self.cols - 1 - colidx
+        return (rowidx % self.rows, colidx % self.cols)
+
+
+TOPOLOGIES = {
+    topology_cls.name: topology_cls
+    for topology_cls in (DeadBorder, Torus, KleinBottle)
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _shared(topology_cls, rows, cols):
+    return topology_cls(rows, cols)
+
+
+def make_topology(topology, rows, cols):
+    """A Topology for a board from a name, a Topology subclass or instance, dead border for None."""
+    if isinstance(topology, Topology):
+        if (topology.rows, topology.cols) != (rows, cols):
+            raise AssertionError("Topology is for a different board size")
+        return topology
+    if topology is None:
+        topology = DeadBorder
+    elif isinstance(topology, str):
+        try:
+            topology = TOPOLOGIES[topology]
+        except KeyError:
+            raise ValueError("Unknown topology {!r}, pick one of {}".format(topology, sorted(TOPOLOGIES)))
+    return _shared(topology, rows, cols)